@@ -0,0 +1,406 @@
+"""Benchmark every public collector in system_info/ against the live system and recorded tool outputs.
+
+    python benchmarks/bench_collectors.py                      live system + small + large fixtures
+    python benchmarks/bench_collectors.py --mode fixtures --machine large
+    python benchmarks/bench_collectors.py --compare benchmarks/results/previous.json
+    python benchmarks/bench_collectors.py record benchmarks/fixtures/myhost
+
+Fixture directories use the --replay layout: one '<command key>.out' file per external command
+(see system_info.sources.command_key).
+Commands without a fixture behave as if the tool were not installed, so collectors take their
+fallback paths. The 'large' machine is synthesized from generators below. In fixture runs the
+subprocess column counts replayed commands, and syscalls include reading the fixture files.
+"""
+import os
+import re
+import sys
+import json
+import glob
+import time
+import shutil
+import inspect
+import argparse
+import platform
+import importlib
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from system_info import sources, sysroot
+from ui.cli import console, print_table, print_error, print_success
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Parsers benchmarked with the output of the command they are written for
+PARSER_INPUTS = {
+    "memory.parse_dmidecode_output": ["dmidecode", "--type", "memory"],
+    "usb.parse_lsusb_basic_output": ["lsusb"],
+    "usb.parse_lsusb_verbose_output": ["lsusb", "-v"],
+    "disk.parse_udev_export_db": ["udevadm", "info", "--export-db"],
+}
+
+def read_io_counters():
+    """Read/write syscall counters of this process from /proc/self/io"""
+    counters = {}
+    try:
+        with open("/proc/self/io", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                counters[key] = int(value)
+    except OSError:
+        pass
+    return counters.get("syscr", 0) + counters.get("syscw", 0)
+
+class CommandCounter:
+    """Count child processes, and optionally answer commands from a fixture directory"""
+
+    def __init__(self, fixture_dir=None):
+        self.fixture_dir = fixture_dir
+        self.count = 0
+        self._popen = subprocess.Popen
+        self._replay = sources.replay_command
+
+    def __enter__(self):
+        counter = self
+        original_popen = self._popen
+        original_replay = self._replay
+
+        class CountingPopen(original_popen):
+            def __init__(self, args, *popen_args, **kwargs):
+                counter.count += 1
+                if isinstance(args, list) and args[:1] == ["sudo"] and "-n" not in args:
+                    # Never block on a password prompt while benchmarking
+                    args = ["sudo", "-n"] + args[1:]
+                super().__init__(args, *popen_args, **kwargs)
+
+        def counting_replay(args, **kwargs):
+            counter.count += 1
+            return original_replay(args, **kwargs)
+
+        subprocess.Popen = CountingPopen
+        sources.replay_command = counting_replay
+        self._previous_replay_dir = sources.REPLAY_DIR
+        sources.REPLAY_DIR = self.fixture_dir
+        return self
+
+    def __exit__(self, *exc_info):
+        subprocess.Popen = self._popen
+        sources.replay_command = self._replay
+        sources.REPLAY_DIR = self._previous_replay_dir
+
+def discover_functions():
+    """Public get_*/parse_* functions defined in each system_info module"""
+    functions = []
+    for path in sorted(glob.glob(str(ROOT / "system_info" / "*.py"))):
+        module_name = Path(path).stem
+        module = importlib.import_module(f"system_info.{module_name}")
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if function.__module__ != module.__name__ or not name.startswith(("get_", "parse_")):
+                continue
+            if inspect.iscoroutinefunction(function):
+                # The aio variants only wrap the synchronous collectors measured here
+                continue
+            functions.append((f"{module_name}.{name}", function))
+    return functions
+
+def build_call(name, function, fixture_dir):
+    """Return a zero-argument callable for a function, or None if it needs unknown arguments"""
+    required = [p for p in inspect.signature(function).parameters.values()
+                if p.default is inspect.Parameter.empty and p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+    if not required:
+        return function
+    if name in PARSER_INPUTS and len(required) == 1:
+        directory = fixture_dir or str(FIXTURES_DIR / "small")
+        path = os.path.join(directory, sources.command_key(PARSER_INPUTS[name]) + ".out")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            return lambda: function(text)
+    return None
+
+def measure(call, fixture_dir, repeat):
+    """Median wall time, subprocesses, read/write syscalls and peak traced memory of one call"""
+    walls = []
+    with CommandCounter(fixture_dir) as counter:
+        syscalls_before = read_io_counters()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call()
+            walls.append(time.perf_counter() - start)
+        # Subtract the two /proc/self/io reads themselves
+        syscalls = max(0, read_io_counters() - syscalls_before - 2) // repeat
+        subprocesses = counter.count // repeat
+
+        # Memory is traced in a separate pass since tracemalloc distorts timings
+        tracemalloc.start()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "wall_ms": round(statistics.median(walls) * 1000, 3),
+        "wall_min_ms": round(min(walls) * 1000, 3),
+        "subprocesses": subprocesses,
+        "syscalls": syscalls,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+def run_suite(fixture_dir, repeat, only=None):
+    results = {}
+    skipped = []
+    for name, function in discover_functions():
+        if only and not re.search(only, name):
+            continue
+        call = build_call(name, function, fixture_dir)
+        if call is None:
+            skipped.append(name)
+            continue
+        try:
+            results[name] = measure(call, fixture_dir, repeat)
+        except Exception as e:
+            results[name] = {"error": str(e)}
+    return results, skipped
+
+# --- Large machine synthesis -------------------------------------------------
+
+def _large_lscpu():
+    with open(FIXTURES_DIR / "small" / "lscpu.out", "r") as f:
+        text = f.read()
+    replacements = {
+        "CPU(s):                          8": "CPU(s):                          1024",
+        "On-line CPU(s) list:             0-7": "On-line CPU(s) list:             0-1023",
+        "Model name:                      Intel(R) Core(TM) i7-8565U CPU @ 1.80GHz":
+            "Model name:                      AMD EPYC 9754 128-Core Processor",
+        "Core(s) per socket:              4": "Core(s) per socket:              128",
+        "Socket(s):                       1": "Socket(s):                       4",
+        "NUMA node(s):                    1": "NUMA node(s):                    16",
+    }
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+    return text
+
+def _large_lspci():
+    blocks = []
+    for bus in range(8):
+        blocks.append(
+            f"{0x41 + bus:02x}:00.0 3D controller: NVIDIA Corporation GH100 [H100 SXM5 80GB] (rev a1)\n"
+            "\tSubsystem: NVIDIA Corporation Device 16c1\n"
+            "\tFlags: bus master, fast devsel, latency 0, IRQ 255, NUMA node 0\n"
+            "\tKernel driver in use: nvidia\n\tKernel modules: nvidia\n")
+    for bus in range(64):
+        blocks.append(
+            f"{0x80 + bus // 2:02x}:00.{bus % 2} Ethernet controller: Mellanox Technologies MT2910 Family [ConnectX-7]\n"
+            "\tSubsystem: Mellanox Technologies Device 0026\n"
+            "\tFlags: bus master, fast devsel, latency 0, IRQ 60\n"
+            "\tKernel driver in use: mlx5_core\n\tKernel modules: mlx5_core\n")
+    for bus in range(32):
+        blocks.append(
+            f"{0xc0 + bus:02x}:00.0 Non-Volatile memory controller: Samsung Electronics Co Ltd NVMe SSD Controller PM173X\n"
+            "\tSubsystem: Samsung Electronics Co Ltd Device a813\n"
+            "\tKernel driver in use: nvme\n\tKernel modules: nvme\n")
+    for bus in range(16):
+        blocks.append(
+            f"{bus:02x}:14.0 USB controller: Advanced Micro Devices, Inc. [AMD] Device 14c9 (prog-if 30 [XHCI])\n"
+            "\tSubsystem: Supermicro Computer Inc Device 1d1f\n"
+            "\tKernel driver in use: xhci_hcd\n\tKernel modules: xhci_pci\n")
+    for bus in range(200):
+        blocks.append(
+            f"{bus % 256:02x}:{bus // 256 + 1:02x}.{bus % 8} PCI bridge: Advanced Micro Devices, Inc. [AMD] Device 14ab\n"
+            "\tFlags: bus master, fast devsel, latency 0, IRQ 38\n"
+            "\tKernel driver in use: pcieport\n")
+    return "\n".join(blocks) + "\n"
+
+def _large_lsusb():
+    return "".join(
+        f"Bus {1 + i // 100:03d} Device {i % 100 + 2:03d}: ID 0781:5583 SanDisk Corp. Ultra Fit\n" for i in range(200))
+
+def _large_lsusb_verbose():
+    with open(FIXTURES_DIR / "small" / "lsusb_-v.out", "r") as f:
+        small = f.read()
+    return small * 70
+
+def _large_dmidecode_memory():
+    blocks = ["# dmidecode 3.5\nSMBIOS 3.3.0 present.\n"]
+    for slot in range(64):
+        populated = slot % 4 != 3
+        blocks.append(
+            f"Handle 0x{0x1100 + slot:04X}, DMI type 17, 92 bytes\nMemory Device\n"
+            f"\tSize: {'64 GB' if populated else 'No Module Installed'}\n"
+            f"\tLocator: P{slot // 32}-DIMM{slot % 32:02d}\n"
+            f"\tType: {'DDR5' if populated else 'Unknown'}\n"
+            f"\tSpeed: {'4800 MT/s' if populated else 'Unknown'}\n"
+            f"\tManufacturer: {'Samsung' if populated else 'Not Specified'}\n"
+            f"\tSerial Number: {slot:08X}\n"
+            f"\tPart Number: {'M321R8GA0BB0-CQKZJ' if populated else 'Not Specified'}\n")
+    return "\n".join(blocks)
+
+def _large_lshw_network():
+    return json.dumps([{
+        "id": "network", "class": "network", "description": "Ethernet interface",
+        "product": "MT2910 Family [ConnectX-7]", "vendor": "Mellanox Technologies",
+        "logicalname": f"ens{i}np0", "serial": f"b8:3f:d2:00:{i // 256:02x}:{i % 256:02x}",
+        "configuration": {"driver": "mlx5_core", "link": "yes", "speed": "100Gbit/s"},
+    } for i in range(128)])
+
+def _large_ip_addr():
+    interfaces = [{"ifindex": 1, "ifname": "lo", "flags": ["LOOPBACK", "UP"], "mtu": 65536,
+                   "operstate": "UNKNOWN", "link_type": "loopback",
+                   "addr_info": [{"family": "inet", "local": "127.0.0.1", "prefixlen": 8}]}]
+    for i in range(2000):
+        name = f"veth{i:05x}" if i >= 64 else f"ens{i}np0"
+        interfaces.append({
+            "ifindex": i + 2, "ifname": name, "flags": ["BROADCAST", "MULTICAST", "UP", "LOWER_UP"],
+            "mtu": 1500 if i >= 64 else 9000, "operstate": "UP", "link_type": "ether",
+            "addr_info": [{"family": "inet6", "local": f"fe80::{i:x}", "prefixlen": 64}]
+                         + ([{"family": "inet", "local": f"10.{i}.0.1", "prefixlen": 24}] if i < 64 else []),
+        })
+    return json.dumps(interfaces)
+
+def generate_large_fixtures(directory):
+    """Synthesize tool outputs of a 1024-CPU, 500-disk, 2000-interface machine"""
+    os.makedirs(directory, exist_ok=True)
+    outputs = {
+        ("lscpu",): _large_lscpu(),
+        ("lspci", "-v"): _large_lspci(),
+        ("lsusb",): _large_lsusb(),
+        ("lsusb", "-v"): _large_lsusb_verbose(),
+        ("dmidecode", "--type", "memory"): _large_dmidecode_memory(),
+        ("lshw", "-C", "network", "-json"): _large_lshw_network(),
+        ("ip", "-json", "addr", "show"): _large_ip_addr(),
+    }
+    disks = []
+    udev_db = []
+    for i in range(500):
+        name = sysroot._disk_name(i)
+        disks.append(f'NAME="{name}" MODEL="ST20000NM007D-3DJ103" SIZE="18.2T" ROTA="1" SERIAL="ZVT{i:05d}" TYPE="disk"')
+        udev_db.append(
+            f"P: /devices/pci0000:40/0000:40:03.1/host0/target0:0:{i}/0:0:{i}:0/block/{name}\nN: {name}\n"
+            f"E: DEVNAME=/dev/{name}\nE: SUBSYSTEM=block\nE: DEVTYPE=disk\nE: ID_VENDOR=SEAGATE\n"
+            f"E: ID_MODEL=ST20000NM007D-3DJ103\nE: ID_SERIAL_SHORT=ZVT{i:05d}\nE: ID_WWN=0x5000c500{i:08x}\n"
+            f"E: ID_BUS=ata\n")
+    outputs[("lsblk", "-d", "-o", "NAME,MODEL,SIZE,ROTA,SERIAL,TYPE", "-P")] = "\n".join(disks) + "\n"
+    outputs[("udevadm", "info", "--export-db")] = "\n".join(udev_db)
+
+    for args, text in outputs.items():
+        with open(os.path.join(directory, sources.command_key(args) + ".out"), "w", encoding="utf-8") as f:
+            f.write(text)
+    # DMI tables do not grow with machine size
+    for name in ("baseboard", "bios", "system"):
+        shutil.copy(FIXTURES_DIR / "small" / f"dmidecode_-t_{name}.out", directory)
+
+# --- Reporting ---------------------------------------------------------------
+
+def print_results(title, results):
+    rows = []
+    for name, result in sorted(results.items(), key=lambda item: -item[1].get("wall_ms", 0)):
+        if "error" in result:
+            rows.append({"Function": name, "Wall (ms)": "error", "Peak (KiB)": result["error"][:40]})
+            continue
+        rows.append({
+            "Function": name,
+            "Wall (ms)": f"{result['wall_ms']:.3f}",
+            "Subprocesses": result["subprocesses"],
+            "Syscalls (r/w)": result["syscalls"],
+            "Peak (KiB)": f"{result['peak_kib']:.1f}",
+        })
+    print_table(title, rows, ["Function", "Wall (ms)", "Subprocesses", "Syscalls (r/w)", "Peak (KiB)"])
+
+def print_comparison(previous, current, threshold=1.2):
+    rows = []
+    for run_name, results in current["runs"].items():
+        old_results = previous.get("runs", {}).get(run_name, {})
+        for name, result in sorted(results.items()):
+            old = old_results.get(name)
+            if not old or "wall_ms" not in old or "wall_ms" not in result or not old["wall_ms"]:
+                continue
+            ratio = result["wall_ms"] / old["wall_ms"]
+            marker = "[red]regression[/red]" if ratio > threshold else "[green]faster[/green]" if ratio < 1 / threshold else ""
+            rows.append({
+                "Run": run_name,
+                "Function": name,
+                "Before (ms)": f"{old['wall_ms']:.3f}",
+                "After (ms)": f"{result['wall_ms']:.3f}",
+                "Ratio": f"{ratio:.2f}x",
+                "Subprocesses": f"{old.get('subprocesses')} -> {result.get('subprocesses')}",
+                "": marker,
+            })
+    print_table("Comparison with " + previous.get("timestamp", "previous run"), rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Heracross collector benchmarks")
+    parser.add_argument("--mode", choices=["live", "fixtures", "both"], default="both")
+    parser.add_argument("--machine", action="append", choices=["small", "large"],
+                        help="Fixture machine(s) to replay (default: small and large)")
+    parser.add_argument("--fixtures", help="Replay a custom fixture directory instead")
+    parser.add_argument("--sysroot", help="Read /proc, /sys and /etc from this directory (see main.py sysroot)")
+    parser.add_argument("--repeat", type=int, default=5, help="Calls per function (default: 5)")
+    parser.add_argument("--only", help="Regular expression selecting functions")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Previous result file to compare against")
+    subparsers = parser.add_subparsers(dest="command")
+    record_parser = subparsers.add_parser("record", help="Capture live tool outputs as fixtures")
+    record_parser.add_argument("directory")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        saved = sysroot.capture_commands(args.directory)
+        print_success(f"Recorded {saved} command outputs into {args.directory}")
+        return
+
+    if args.sysroot:
+        sources.configure(sysroot=args.sysroot)
+
+    runs = {}
+    if args.mode in ("live", "both"):
+        runs["live"] = None
+    if args.mode in ("fixtures", "both"):
+        if args.fixtures:
+            runs[f"fixtures:{Path(args.fixtures).name}"] = args.fixtures
+        else:
+            for machine in args.machine or ["small", "large"]:
+                runs[f"fixtures:{machine}"] = machine
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "runs": {},
+        "skipped": [],
+    }
+    with tempfile.TemporaryDirectory() as temporary:
+        for run_name, source in runs.items():
+            fixture_dir = source
+            if source == "small":
+                fixture_dir = str(FIXTURES_DIR / "small")
+            elif source == "large":
+                fixture_dir = os.path.join(temporary, "large")
+                generate_large_fixtures(fixture_dir)
+            console.print(f"[cyan]Running {run_name}...[/cyan]")
+            results, skipped = run_suite(fixture_dir, args.repeat, args.only)
+            report["runs"][run_name] = results
+            report["skipped"] = skipped
+            print_results(run_name, results)
+
+    output = args.output or str(RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_success(f"Results saved to {output}")
+
+    if args.compare:
+        try:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                print_comparison(json.load(f), report)
+        except (OSError, ValueError) as e:
+            print_error(f"Could not read {args.compare}: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,18 @@
 import argparse
+import json
 import sys
+import time
 from pathlib import Path
 
 # Add the ui module to the path
 sys.path.append(str(Path(__file__).parent / "ui"))
 
-from system_info import cpu, memory, disk, motherboard, gpu, network, os_info, usb
+from system_info import cpu, memory, disk, motherboard, gpu, network, os_info, usb, recorder, inventory, fleet, fingerprint
+from system_info import sources, sysroot, profiling, processes, tunables, hotplug
 from ui.cli import (
     console, print_header, print_section_header, print_section, 
     print_summary_stats, print_progress_bar, print_footer, 
-    print_error, print_success, clear_screen
+    print_error, print_success, print_table, clear_screen, stderr_console
 )
 
 def get_system_summary():
@@ -41,6 +44,224 @@ def get_system_summary():
     except Exception:
         return {}
 
+def positive_int(text):
+    """argparse type for counts that must be at least 1"""
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {text}")
+    return value
+
+def positive_float(text):
+    """argparse type for intervals that must be above zero"""
+    value = float(text)
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number: {text}")
+    return value
+
+def non_negative_int(text):
+    """argparse type for offsets and limits"""
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {text}")
+    return value
+
+def run_record(args):
+    """Record metrics into a ring file until the duration elapses or Ctrl+C"""
+    metrics = [m.strip() for m in args.metrics.split(",") if m.strip()]
+    console.print(f"[cyan]Recording {', '.join(metrics)} every {args.interval}s into {args.output} "
+                  f"(Ctrl+C to stop)[/cyan]")
+    try:
+        count = recorder.record(args.output, metrics, args.interval, args.capacity, args.duration)
+    except KeyboardInterrupt:
+        reader = recorder.RecordingReader(args.output)
+        count = reader.write_count
+        reader.close()
+    except (OSError, ValueError) as e:
+        print_error(f"Could not record metrics: {str(e)}")
+        sys.exit(1)
+    print_success(f"Wrote {count} records to {args.output}")
+
+def run_fleet(args):
+    """Ingest a directory of JSON snapshots and answer an inventory query"""
+    start = time.perf_counter()
+    fleet_inventory = fleet.load_fleet(args.directory, workers=args.workers)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matches = fleet_inventory.query(
+        cpu_model=args.cpu_model, dimm_part=args.dimm_part, disk_model=args.disk_model, gpu=args.gpu,
+        bios_version=args.bios_version, bios_before=args.bios_before,
+        bios_version_below=args.bios_version_below, min_memory=args.min_memory
+    )
+    query_time = time.perf_counter() - start
+
+    print_summary_stats({
+        "Snapshots Loaded": len(fleet_inventory),
+        "Unreadable Files": len(fleet_inventory.errors),
+        "Matching Hosts": len(matches),
+        "Load / Query": f"{load_time:.2f}s / {query_time * 1000:.2f}ms",
+    })
+    if not args.count:
+        rows = [fleet_inventory.row(row_id) for row_id in matches[:args.limit]]
+        print_table("Matching Hosts", rows, ["Host", "CPU", "Memory", "BIOS Version", "BIOS Date", "DIMM Parts"])
+        if len(matches) > args.limit:
+            console.print(f"[dim]... and {len(matches) - args.limit} more hosts[/dim]")
+
+def run_changes(args):
+    """Report hardware changes since the previous run using section fingerprints"""
+    result = fingerprint.check_changes(args.fingerprint_file)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+
+    if result["Status"] == "Baseline created":
+        print_success(f"Fingerprint baseline saved to {result['File']}")
+    elif result["Status"] == "No hardware changes":
+        print_success(f"No hardware changes since {result['Since']}")
+    else:
+        print_section_header(f"Hardware Changes since {result['Since']}")
+        for section_name in result["Changed Sections"]:
+            rows = [{
+                "Change": change["Change"],
+                "Path": change["Path"],
+                "Old": fingerprint.canonical_json(change["Old"]) if "Old" in change else "",
+                "New": fingerprint.canonical_json(change["New"]) if "New" in change else "",
+            } for change in result["Changes"][section_name]]
+            print_table(section_name, rows, ["Change", "Path", "Old", "New"])
+
+def run_sysroot(args):
+    """Capture this machine, or synthesize a large one, into a sysroot directory"""
+    start = time.perf_counter()
+    try:
+        if args.sysroot_command == 'synth':
+            sysroot.synthesize_sysroot(args.directory, cpus=args.cpus, disks=args.disks,
+                                       interfaces=args.interfaces, usb_devices=args.usb_devices,
+                                       processes=args.processes)
+            print_success(f"Synthesized {args.cpus} CPUs, {args.disks} disks and {args.interfaces} "
+                          f"interfaces into {args.directory} in {time.perf_counter() - start:.1f}s")
+        else:
+            copied = sysroot.capture_sysroot(args.directory)
+            print_success(f"Copied {copied} files into {args.directory}")
+            if args.commands:
+                saved = sysroot.capture_commands(args.commands)
+                print_success(f"Recorded {saved} command outputs into {args.commands}")
+    except OSError as e:
+        print_error(f"Could not write sysroot: {str(e)}")
+        sys.exit(1)
+
+def run_tunables(args):
+    """Print, save or compare kernel tunables (/proc/sys)"""
+    prefixes = [prefix.strip() for prefix in args.prefixes.split(",") if prefix.strip()] if args.prefixes else None
+    try:
+        if args.compare:
+            before = tunables.load_snapshot(args.compare[0])
+            if len(args.compare) > 1:
+                after = tunables.load_snapshot(args.compare[1])
+            else:
+                # Walk the same subtrees the snapshot covers, so only real differences show
+                after = {"Hostname": "this host",
+                         "Tunables": tunables.read_tunables(prefixes or before.get("Prefixes"))}
+            rows = tunables.compare_tunables(before["Tunables"], after["Tunables"])
+            if args.json:
+                print(json.dumps(rows, indent=2, ensure_ascii=False))
+            elif rows:
+                print_table(f"Tunables: {before['Hostname']} -> {after['Hostname']}", rows,
+                            ["Tunable", "Change", "Before", "After"])
+            else:
+                print_success(f"No tunable differences between {before['Hostname']} and {after['Hostname']}")
+            return
+
+        start = time.perf_counter()
+        values = tunables.read_tunables(prefixes)
+        if args.save:
+            tunables.save_snapshot(args.save, values, prefixes)
+            print_success(f"Saved {len(values)} tunables to {args.save} in {time.perf_counter() - start:.2f}s")
+        elif args.json:
+            print(json.dumps(values, indent=2, ensure_ascii=False))
+        else:
+            rows = [{"Tunable": name, "Value": " ".join(str(item) for item in value) if isinstance(value, list)
+                     else str(value)} for name, value in values.items()]
+            print_table("Kernel Tunables", rows, ["Tunable", "Value"])
+    except (OSError, ValueError) as e:
+        print_error(f"Could not process tunables: {str(e)}")
+        sys.exit(1)
+
+# Sub-sections with one row per device, printed as a single table
+TABLE_SECTIONS = {"I/O", "Huge Pages", "Stall", "Top Processes", "Rates", "Top Local Ports", "Top Peers"}
+# Columns shown for wide tables, when present; --json keeps every field
+TABLE_COLUMNS = {
+    "Top Processes": ["PID", "User", "Name", "State", "CPU (%)", "RSS", "Read kB/s", "Write kB/s"],
+    "Rates": ["Interface", "RX Bytes/s", "TX Bytes/s", "Peak RX Bytes/s", "Peak TX Bytes/s",
+              "RX Packets/s", "TX Packets/s", "RX Drops", "RX Errors", "RX FIFO"],
+}
+
+def table_columns(name, rows):
+    """The TABLE_COLUMNS present in rows, or None to show every key (e.g. for an error row)"""
+    if not rows or name not in TABLE_COLUMNS:
+        return None
+    columns = [column for column in TABLE_COLUMNS[name] if column in rows[0]]
+    return columns or None
+
+# Entries shown in the --profile summary
+PROFILE_ROWS = 25
+
+def print_inventory_section(name, section):
+    """Print one collected section, its per-device sub-sections as tables"""
+    print_section_header(f"{name} Information")
+    if isinstance(section, dict) and list(section) == ["Error"]:
+        print_error(section["Error"])
+        return
+    for section_name, section_data in section.items():
+        if section_name in TABLE_SECTIONS:
+            print_table(section_name, section_data, table_columns(section_name, section_data))
+        else:
+            print_section(section_name, section_data)
+
+def run_watch(args):
+    """Print the hotplug-dependent sections, then reprint each one when a uevent changes it"""
+    try:
+        listener = hotplug.UeventListener()
+    except OSError as e:
+        print_error(f"Could not listen for kernel uevents: {str(e)}")
+        sys.exit(1)
+    sections = [(name, collector) for name, collector in inventory.get_sections(
+        disk_partitions=args.disk_partitions, network_details=args.network_details,
+        usb_details=args.usb_details) if name in hotplug.HOTPLUG_SECTIONS]
+    cache = hotplug.SectionCache(sections, listener)
+    with listener:
+        for name, section in cache.snapshot().items():
+            print_inventory_section(name, section)
+        console.print("[dim]Waiting for hardware changes (Ctrl+C to stop)...[/dim]")
+        try:
+            while True:
+                names, events = cache.poll(None)
+                for event in events:
+                    if hotplug.affected_sections([event]):
+                        console.print(f"[yellow]{event['ACTION']} {event['SUBSYSTEM']} {event.get('DEVPATH', '')}[/yellow]")
+                for name in names:
+                    print_inventory_section(name, cache.get(name))
+        except KeyboardInterrupt:
+            pass
+
+def print_profile(args):
+    """Print the slowest collectors, commands and file reads of this run"""
+    # Keep stdout parseable when it carries a JSON snapshot
+    output = stderr_console if args.json else console
+    rows = profiling.summarize()
+    print_table("Profile", rows[:PROFILE_ROWS],
+                ["Kind", "Name", "Calls", "Total (ms)", "Max (ms)", "Bytes Read", "Peak Memory", "Status"],
+                output=output)
+    if len(rows) > PROFILE_ROWS:
+        output.print(f"[dim]... and {len(rows) - PROFILE_ROWS} faster entries (see --profile-trace)[/dim]")
+    totals = profiling.get_totals()
+    output.print("[cyan]" + "  ".join(f"{key}: {value}" for key, value in totals.items()) + "[/cyan]")
+    if args.profile_trace:
+        try:
+            profiling.write_trace(args.profile_trace)
+            output.print(f"[green]Trace written to {args.profile_trace} (open in chrome://tracing or Perfetto)[/green]")
+        except OSError as e:
+            output.print(f"[red]Could not write trace: {str(e)}[/red]")
+
 def main():
     parser = argparse.ArgumentParser(
         description="Heracross - System Information Tool",
@@ -50,29 +271,213 @@ Examples:
     python main.py                           Show basic system information
     python main.py --all-details             Show all detailed information
     python main.py --disk-partitions         Include disk partition details
+    python main.py --memory-details          Include the /proc/meminfo breakdown and huge pages
+    python main.py --disk-io                 Include per-disk I/O rates and utilization
+    python main.py --pressure --pressure-window 10s
+                                             CPU, memory and I/O stalls and paging rates over 10s
+    python main.py --top-processes 20 --process-sort io
+                                             The 20 processes doing the most storage I/O
     python main.py --network-details         Include network interface details
+    python main.py --network-details --interfaces "type=physical,state=up" --interface-limit 50
+                                             Only the interfaces you want, one page at a time
+    python main.py --network-rates eth0,eth1 --network-resolution 1ms
+                                             Throughput, drops and microburst peaks per interface
+    python main.py --sockets                 Count TCP and UDP sockets by state, port and peer
     python main.py --usb-details             Include USB device details
+    python main.py --json > snapshot.json    Save a machine-readable snapshot
+    python main.py --changes                 Report swapped DIMMs, disks, PCI or USB devices
+    python main.py record metrics.hxts --interval 0.1 --duration 600
+                                             Record metrics during a load test
+    python main.py fleet snapshots/ --bios-before 2021-01-01 --dimm-part M393A2K43DB3-CWE
+                                             Query a directory of snapshots
+    python main.py --json --deadline 500ms   Bound collection time on unhealthy hosts
+    python main.py --profile --profile-trace trace.json
+                                             Show where the run spends its time
+    python main.py watch                     Reprint sections as devices are plugged in or removed
+    python main.py tunables --save host-a.json
+    python main.py tunables --compare host-a.json host-b.json
+                                             Differences in sysctl settings between two hosts
+    python main.py sysroot synth /tmp/big --cpus 1024 --disks 500
+    python main.py --sysroot /tmp/big --json Collect from a synthesized machine
         """
     )
     
     parser.add_argument('--disk-partitions', action='store_true', 
                         help='Show disk partition information')
+    parser.add_argument('--memory-details', action='store_true',
+                        help='Show the full /proc/meminfo breakdown and huge page statistics')
+    parser.add_argument('--disk-io', action='store_true',
+                        help='Sample per-disk IOPS, throughput, latency and utilization for one second')
+    parser.add_argument('--pressure', action='store_true',
+                        help='Sample CPU, memory and I/O stall (PSI) and paging, reclaim and compaction rates')
+    parser.add_argument('--pressure-window', type=inventory.parse_duration, metavar='TIME',
+                        help='Window the pressure rates cover, e.g. 10s (default: 1s)')
+    parser.add_argument('--top-processes', type=positive_int, nargs='?', const=processes.DEFAULT_TOP, metavar='N',
+                        help=f'Show the N busiest processes (default: {processes.DEFAULT_TOP})')
+    parser.add_argument('--process-sort', choices=processes.SORT_KEYS, default='cpu',
+                        help='Rank processes by CPU, resident memory or storage I/O (default: cpu)')
     parser.add_argument('--network-details', action='store_true', 
                         help='Show detailed network interface information')
+    parser.add_argument('--interfaces', metavar='EXPR',
+                        help='Select interfaces, e.g. "name=eth*|ens*,!type=veth,state=up,has-address" or "netns=NAME"')
+    parser.add_argument('--interface-sort', choices=network.INTERFACE_SORT_KEYS, default='index',
+                        help='Order of the listed interfaces (default: index)')
+    parser.add_argument('--interface-offset', type=non_negative_int, default=0, metavar='N',
+                        help='Skip the first N selected interfaces')
+    parser.add_argument('--interface-limit', type=non_negative_int, default=network.INTERFACE_PAGE_SIZE, metavar='N',
+                        help=f'List at most N interfaces (default: {network.INTERFACE_PAGE_SIZE})')
+    parser.add_argument('--network-rates', nargs='?', const='', metavar='IFACES',
+                        help='Sample throughput, packets, drops, errors and FIFO overruns for one second '
+                             '(comma-separated interfaces, default: all)')
+    parser.add_argument('--network-resolution', type=inventory.parse_duration, metavar='TIME',
+                        help='Also sample every TIME within that second and report peak rates, e.g. 1ms')
+    parser.add_argument('--sockets', action='store_true',
+                        help='Count TCP and UDP sockets by state, local port and remote peer')
     parser.add_argument('--usb-details', action='store_true', 
                         help='Show detailed USB device information')
     parser.add_argument('--all-details', action='store_true',
                         help='Show all detailed information')
     parser.add_argument('--no-header', action='store_true',
                         help='Skip the header and summary')
+    parser.add_argument('--json', action='store_true',
+                        help='Print a full JSON snapshot instead of formatted output')
+    parser.add_argument('--changes', action='store_true',
+                        help='Report hardware changes since the previous --changes run')
+    parser.add_argument('--deadline', type=inventory.parse_duration, metavar='TIME',
+                       help='Time budget for all sections, e.g. 500ms or 2s; slow commands are killed')
+    parser.add_argument('--profile', action='store_true',
+                       help='Time every collector, command and file read and print a summary')
+    parser.add_argument('--profile-trace', metavar='FILE',
+                       help='Also write a Chrome trace-event JSON file (implies --profile)')
+    parser.add_argument('--sysroot', metavar='DIR',
+                       help='Read /proc, /sys and /etc from DIR instead of the host')
+    parser.add_argument('--replay', metavar='DIR',
+                       help='Answer external commands from outputs recorded in DIR')
+    parser.add_argument('--fingerprint-file',
+                        help='Fingerprint file used by --changes (default: ~/.cache/heracross/fingerprints.jsonl)')
+
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    record_parser = subparsers.add_parser('record', help='Record host metrics into a ring file')
+    record_parser.add_argument('output', help='Ring file to create')
+    record_parser.add_argument('--metrics', default=",".join(recorder.AVAILABLE_METRICS),
+                               help='Comma-separated metrics: ' + ", ".join(recorder.AVAILABLE_METRICS))
+    record_parser.add_argument('--interval', type=positive_float, default=1.0,
+                               help='Sampling interval in seconds (default: 1.0)')
+    record_parser.add_argument('--capacity', type=positive_int, default=86400,
+                               help='Number of records kept in the ring (default: 86400)')
+    record_parser.add_argument('--duration', type=float,
+                               help='Stop after this many seconds (default: until Ctrl+C)')
+
+    fleet_parser = subparsers.add_parser('fleet', help='Query a directory of JSON snapshots')
+    fleet_parser.add_argument('directory', help='Directory containing snapshots from --json')
+    fleet_parser.add_argument('--cpu-model', help='Exact CPU model name')
+    fleet_parser.add_argument('--dimm-part', help='DIMM part number')
+    fleet_parser.add_argument('--disk-model', help='Disk model')
+    fleet_parser.add_argument('--gpu', help='GPU model')
+    fleet_parser.add_argument('--bios-version', help='Exact BIOS version')
+    fleet_parser.add_argument('--bios-before', help='BIOS release date older than this (YYYY-MM-DD)')
+    fleet_parser.add_argument('--bios-version-below', help='BIOS version lower than this')
+    fleet_parser.add_argument('--min-memory', help='Minimum total memory, e.g. "64 GB"')
+    fleet_parser.add_argument('--workers', type=int, help='Parser processes (default: CPU count)')
+    fleet_parser.add_argument('--limit', type=int, default=50, help='Maximum hosts to list (default: 50)')
+    fleet_parser.add_argument('--count', action='store_true', help='Only print the number of matches')
+
+    subparsers.add_parser('watch', help='Reprint the USB, disk, network and GPU sections when hardware changes')
+
+    tunables_parser = subparsers.add_parser('tunables', help='Snapshot and compare kernel tunables (/proc/sys)')
+    tunables_parser.add_argument('--prefixes', metavar='LIST',
+                                 help='Comma-separated sysctl prefixes (default: ' +
+                                      ",".join(tunables.DEFAULT_PREFIXES) + ')')
+    tunables_parser.add_argument('--save', metavar='FILE', help='Write the tunables to a JSON snapshot')
+    tunables_parser.add_argument('--compare', nargs='+', metavar='FILE',
+                                 help='Compare a snapshot with this host, or two snapshots with each other '
+                                      '(one or two files)')
+
+    sysroot_parser = subparsers.add_parser('sysroot', help='Capture or synthesize a sysroot for --sysroot')
+    sysroot_commands = sysroot_parser.add_subparsers(dest='sysroot_command', required=True)
+    synth_parser = sysroot_commands.add_parser('synth', help='Generate a sysroot for a very large machine')
+    synth_parser.add_argument('directory', help='Directory to create')
+    synth_parser.add_argument('--cpus', type=int, default=1024, help='Logical CPUs (default: 1024)')
+    synth_parser.add_argument('--disks', type=int, default=500, help='Block devices (default: 500)')
+    synth_parser.add_argument('--interfaces', type=int, default=2000, help='Network interfaces (default: 2000)')
+    synth_parser.add_argument('--usb-devices', type=int, default=64, help='USB devices (default: 64)')
+    synth_parser.add_argument('--processes', type=int, default=5000, help='Processes in /proc (default: 5000)')
+    capture_parser = sysroot_commands.add_parser('capture', help='Copy the files read on this machine')
+    capture_parser.add_argument('directory', help='Directory to create')
+    capture_parser.add_argument('--commands', metavar='DIR', help='Also record command outputs for --replay')
     
     args = parser.parse_args()
+    if args.command == 'tunables' and args.compare and len(args.compare) > 2:
+        tunables_parser.error("--compare takes one snapshot (against this host) or two")
+    sources.configure(sysroot=args.sysroot, replay=args.replay)
+
+    profile = args.profile or args.profile_trace
+    if profile:
+        profiling.enable()
+    try:
+        run_command(args)
+    finally:
+        if profile:
+            profiling.disable()
+            print_profile(args)
+
+def run_command(args):
+    """Run the selected subcommand, or gather and print the system information"""
+    if args.command == 'record':
+        run_record(args)
+        return
+    if args.command == 'fleet':
+        run_fleet(args)
+        return
+    if args.command == 'sysroot':
+        run_sysroot(args)
+        return
+    if args.command == 'tunables':
+        run_tunables(args)
+        return
+    if args.command == 'watch':
+        run_watch(args)
+        return
+    if args.changes:
+        run_changes(args)
+        return
     
     # Enable all details if --all-details is used
     if args.all_details:
         args.disk_partitions = True
+        args.memory_details = True
+        args.disk_io = True
+        args.pressure = True
+        args.top_processes = args.top_processes or processes.DEFAULT_TOP
         args.network_details = True
+        if args.network_rates is None:
+            args.network_rates = ''
+        args.sockets = True
         args.usb_details = True
+
+    if args.json:
+        snapshot = inventory.collect_inventory(
+            deadline=args.deadline,
+            disk_partitions=args.disk_partitions,
+            memory_details=args.memory_details,
+            disk_io=args.disk_io,
+            pressure_stats=args.pressure,
+            pressure_window=args.pressure_window,
+            top_processes=args.top_processes,
+            process_sort=args.process_sort,
+            network_rates=args.network_rates is not None,
+            rate_interfaces=[name for name in (args.network_rates or "").split(",") if name] or None,
+            rate_resolution=args.network_resolution,
+            sockets=args.sockets,
+            network_details=args.network_details,
+            interface_selector=args.interfaces,
+            interface_sort=args.interface_sort,
+            interface_offset=args.interface_offset,
+            interface_limit=args.interface_limit,
+            usb_details=args.usb_details
+        )
+        print(json.dumps(snapshot, indent=2, ensure_ascii=False))
+        return
     
     try:
         # Clear screen and show header
@@ -83,82 +488,32 @@ Examples:
             # Show progress bar
             print_progress_bar("Gathering system information...")
             
-            # Show summary stats
-            summary = get_system_summary()
+            # Show summary stats (skipped under a deadline, it would run collectors outside the budget)
+            summary = get_system_summary() if args.deadline is None else {}
             if summary:
                 print_summary_stats(summary)
         
-        # Operating System Information
-        print_section_header("Operating System Information")
-        try:
-            os_information = os_info.get_os_info()
-            for section_name, section_data in os_information.items():
-                print_section(section_name, section_data)
-        except Exception as e:
-            print_error(f"Failed to get OS information: {str(e)}")
-
-        # CPU Information
-        print_section_header("CPU Information")
-        try:
-            cpu_info = cpu.get_cpu_info()
-            for section_name, section_data in cpu_info.items():
-                print_section(section_name, section_data)
-        except Exception as e:
-            print_error(f"Failed to get CPU information: {str(e)}")
-
-        # Memory Information
-        print_section_header("Memory Information")
-        try:
-            memory_info = memory.get_memory_info()
-            for section_name, section_data in memory_info.items():
-                print_section(section_name, section_data)
-        except Exception as e:
-            print_error(f"Failed to get memory information: {str(e)}")
-
-        # Disk Information
-        print_section_header("Disk Information")
-        try:
-            disk_info = disk.get_disk_info(include_partitions=args.disk_partitions)
-            for section_name, section_data in disk_info.items():
-                print_section(section_name, section_data)
-        except Exception as e:
-            print_error(f"Failed to get disk information: {str(e)}")
-
-        # GPU Information
-        print_section_header("GPU Information")
-        try:
-            gpu_info = gpu.get_gpu_info()
-            for section_name, section_data in gpu_info.items():
-                print_section(section_name, section_data)
-        except Exception as e:
-            print_error(f"Failed to get GPU information: {str(e)}")
-
-        # Network Information
-        print_section_header("Network Information")
-        try:
-            network_info = network.get_network_info(include_details=args.network_details)
-            for section_name, section_data in network_info.items():
-                print_section(section_name, section_data)
-        except Exception as e:
-            print_error(f"Failed to get network information: {str(e)}")
-
-        # USB Information
-        print_section_header("USB Information")
-        try:
-            usb_info = usb.get_usb_info(include_details=args.usb_details)
-            for section_name, section_data in usb_info.items():
-                print_section(section_name, section_data)
-        except Exception as e:
-            print_error(f"Failed to get USB information: {str(e)}")
-
-        # Motherboard Information
-        print_section_header("Motherboard Information")
-        try:
-            motherboard_info = motherboard.get_motherboard_info()
-            for section_name, section_data in motherboard_info.items():
-                print_section(section_name, section_data)
-        except Exception as e:
-            print_error(f"Failed to get motherboard information: {str(e)}")
+        sections = inventory.get_sections(
+            disk_partitions=args.disk_partitions,
+            memory_details=args.memory_details,
+            disk_io=args.disk_io,
+            pressure_stats=args.pressure,
+            pressure_window=args.pressure_window,
+            top_processes=args.top_processes,
+            process_sort=args.process_sort,
+            network_rates=args.network_rates is not None,
+            rate_interfaces=[name for name in (args.network_rates or "").split(",") if name] or None,
+            rate_resolution=args.network_resolution,
+            sockets=args.sockets,
+            network_details=args.network_details,
+            interface_selector=args.interfaces,
+            interface_sort=args.interface_sort,
+            interface_offset=args.interface_offset,
+            interface_limit=args.interface_limit,
+            usb_details=args.usb_details
+        )
+        for name, section in inventory.collect_sections(sections, args.deadline):
+            print_inventory_section(name, section)
 
         # Footer
         if not args.no_header:
@@ -0,0 +1,209 @@
+import time
+import signal
+import socket
+import asyncio
+import weakref
+import threading
+import concurrent.futures
+from datetime import datetime
+
+from system_info import (cpu, memory, disk, motherboard, gpu, network, os_info, usb, pressure, processes, modules,
+                         tunables, sources, inventory)
+
+# External commands running at once per event loop
+MAX_CONCURRENT_COMMANDS = 8
+
+_semaphores = weakref.WeakKeyDictionary()
+
+def _command_semaphore(loop):
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_COMMANDS)
+    return _semaphores[loop]
+
+def _decode(data, kwargs):
+    if data is None or not (kwargs.get("text") or kwargs.get("encoding") or kwargs.get("universal_newlines")):
+        return data
+    return data.decode(kwargs.get("encoding") or "utf-8", errors="replace")
+
+async def run_process(args, limit, input=None, kwargs=None, started=None):
+    """Run a command with asyncio.create_subprocess_exec; returns (stdout, stderr, returncode, killed).
+
+    The limit counts from the start of the process, not from the wait for the semaphore;
+    started (a threading.Event) is set at that point. A cancelled call kills the process.
+    """
+    kwargs = kwargs or {}
+    popen_kwargs = {key: kwargs[key] for key in ("stdin", "stdout", "stderr", "env", "cwd", "start_new_session")
+                    if key in kwargs}
+    killed = False
+    async with _command_semaphore(asyncio.get_running_loop()):
+        process = await asyncio.create_subprocess_exec(*args, **popen_kwargs)
+        if started is not None:
+            started.set()
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(input), limit)
+        except asyncio.CancelledError:
+            _kill(process, popen_kwargs)
+            await process.wait()
+            raise
+        except asyncio.TimeoutError:
+            killed = True
+            _kill(process, popen_kwargs)
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), 1)
+            except asyncio.TimeoutError:
+                process.kill()
+                stdout = stderr = b""
+        returncode = await process.wait()
+    return _decode(stdout, kwargs), _decode(stderr, kwargs), returncode, killed
+
+def _kill(process, popen_kwargs):
+    if process.returncode is not None:
+        return
+    if popen_kwargs.get("start_new_session"):
+        sources.kill_process_group(process)
+    else:
+        process.kill()
+
+async def run(args, timeout=None, **kwargs):
+    """Async subprocess.run replacement with the same timeout and replay rules as sources.run"""
+    if sources.REPLAY_DIR is not None:
+        return sources.replay_command(args, **kwargs)
+    loop = asyncio.get_running_loop()
+    # The deadline and result handling stay in sources; only the process itself runs on the loop
+    return await asyncio.to_thread(_run_from_thread, loop, args, timeout, kwargs)
+
+def _run_from_thread(loop, args, timeout, kwargs):
+    sources.set_runner(_loop_runner(loop))
+    try:
+        return sources.run_command(args, timeout=timeout, **kwargs)
+    finally:
+        sources.set_runner(None)
+
+def _loop_runner(loop):
+    """Runner for sources.run_command that hands each command to the event loop"""
+    def runner(args, limit, input, kwargs):
+        started = threading.Event()
+        future = asyncio.run_coroutine_threadsafe(run_process(args, limit, input, kwargs, started), loop)
+        # Time queued behind the semaphore does not count against the command's limit
+        while not started.wait(0.1):
+            if future.done() or not loop.is_running():
+                break
+        try:
+            # Bounded even if the loop stops before answering
+            return future.result(None if limit is None else limit + 2)
+        except concurrent.futures.TimeoutError:
+            # Cancelling makes run_process kill the command; it then fails like a killed one
+            future.cancel()
+            return _decode(b"", kwargs), _decode(b"", kwargs), -signal.SIGKILL, True
+    return runner
+
+async def run_collector(collector, *args, deadline=None, **kwargs):
+    """Run a blocking collector in a worker thread, its commands on the running loop"""
+    loop = asyncio.get_running_loop()
+
+    def call():
+        sources.set_runner(_loop_runner(loop))
+        if deadline is not None:
+            sources.set_deadline(time.monotonic() + deadline)
+        try:
+            return collector(*args, **kwargs), sources.timed_out_commands()
+        finally:
+            sources.set_runner(None)
+            sources.set_deadline(None)
+
+    if deadline is None:
+        data, _ = await asyncio.to_thread(call)
+        return data
+    try:
+        data, timed_out = await asyncio.wait_for(asyncio.to_thread(call), deadline + inventory.DEADLINE_GRACE)
+    except asyncio.TimeoutError:
+        # The worker thread finishes on its own once its commands hit the deadline
+        return inventory.mark_deadline(None, deadline)
+    return inventory.mark_deadline(data, deadline, timed_out)
+
+async def get_os_info():
+    """Async variant of os_info.get_os_info"""
+    return await run_collector(os_info.get_os_info)
+
+async def get_cpu_info():
+    """Async variant of cpu.get_cpu_info"""
+    return await run_collector(cpu.get_cpu_info)
+
+async def get_memory_info(include_details=False):
+    """Async variant of memory.get_memory_info"""
+    return await run_collector(memory.get_memory_info, include_details=include_details)
+
+async def get_disk_info(include_partitions=False, include_io=False):
+    """Async variant of disk.get_disk_info"""
+    return await run_collector(disk.get_disk_info, include_partitions=include_partitions, include_io=include_io)
+
+async def get_pressure_info(interval=1.0, window=None):
+    """Async variant of pressure.get_pressure_info"""
+    return await run_collector(pressure.get_pressure_info, interval=interval, window=window)
+
+async def get_top_processes(sort_by="cpu", count=processes.DEFAULT_TOP, interval=1.0, include_io=True):
+    """Async variant of processes.get_top_processes"""
+    return await run_collector(processes.get_top_processes, sort_by=sort_by, count=count,
+                               interval=interval, include_io=include_io)
+
+async def get_gpu_info():
+    """Async variant of gpu.get_gpu_info"""
+    return await run_collector(gpu.get_gpu_info)
+
+async def get_network_info(include_details=False, include_rates=False, rate_interfaces=None, rate_resolution=None,
+                           include_sockets=False, interface_selector=None, interface_sort="index",
+                           interface_offset=0, interface_limit=network.INTERFACE_PAGE_SIZE):
+    """Async variant of network.get_network_info"""
+    return await run_collector(network.get_network_info, include_details=include_details, include_rates=include_rates,
+                               rate_interfaces=rate_interfaces, rate_resolution=rate_resolution,
+                               include_sockets=include_sockets, interface_selector=interface_selector,
+                               interface_sort=interface_sort, interface_offset=interface_offset,
+                               interface_limit=interface_limit)
+
+async def list_interfaces(selector=None, sort="index", offset=0, limit=network.INTERFACE_PAGE_SIZE,
+                          include_details=False):
+    """Async variant of network.list_interfaces"""
+    return await run_collector(network.list_interfaces, selector, sort=sort, offset=offset, limit=limit,
+                               include_details=include_details)
+
+async def get_socket_summary(top=network.TOP_SOCKET_ENTRIES):
+    """Async variant of network.get_socket_summary"""
+    return await run_collector(network.get_socket_summary, top=top)
+
+async def get_network_rates(interfaces=None, interval=1.0, resolution=None):
+    """Async variant of network.get_network_rates"""
+    return await run_collector(network.get_network_rates, interfaces, interval=interval, resolution=resolution)
+
+async def get_module_info(names=None, include_parameters=False):
+    """Async variant of modules.get_module_info"""
+    return await run_collector(modules.get_module_info, names, include_parameters=include_parameters)
+
+async def get_tunables_info(prefixes=None):
+    """Async variant of tunables.get_tunables_info"""
+    return await run_collector(tunables.get_tunables_info, prefixes)
+
+async def get_usb_info(include_details=False):
+    """Async variant of usb.get_usb_info"""
+    return await run_collector(usb.get_usb_info, include_details=include_details)
+
+async def get_motherboard_info():
+    """Async variant of motherboard.get_motherboard_info"""
+    return await run_collector(motherboard.get_motherboard_info)
+
+async def _collect_section(name, collector, deadline):
+    try:
+        return await run_collector(collector, deadline=deadline)
+    except Exception as e:
+        return {"Error": f"Could not collect {name} information: {str(e)}"}
+
+async def collect_inventory(deadline=None, **options):
+    """Collect every section concurrently; with a deadline each section may use all of it"""
+    snapshot = {
+        "Hostname": socket.gethostname(),
+        "Collected At": datetime.now().isoformat(timespec="seconds"),
+    }
+    sections = inventory.get_sections(**options)
+    results = await asyncio.gather(*(_collect_section(name, collector, deadline) for name, collector in sections))
+    for (name, _), data in zip(sections, results):
+        snapshot[name] = data
+    return snapshot
@@ -1,5 +1,5 @@
-import subprocess
 import os
+from system_info import sources
 
 def get_cpu_info():
     """Get comprehensive CPU information including hardware details and current status"""
@@ -18,7 +18,7 @@ def get_cpu_info():
 def get_basic_cpu_info():
     """Get basic CPU information from lscpu, supporting localized output"""
     try:
-        output = subprocess.run(["lscpu"], capture_output=True, text=True)
+        output = sources.run(["lscpu"], capture_output=True, text=True)
         info = {}
         for line in output.stdout.splitlines():
             if ":" in line:
@@ -55,7 +55,7 @@ def get_basic_cpu_info():
 def get_detailed_cpu_info():
     """Get detailed CPU information from /proc/cpuinfo"""
     try:
-        with open("/proc/cpuinfo", "r") as f:
+        with sources.open_file("/proc/cpuinfo", "r") as f:
             cpuinfo = f.read()
         
         # Parse the first processor entry for detailed info
@@ -99,8 +99,8 @@ def get_cpu_temperature():
     
     for i, temp_file in enumerate(temp_sources):
         try:
-            if os.path.exists(temp_file):
-                with open(temp_file, "r") as f:
+            if sources.exists(temp_file):
+                with sources.open_file(temp_file, "r") as f:
                     temp_raw = int(f.read().strip())
                     temp_celsius = temp_raw / 1000.0
                     temperatures[f"Zone {i}"] = f"{temp_celsius:.1f}°C"
@@ -110,7 +110,7 @@ def get_cpu_temperature():
     # Try sensors command as alternative
     if not temperatures:
         try:
-            output = subprocess.run(["sensors"], capture_output=True, text=True)
+            output = sources.run(["sensors"], capture_output=True, text=True)
             if output.returncode == 0:
                 for line in output.stdout.splitlines():
                     if "Core" in line and "°C" in line:
@@ -126,15 +126,15 @@ def get_cpu_frequencies():
     
     try:
         scaling_path = "/sys/devices/system/cpu"
-        cpu_dirs = [d for d in os.listdir(scaling_path) if d.startswith("cpu") and d[3:].isdigit()]
+        cpu_dirs = [d for d in sources.listdir(scaling_path) if d.startswith("cpu") and d[3:].isdigit()]
         
         for cpu_dir in sorted(cpu_dirs):
             cpu_num = cpu_dir[3:]
             freq_file = os.path.join(scaling_path, cpu_dir, "cpufreq/scaling_cur_freq")
             
-            if os.path.exists(freq_file):
+            if sources.exists(freq_file):
                 try:
-                    with open(freq_file, "r") as f:
+                    with sources.open_file(freq_file, "r") as f:
                         freq_khz = int(f.read().strip())
                         freq_mhz = freq_khz / 1000
                         frequencies[f"CPU {cpu_num}"] = f"{freq_mhz:.0f} MHz"
@@ -147,9 +147,9 @@ def get_cpu_frequencies():
                 cpu_num = cpu_dir[3:]
                 freq_file = os.path.join(scaling_path, cpu_dir, "cpufreq/cpuinfo_cur_freq")
                 
-                if os.path.exists(freq_file):
+                if sources.exists(freq_file):
                     try:
-                        with open(freq_file, "r") as f:
+                        with sources.open_file(freq_file, "r") as f:
                             freq_khz = int(f.read().strip())
                             freq_mhz = freq_khz / 1000
                             frequencies[f"CPU {cpu_num}"] = f"{freq_mhz:.0f} MHz"
@@ -165,7 +165,7 @@ def get_cpu_usage():
     """Get current CPU usage percentage"""
     try:
         # Read /proc/stat for CPU usage
-        with open("/proc/stat", "r") as f:
+        with sources.open_file("/proc/stat", "r") as f:
             line = f.readline()
         
         if line.startswith("cpu "):
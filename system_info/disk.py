@@ -1,43 +1,164 @@
-import psutil
-import subprocess
 import re
 import os
+import time
 import argparse
+import threading
+import collections
+from system_info import sources
 
-def get_disk_info(include_partitions: bool = True):
+# udev keeps one "b<major>:<minor>" file per block device here
+UDEV_DATA_DIR = "/run/udev/data"
+
+# /sys/block entries that lsblk does not report as TYPE="disk"
+NON_DISK_PREFIXES = ("loop", "ram", "dm-", "md", "sr")
+
+# Filesystems without backing storage, left out of partition usage by default
+PSEUDO_FILESYSTEMS = {
+    "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs", "debugfs", "devpts", "devtmpfs",
+    "efivarfs", "fusectl", "hugetlbfs", "mqueue", "nsfs", "overlay", "proc", "pstore", "ramfs",
+    "rpc_pipefs", "securityfs", "selinuxfs", "squashfs", "sysfs", "tmpfs", "tracefs", "fuse.lxcfs",
+}
+PARTITION_WORKERS = 16
+# Seconds a single statvfs may take before its mount is reported as unresponsive
+STATVFS_TIMEOUT = 2.0
+OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+# Mounts whose statvfs is still blocked in a worker thread from an earlier call
+_hung_mounts = set()
+
+# Devices left out of I/O rates unless all devices are requested
+IO_EXCLUDED_PREFIXES = ("loop", "ram")
+
+# /proc/diskstats token positions (major, minor and name come first)
+DISKSTATS_COLUMNS = {
+    "reads": 3, "read_sectors": 5, "read_ms": 6,
+    "writes": 7, "write_sectors": 9, "write_ms": 10,
+    "in_flight": 11, "io_ms": 12, "queue_ms": 13,
+}
+# Older snapshots are reused by the next sample instead of sleeping again
+MIN_SAMPLE_INTERVAL = 0.1
+
+# queue/ attributes reported for each disk
+QUEUE_ATTRIBUTES = [
+    ("Scheduler", "scheduler"),
+    ("Queue Depth", "nr_requests"),
+    ("Max Sectors (KB)", "max_sectors_kb"),
+    ("Read Ahead (KB)", "read_ahead_kb"),
+    ("Logical Block Size", "logical_block_size"),
+    ("Physical Block Size", "physical_block_size"),
+    ("Write Cache", "write_cache"),
+]
+
+def get_disk_info(include_partitions: bool = True, include_io: bool = False):
     """
     Get physical disk hardware info.
-    Optionally include partition usage info if include_partitions=True.
+    Optionally include partition usage info if include_partitions=True
+    and per-device I/O rates (sampled over one second) if include_io=True.
     """
-    hardware_info = get_physical_disks_info()
+    hardware_info = get_physical_disks_info(include_queue=True)
     result = {
         "Hardware": hardware_info
     }
     if include_partitions:
         partitions_info = get_partitions_info()
         result["Partitions"] = partitions_info
+    if include_io:
+        result["I/O"] = get_disk_io_info()
     return result
 
-def get_physical_disks_info():
-    """Get info about physical disks (model, serial, size, type) using lsblk and udevadm"""
+def get_physical_disks_info(include_queue=False):
+    """Get info about physical disks (model, serial, size, type) from /sys/block, falling back to lsblk"""
+    try:
+        disks = get_block_devices(include_queue)
+    except OSError:
+        disks = []
+    return disks or get_lsblk_disks_info()
+
+def format_block_size(size_bytes):
+    """Human-readable size in the style of lsblk (57.3G, 256G, 0B)"""
+    size = float(size_bytes)
+    for unit in ("B", "K", "M", "G", "T", "P"):
+        if size < 1024 or unit == "P":
+            break
+        size /= 1024
+    return f"{size:.0f}{unit}" if size == int(size) else f"{size:.1f}{unit}"
+
+def get_block_devices(include_queue=True):
+    """List disks with one scandir pass over /sys/block, plus their queue settings"""
+    devices = []
+    with sources.scandir("/sys/block") as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith(NON_DISK_PREFIXES):
+                continue
+            base = f"/sys/block/{name}"
+            if sources.read_attribute(f"{base}/hidden") == "1":
+                # Per-path namespaces of a multipath NVMe device
+                continue
+            devices.append({
+                "Name": name,
+                "Dev": sources.read_attribute(f"{base}/dev"),
+                "Size": sources.read_attribute(f"{base}/size"),
+                "Rotational": sources.read_attribute(f"{base}/queue/rotational"),
+                "Removable": sources.read_attribute(f"{base}/removable"),
+                "Model": sources.read_attribute(f"{base}/device/model"),
+                "Vendor": sources.read_attribute(f"{base}/device/vendor"),
+                "Serial": sources.read_attribute(f"{base}/device/serial") or sources.read_attribute(f"{base}/serial"),
+                "WWID": sources.read_attribute(f"{base}/device/wwid") or sources.read_attribute(f"{base}/wwid"),
+                "Queue": {label: sources.read_attribute(f"{base}/queue/{attribute}")
+                          for label, attribute in QUEUE_ATTRIBUTES} if include_queue else None,
+            })
+
+    udev = get_udev_properties([device["Name"] for device in devices],
+                               {device["Name"]: device["Dev"] for device in devices if device["Dev"]})
+    disks = []
+    # sda..sdz before sdaa, like the kernel assigns them
+    for device in sorted(devices, key=lambda device: (len(device["Name"]), device["Name"])):
+        properties = udev.get(device["Name"], {})
+        disk_info = {
+            "Name": device["Name"],
+            "Model": device["Model"] or properties.get("ID_MODEL", "").replace("_", " "),
+            # virtio reports a numeric vendor ID here rather than a name
+            "Vendor": properties.get("ID_VENDOR") or (device["Vendor"] if not (device["Vendor"] or "0x").startswith("0x") else None),
+            "Serial": device["Serial"] or properties.get("ID_SERIAL_SHORT", ""),
+            "WWN": properties.get("ID_WWN_WITH_EXTENSION") or properties.get("ID_WWN") or device["WWID"],
+            "Bus": properties.get("ID_BUS"),
+            "Size": format_block_size(int(device["Size"]) * 512) if (device["Size"] or "").isdigit() else None,
+            "Type": "SSD" if device["Rotational"] == "0" else "HDD" if device["Rotational"] == "1" else "disk",
+            "Removable": "Yes" if device["Removable"] == "1" else "No",
+        }
+        if device["Queue"]:
+            queue = device["Queue"]
+            if queue.get("Scheduler"):
+                # "none [mq-deadline] kyber" -> the active scheduler
+                active = re.search(r"\[(\S+)\]", queue["Scheduler"])
+                queue["Scheduler"] = active.group(1) if active else queue["Scheduler"]
+            disk_info.update(queue)
+        disks.append(disk_info)
+    return disks
+
+def get_lsblk_disks_info():
+    """Get info about physical disks (model, serial, size, type) using lsblk and the udev database"""
     disks = []
     try:
-        lsblk_output = subprocess.run(
+        lsblk_output = sources.run(
             ["lsblk", "-d", "-o", "NAME,MODEL,SIZE,ROTA,SERIAL,TYPE", "-P"], 
             capture_output=True, text=True, encoding="utf-8",
             env={**os.environ, "LC_ALL": "C"}
         ).stdout.splitlines()
-        for line in lsblk_output:
-            # Parse key="value" pairs
-            fields = dict(re.findall(r'(\w+)="([^"]*)"', line))
-            if fields.get("TYPE") != "disk":
-                continue
+        # Parse key="value" pairs
+        devices = [dict(re.findall(r'(\w+)="([^"]*)"', line)) for line in lsblk_output]
+        devices = [fields for fields in devices if fields.get("TYPE") == "disk"]
+        udev = get_udev_properties([fields.get("NAME") for fields in devices])
+        for fields in devices:
+            properties = udev.get(fields.get("NAME"), {})
             size = fields.get("SIZE", "").replace(",", ".")
             disk_info = {
                 "Name": fields.get("NAME"),
-                "Model": fields.get("MODEL"),
-                "Vendor": get_disk_vendor(fields.get("NAME")),
-                "Serial": fields.get("SERIAL"),
+                "Model": fields.get("MODEL") or properties.get("ID_MODEL", "").replace("_", " "),
+                "Vendor": properties.get("ID_VENDOR"),
+                "Serial": fields.get("SERIAL") or properties.get("ID_SERIAL_SHORT", ""),
+                "WWN": properties.get("ID_WWN_WITH_EXTENSION") or properties.get("ID_WWN"),
+                "Bus": properties.get("ID_BUS"),
                 "Size": size,
                 "Type": "SSD" if fields.get("ROTA") == "0" else "HDD" if fields.get("ROTA") == "1" else fields.get("TYPE"),
             }
@@ -48,39 +169,248 @@ def get_physical_disks_info():
         disks.append({"Error": f"Could not get disk hardware info: {str(e)}"})
     return disks
 
+def read_udev_data(major_minor):
+    """Read the E: properties udev recorded for a block device number"""
+    properties = {}
+    with sources.open_file(f"{UDEV_DATA_DIR}/b{major_minor}", "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("E:"):
+                key, _, value = line[2:].rstrip("\n").partition("=")
+                properties[key] = value
+    return properties
+
+def parse_udev_export_db(output):
+    """Map block device names to their properties from 'udevadm info --export-db' output"""
+    devices = {}
+    name, properties = None, {}
+    for line in output.splitlines() + [""]:
+        if not line.strip():
+            if name and properties.get("SUBSYSTEM") == "block":
+                devices[name] = properties
+            name, properties = None, {}
+        elif line.startswith("N: "):
+            name = line[3:].strip()
+        elif line.startswith("E: "):
+            key, _, value = line[3:].partition("=")
+            properties[key] = value
+    return devices
+
+def get_udev_properties(disk_names, dev_numbers=None):
+    """udev properties per disk: one small file read each, or a single udevadm fork when the database is unreadable"""
+    properties = {}
+    missing = []
+    dev_numbers = dev_numbers or {}
+    for name in disk_names:
+        try:
+            major_minor = dev_numbers.get(name)
+            if major_minor is None:
+                with sources.open_file(f"/sys/block/{name}/dev", "r") as f:
+                    major_minor = f.read().strip()
+            properties[name] = read_udev_data(major_minor)
+        except OSError:
+            missing.append(name)
+
+    if missing:
+        try:
+            output = sources.run(
+                ["udevadm", "info", "--export-db"],
+                capture_output=True, text=True, encoding="utf-8", errors="replace"
+            ).stdout
+            exported = parse_udev_export_db(output)
+            for name in missing:
+                if name in exported:
+                    properties[name] = exported[name]
+        except Exception:
+            pass
+    return properties
+
 def get_disk_vendor(disk_name):
-    """Try to get disk vendor using udevadm"""
+    """Get the disk vendor from the udev database"""
+    return get_udev_properties([disk_name]).get(disk_name, {}).get("ID_VENDOR")
+
+def read_mounts():
+    """Parse /proc/self/mounts into (device, mountpoint, fstype, options) tuples"""
+    mounts = []
+    for line in sources.read_file("/proc/self/mounts").splitlines():
+        fields = line.split()
+        if len(fields) < 4:
+            continue
+        # Spaces and tabs in paths are written as octal escapes (\040)
+        device, mountpoint = (OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), field) for field in fields[:2])
+        mounts.append((device, mountpoint, fields[2], fields[3]))
+    return mounts
+
+def statvfs_mounts(mountpoints, workers=PARTITION_WORKERS, timeout=STATVFS_TIMEOUT):
+    """statvfs every mountpoint on daemon worker threads; a mount that hangs costs one worker, not the caller"""
+    results = {}
+    pending = collections.deque(mountpoint for mountpoint in dict.fromkeys(mountpoints)
+                                if mountpoint not in _hung_mounts)
+    running = {}
+    condition = threading.Condition()
+
+    def worker():
+        while True:
+            with condition:
+                if not pending:
+                    return
+                mountpoint = pending.popleft()
+                running[mountpoint] = time.monotonic()
+            try:
+                value = os.statvfs(sources.host_path(mountpoint))
+            except OSError as e:
+                value = e
+            with condition:
+                results[mountpoint] = value
+                running.pop(mountpoint, None)
+                _hung_mounts.discard(mountpoint)
+                condition.notify_all()
+
+    for _ in range(min(workers, len(pending))):
+        threading.Thread(target=worker, name="statvfs", daemon=True).start()
+
+    with condition:
+        hung = set()
+        while pending or not hung.issuperset(running):
+            now = time.monotonic()
+            for mountpoint, started in running.items():
+                if mountpoint not in hung and now - started > timeout:
+                    hung.add(mountpoint)
+                    # The stuck worker is written off and a fresh one takes over the queued mounts
+                    if pending:
+                        threading.Thread(target=worker, name="statvfs", daemon=True).start()
+            condition.wait(0.05)
+        # Mounts still stuck in statvfs are remembered and skipped next time
+        _hung_mounts.update(running)
+        for mountpoint in running:
+            results[mountpoint] = TimeoutError(f"statvfs did not return within {timeout:g}s")
+
+    for mountpoint in mountpoints:
+        if mountpoint not in results:
+            results[mountpoint] = TimeoutError("a previous statvfs on this mount has not returned")
+    return results
+
+def get_partitions_info(include_pseudo=False, workers=PARTITION_WORKERS, timeout=STATVFS_TIMEOUT):
+    """Get info about mounted partitions and their usage, reporting hung mounts as unresponsive"""
     try:
-        dev_path = f"/dev/{disk_name}"
-        output = subprocess.run(
-            ["udevadm", "info", "--query=property", "--name", dev_path],
-            capture_output=True, text=True
-        ).stdout
-        for line in output.splitlines():
-            if line.startswith("ID_VENDOR="):
-                return line.split("=", 1)[1]
-    except Exception:
-        pass
-    return None
-
-def get_partitions_info():
-    """Get info about mounted partitions and their usage"""
-    partitions = psutil.disk_partitions()
+        mounts = [mount for mount in read_mounts() if include_pseudo or mount[2] not in PSEUDO_FILESYSTEMS]
+    except OSError as e:
+        return [{"Error": f"Could not read mount table: {str(e)}"}]
+    usage = statvfs_mounts([mount[1] for mount in mounts], workers, timeout)
+
     partition_data = []
-    for p in partitions:
-        try:
-            usage = psutil.disk_usage(p.mountpoint)
-            partition_data.append({
-                "Device": p.device,
-                "Mountpoint": p.mountpoint,
-                "File system": p.fstype,
-                "Total": f"{usage.total / (1024 ** 3):.2f} GB",
-                "Used": f"{usage.used / (1024 ** 3):.2f} GB",
-                "Free": f"{usage.free / (1024 ** 3):.2f} GB",
-                "Usage Percent": f"{usage.percent}%",
-                "Options": p.opts
-            })
-        except PermissionError:
+    for device, mountpoint, fstype, options in mounts:
+        stat = usage[mountpoint]
+        partition = {"Device": device, "Mountpoint": mountpoint, "File system": fstype}
+        if isinstance(stat, PermissionError):
             continue
+        elif isinstance(stat, TimeoutError):
+            partition["Status"] = f"Unresponsive ({str(stat)})"
+        elif isinstance(stat, OSError):
+            partition["Status"] = f"Error: {stat.strerror or str(stat)}"
+        else:
+            # Same arithmetic as psutil.disk_usage
+            total = stat.f_blocks * stat.f_frsize
+            free = stat.f_bavail * stat.f_frsize
+            used = (stat.f_blocks - stat.f_bfree) * stat.f_frsize
+            percent = round(used / (used + free) * 100, 1) if used + free else 0.0
+            partition.update({
+                "Total": f"{total / (1024 ** 3):.2f} GB",
+                "Used": f"{used / (1024 ** 3):.2f} GB",
+                "Free": f"{free / (1024 ** 3):.2f} GB",
+                "Usage Percent": f"{percent}%",
+            })
+        partition["Options"] = options
+        partition_data.append(partition)
     return partition_data
 
+def read_diskstats(devices=None):
+    """Parse /proc/diskstats into one list per column, keeping only the given device names"""
+    text = sources.read_file("/proc/diskstats").strip()
+    if not text:
+        return {"name": [], **{key: [] for key in DISKSTATS_COLUMNS}}
+
+    # Every line has the same field count on a given kernel, so columns are plain slices of one token list
+    tokens = text.split()
+    width = len(text.split("\n", 1)[0].split())
+    if width < 14 or width * (text.count("\n") + 1) != len(tokens):
+        tokens = [token for line in text.splitlines() if line.strip()
+                  for token in (line.split() + ["0"] * 14)[:14]]
+        width = 14
+    names = tokens[2::width]
+    if devices is None:
+        columns = {"name": names}
+        for key, index in DISKSTATS_COLUMNS.items():
+            columns[key] = list(map(int, tokens[index::width]))
+        return columns
+
+    # Select rows before converting, so thousands of ignored dm/loop devices cost only a slice
+    rows = [i for i, name in enumerate(names) if name in devices]
+    columns = {"name": [names[i] for i in rows]}
+    for key, index in DISKSTATS_COLUMNS.items():
+        column = tokens[index::width]
+        columns[key] = [int(column[i]) for i in rows]
+    return columns
+
+def compute_disk_io_rates(previous, current):
+    """Per-device rates between two (monotonic time, read_diskstats()) snapshots, in iostat terms"""
+    (start, before), (end, after) = previous, current
+    elapsed = end - start
+    if elapsed <= 0:
+        return []
+    if before["name"] != after["name"]:
+        # Devices came or went: line the old counters up with the new device list
+        index = {name: i for i, name in enumerate(before["name"])}
+        before = {key: [before[key][index[name]] if name in index else after[key][i]
+                        for i, name in enumerate(after["name"])]
+                  for key in DISKSTATS_COLUMNS}
+    deltas = {key: [max(new - old, 0) for old, new in zip(before[key], after[key])]
+              for key in DISKSTATS_COLUMNS if key != "in_flight"}
+
+    rates = []
+    for i, name in enumerate(after["name"]):
+        reads, writes = deltas["reads"][i], deltas["writes"][i]
+        read_ms, write_ms = deltas["read_ms"][i], deltas["write_ms"][i]
+        rates.append({
+            "Device": name,
+            "Reads/s": round(reads / elapsed, 2),
+            "Writes/s": round(writes / elapsed, 2),
+            "Read kB/s": round(deltas["read_sectors"][i] * 512 / 1024 / elapsed, 2),
+            "Write kB/s": round(deltas["write_sectors"][i] * 512 / 1024 / elapsed, 2),
+            "Read Await (ms)": round(read_ms / reads, 2) if reads else 0.0,
+            "Write Await (ms)": round(write_ms / writes, 2) if writes else 0.0,
+            "Queue Size": round(deltas["queue_ms"][i] / (elapsed * 1000), 2),
+            "In Flight": after["in_flight"][i],
+            "Utilization (%)": round(min(deltas["io_ms"][i] / (elapsed * 1000) * 100, 100.0), 1),
+        })
+    return rates
+
+class DiskIOSampler:
+    """Keeps the last /proc/diskstats snapshot so repeated calls report rates since the previous one"""
+
+    def __init__(self):
+        self.previous = None
+
+    def snapshot(self, devices=None):
+        return time.monotonic(), read_diskstats(devices)
+
+    def sample(self, interval=1.0, devices=None):
+        previous = self.previous
+        if previous is None or time.monotonic() - previous[0] < MIN_SAMPLE_INTERVAL:
+            previous = self.snapshot(devices)
+            time.sleep(interval)
+        current = self.snapshot(devices)
+        self.previous = current
+        return compute_disk_io_rates(previous, current)
+
+_io_sampler = DiskIOSampler()
+
+def get_disk_io_info(interval=1.0, all_devices=False):
+    """Per-device IOPS, throughput, await, queue size and utilization from /proc/diskstats"""
+    try:
+        devices = None
+        if not all_devices:
+            devices = {name for name in sources.listdir("/sys/block") if not name.startswith(IO_EXCLUDED_PREFIXES)}
+        rates = _io_sampler.sample(interval, devices)
+        return rates or [{"Warning": "No block devices found in /proc/diskstats"}]
+    except Exception as e:
+        return [{"Error": f"Could not get disk I/O statistics: {str(e)}"}]
@@ -0,0 +1,174 @@
+import os
+import struct
+import ctypes
+import threading
+from system_info import sources
+
+# linux/inotify.h
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_IGNORED = 0x00008000
+IN_Q_OVERFLOW = 0x00004000
+IN_ONLYDIR = 0x01000000
+# Parent directories are watched, not the files: editors, resolvconf and timedatectl replace a
+# file (or the /etc/localtime link) by renaming a new one over it, which a file watch would miss
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+# struct inotify_event: wd, mask, cookie, name length, then the NUL-padded name
+INOTIFY_EVENT = struct.Struct("iIII")
+READ_SIZE = 65536
+
+class InotifyWatcher:
+    """Non-blocking inotify descriptor from libc through ctypes; reports changed (directory, name) pairs"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.directories = {}
+
+    def watch(self, directory):
+        """Watch a directory for files being written, replaced, created or removed"""
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), directory)
+        self.directories[wd] = directory
+
+    def read_changes(self):
+        """(directory, name) pairs changed since the last call, without blocking.
+
+        A None name means the whole directory is unknown again: it was removed, or the
+        event queue overflowed (then the directory is None as well).
+        """
+        changes = []
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                return changes
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    changes.append((None, None))
+                elif mask & IN_IGNORED:
+                    changes.append((self.directories.pop(wd, None), None))
+                elif wd in self.directories:
+                    changes.append((self.directories[wd], name))
+
+    def close(self):
+        os.close(self.fd)
+
+class FileCache:
+    """Parsed contents of config files, kept until inotify reports one of the files changed"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.watcher = None
+        self.pid = None
+        self.entries = {}
+        # (directory, name) -> keys of the entries depending on that file
+        self.dependents = {}
+        # Keys being loaded; a change to one of their files drops them from here
+        self.loading = set()
+
+    def _ensure_watcher(self):
+        # A forked child shares the parent's descriptor and would consume its events
+        if self.pid != os.getpid():
+            self._forget()
+            self.pid = os.getpid()
+            try:
+                self.watcher = InotifyWatcher()
+            except (OSError, AttributeError):
+                # No inotify (non-Linux libc, or the per-user instance limit reached)
+                self.watcher = None
+        return self.watcher
+
+    def _apply_changes(self):
+        for directory, name in self.watcher.read_changes():
+            if directory is None:
+                self._forget()
+                return
+            files = [file for file in self.dependents if file[0] == directory] if name is None else [(directory, name)]
+            for file in files:
+                for key in self.dependents.pop(file, ()):
+                    self.entries.pop(key, None)
+                    self.loading.discard(key)
+
+    def _forget(self):
+        self.entries.clear()
+        self.dependents.clear()
+        self.loading.clear()
+
+    def _watch(self, key, path):
+        """Watch a file's directory and, when it is a symlink, its target's; False if that is impossible"""
+        for file in {path, os.path.realpath(path)}:
+            directory, name = os.path.split(file)
+            while True:
+                try:
+                    self.watcher.watch(directory)
+                    break
+                except FileNotFoundError:
+                    # e.g. /etc/sysconfig on Debian: wait for the missing directory to be created
+                    if directory == os.path.dirname(directory):
+                        return False
+                    directory, name = os.path.split(directory)
+                except OSError:
+                    return False
+            self.dependents.setdefault((directory, name), set()).add(key)
+        return True
+
+    def get(self, paths, loader):
+        """loader()'s result, cached until a file in paths is written, replaced, created or removed"""
+        host_paths = tuple(sources.host_path(path) for path in paths)
+        # Keyed by the mapped paths too, so a different sysroot never sees another tree's data
+        key = (loader, host_paths)
+        with self.lock:
+            watched = self._ensure_watcher() is not None
+            if watched:
+                self._apply_changes()
+                if key in self.entries:
+                    return self.entries[key]
+                # Watch before reading, so a change made while loading is not missed
+                watched = all([self._watch(key, path) for path in host_paths])
+                if watched:
+                    self.loading.add(key)
+        try:
+            value = loader()
+        except Exception:
+            with self.lock:
+                self.loading.discard(key)
+            raise
+        if watched:
+            with self.lock:
+                self._apply_changes()
+                if key in self.loading:
+                    self.loading.discard(key)
+                    self.entries[key] = value
+        return value
+
+    def clear(self):
+        with self.lock:
+            self._forget()
+
+_cache = FileCache()
+
+def cached(paths, loader):
+    """Process-wide FileCache.get; loaders should return fresh objects callers may not modify"""
+    return _cache.get(paths, loader)
+
+def clear():
+    _cache.clear()
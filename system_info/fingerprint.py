@@ -0,0 +1,171 @@
+import os
+import json
+import hashlib
+import socket
+from collections import Counter
+from datetime import datetime
+
+from system_info import disk, memory, motherboard, usb, sources
+
+FORMAT_VERSION = 1
+
+# Fields used to pair up list items (DIMMs, disks, devices) between two runs
+IDENTITY_FIELDS = ["Serial", "Serial Number", "Slot", "Address", "Device Path", "Name"]
+
+def default_fingerprint_path():
+    """Location of the fingerprint file kept between runs"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "heracross", "fingerprints.jsonl")
+
+def get_dmi_info():
+    """DMI identity from sysfs (no sudo, no dmidecode fork)"""
+    return {
+        "Motherboard": motherboard.get_motherboard_fallback_info(),
+        "BIOS": motherboard.get_bios_fallback_info(),
+        "System": motherboard.get_system_fallback_info(),
+    }
+
+def get_pci_devices():
+    """List PCI functions with their vendor, device, subsystem and class IDs from sysfs"""
+    devices = []
+    pci_devices_path = "/sys/bus/pci/devices"
+    try:
+        for address in sorted(sources.listdir(pci_devices_path)):
+            device = {"Address": address}
+            for attribute in ("vendor", "device", "subsystem_vendor", "subsystem_device", "class", "revision"):
+                try:
+                    with sources.open_file(os.path.join(pci_devices_path, address, attribute), "r") as f:
+                        device[attribute.replace("_", " ").title()] = f.read().strip()
+                except OSError:
+                    continue
+            devices.append(device)
+    except OSError as e:
+        return [{"Error": f"Could not read PCI devices: {str(e)}"}]
+    return devices
+
+def get_static_sections():
+    """Return (section name, collector) pairs for sections that only change with hardware swaps"""
+    return [
+        ("DMI", get_dmi_info),
+        ("DIMMs", memory.get_memory_hardware_info),
+        ("Disks", disk.get_physical_disks_info),
+        ("PCI", get_pci_devices),
+        ("USB", usb.get_usb_devices_fallback),
+    ]
+
+def canonical_json(data):
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+def section_hash(data):
+    """Stable content hash of a section, independent of key order"""
+    return hashlib.blake2b(canonical_json(data).encode("utf-8"), digest_size=16).hexdigest()
+
+def _item_identity(item):
+    if isinstance(item, dict):
+        for field in IDENTITY_FIELDS:
+            if item.get(field):
+                return f"{field}={item[field]}"
+    return None
+
+def diff_section(old, new, path=""):
+    """Structural diff between two versions of a section as a list of change records"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in old.keys() | new.keys():
+            child = f"{path}.{key}" if path else str(key)
+            if key not in new:
+                changes.append({"Change": "Removed", "Path": child, "Old": old[key]})
+            elif key not in old:
+                changes.append({"Change": "Added", "Path": child, "New": new[key]})
+            elif canonical_json(old[key]) != canonical_json(new[key]):
+                changes.extend(diff_section(old[key], new[key], child))
+        return sorted(changes, key=lambda change: change["Path"])
+
+    if isinstance(old, list) and isinstance(new, list):
+        old_keyed = {_item_identity(item): item for item in old}
+        new_keyed = {_item_identity(item): item for item in new}
+        if None not in old_keyed and None not in new_keyed and len(old_keyed) == len(old) and len(new_keyed) == len(new):
+            # Every item has a unique identity: report per-item modifications
+            return diff_section(old_keyed, new_keyed, path)
+
+        # Otherwise compare as multisets of items
+        old_items = Counter(canonical_json(item) for item in old)
+        new_items = Counter(canonical_json(item) for item in new)
+        changes = [{"Change": "Removed", "Path": path, "Old": json.loads(item)}
+                   for item in (old_items - new_items).elements()]
+        changes += [{"Change": "Added", "Path": path, "New": json.loads(item)}
+                    for item in (new_items - old_items).elements()]
+        return changes
+
+    return [{"Change": "Changed", "Path": path, "Old": old, "New": new}]
+
+def load_fingerprints(path):
+    """Read only the hash line of a fingerprint file; section bodies are loaded on demand"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+        if header.get("Version") != FORMAT_VERSION:
+            return None
+        return header
+    except (OSError, ValueError):
+        return None
+
+def load_section_data(path, wanted):
+    """Decode the stored bodies of the given sections only"""
+    sections = {}
+    with open(path, "r", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            name, _, body = line.partition("\t")
+            if name in wanted:
+                sections[name] = json.loads(body)
+    return sections
+
+def save_fingerprints(path, hashes, sections):
+    """Write the hash line followed by one 'name<TAB>json' line per section, atomically"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    header = {
+        "Version": FORMAT_VERSION,
+        "Host": socket.gethostname(),
+        "Updated": datetime.now().isoformat(timespec="seconds"),
+        "Hashes": hashes,
+    }
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.write(canonical_json(header) + "\n")
+        for name, data in sections.items():
+            f.write(f"{name}\t{canonical_json(data)}\n")
+    os.replace(temporary, path)
+
+def check_changes(path=None):
+    """Compare current static sections against the previous run and update the fingerprint file"""
+    path = path or default_fingerprint_path()
+    current = {name: collector() for name, collector in get_static_sections()}
+    hashes = {name: section_hash(data) for name, data in current.items()}
+
+    previous = load_fingerprints(path)
+    if previous is None:
+        save_fingerprints(path, hashes, current)
+        return {"Status": "Baseline created", "File": path, "Sections": list(hashes)}
+
+    previous_hashes = previous.get("Hashes", {})
+    changed = [name for name, digest in hashes.items() if previous_hashes.get(name) != digest]
+    if not changed:
+        return {"Status": "No hardware changes", "Since": previous.get("Updated"), "File": path}
+
+    old_sections = load_section_data(path, set(changed))
+    changes = {}
+    for name in changed:
+        if name not in old_sections:
+            changes[name] = [{"Change": "Added", "Path": name}]
+        else:
+            changes[name] = diff_section(old_sections[name], current[name])
+    save_fingerprints(path, hashes, current)
+
+    return {
+        "Status": "Hardware changed",
+        "Since": previous.get("Updated"),
+        "File": path,
+        "Changed Sections": changed,
+        "Changes": changes,
+    }
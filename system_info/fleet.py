@@ -0,0 +1,221 @@
+import os
+import re
+import json
+import bisect
+from array import array
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+# Directories smaller than this are parsed in-process; a pool only pays off on large fleets
+PARALLEL_THRESHOLD = 64
+
+UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+def parse_size(value):
+    """Convert sizes like '15.52 GB' or '16384 MB' into bytes"""
+    match = re.match(r"\s*([\d.]+)\s*([KMGT]?B)", str(value or ""), re.IGNORECASE)
+    if not match:
+        return 0
+    return int(float(match.group(1)) * UNITS[match.group(2).upper()])
+
+def parse_bios_date(value):
+    """Convert dmidecode (MM/DD/YYYY) or ISO dates into a proleptic ordinal, 0 if unknown"""
+    for date_format in ("%m/%d/%Y", "%Y-%m-%d", "%m/%d/%y"):
+        try:
+            return datetime.strptime(str(value).strip(), date_format).toordinal()
+        except ValueError:
+            continue
+    return 0
+
+def version_key(version):
+    """Natural sort key so that '1.10' sorts after '1.9'"""
+    return tuple((0, int(part)) if part.isdigit() else (1, part.lower())
+                for part in re.split(r"(\d+)", str(version or "")) if part)
+
+def _section(snapshot, *keys):
+    for key in keys:
+        if not isinstance(snapshot, dict):
+            return None
+        snapshot = snapshot.get(key)
+    return snapshot
+
+def _values(items, *keys):
+    """Collect the first present key of each dict in a list, skipping placeholders"""
+    values = []
+    for item in items if isinstance(items, list) else []:
+        for key in keys:
+            value = item.get(key) if isinstance(item, dict) else None
+            if value and value not in ("N/A", "Unknown", "Not Specified"):
+                values.append(str(value).strip())
+                break
+    return tuple(sorted(set(values)))
+
+def normalize_snapshot(snapshot, path=""):
+    """Reduce a full snapshot to one fleet row"""
+    host = snapshot.get("Hostname") or os.path.splitext(os.path.basename(path))[0]
+    bios = _section(snapshot, "Motherboard", "BIOS") or {}
+    return (
+        host,
+        path,
+        _section(snapshot, "CPU", "Basic Info", "Model") or "",
+        parse_size(_section(snapshot, "Memory", "Usage", "Total")),
+        _values(_section(snapshot, "Disk", "Hardware"), "Model"),
+        _values(_section(snapshot, "GPU", "Hardware"), "Model", "Device"),
+        str(bios.get("Version") or ""),
+        parse_bios_date(bios.get("Release Date")),
+        _values(_section(snapshot, "Memory", "Hardware", "Modules"), "Part Number"),
+    )
+
+def load_snapshot_row(path):
+    """Process pool worker: read one snapshot file, return (row, error)"""
+    try:
+        with open(path, "rb") as f:
+            return normalize_snapshot(json.load(f), path), None
+    except (OSError, ValueError, AttributeError) as e:
+        return None, f"{path}: {str(e)}"
+
+class FleetInventory:
+    """Columnar fleet table with per-value indexes for instant inventory queries"""
+
+    def __init__(self):
+        self.hosts = []
+        self.paths = []
+        self.memory_total = array("Q")
+        self.bios_dates = array("L")
+        # Dictionary-encoded columns: one code per host plus the list of distinct values
+        self.cpu_models = array("L")
+        self.bios_versions = array("L")
+        self.disk_models = []
+        self.gpus = []
+        self.dimm_parts = []
+        self.dictionaries = {"cpu": [], "bios_version": []}
+        self._codes = {"cpu": {}, "bios_version": {}}
+        self.indexes = {"cpu": {}, "bios_version": {}, "disk_model": {}, "gpu": {}, "dimm_part": {}}
+        self.errors = []
+        self._bios_date_index = None
+        self._bios_version_index = None
+
+    def __len__(self):
+        return len(self.hosts)
+
+    def _encode(self, column, value):
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.dictionaries[column])
+            self.dictionaries[column].append(value)
+        return code
+
+    def add_row(self, row):
+        host, path, cpu_model, memory_total, disks, gpus, bios_version, bios_date, dimm_parts = row
+        row_id = len(self.hosts)
+        self.hosts.append(host)
+        self.paths.append(path)
+        self.memory_total.append(memory_total)
+        self.bios_dates.append(bios_date)
+        self.cpu_models.append(self._encode("cpu", cpu_model))
+        self.bios_versions.append(self._encode("bios_version", bios_version))
+        self.disk_models.append(disks)
+        self.gpus.append(gpus)
+        self.dimm_parts.append(dimm_parts)
+
+        for column, values in (("cpu", (cpu_model,)), ("bios_version", (bios_version,)),
+                               ("disk_model", disks), ("gpu", gpus), ("dimm_part", dimm_parts)):
+            index = self.indexes[column]
+            for value in values:
+                if value:
+                    index.setdefault(value, []).append(row_id)
+        self._bios_date_index = None
+        self._bios_version_index = None
+
+    def _sorted_bios_dates(self):
+        if self._bios_date_index is None:
+            pairs = sorted((date, row_id) for row_id, date in enumerate(self.bios_dates) if date)
+            self._bios_date_index = ([date for date, _ in pairs], [row_id for _, row_id in pairs])
+        return self._bios_date_index
+
+    def _sorted_bios_versions(self):
+        if self._bios_version_index is None:
+            versions = sorted((version_key(v), v) for v in self.dictionaries["bios_version"] if v)
+            self._bios_version_index = ([key for key, _ in versions], [v for _, v in versions])
+        return self._bios_version_index
+
+    def query(self, cpu_model=None, dimm_part=None, disk_model=None, gpu=None, bios_version=None,
+              bios_before=None, bios_version_below=None, min_memory=None):
+        """Return the row ids of hosts matching every given filter, in load order"""
+        candidates = []
+        for column, value in (("cpu", cpu_model), ("dimm_part", dimm_part), ("disk_model", disk_model),
+                              ("gpu", gpu), ("bios_version", bios_version)):
+            if value is not None:
+                candidates.append(self.indexes[column].get(value, []))
+
+        if bios_before is not None:
+            dates, row_ids = self._sorted_bios_dates()
+            cutoff = parse_bios_date(bios_before)
+            candidates.append(row_ids[:bisect.bisect_left(dates, cutoff)])
+
+        if bios_version_below is not None:
+            keys, versions = self._sorted_bios_versions()
+            older = versions[:bisect.bisect_left(keys, version_key(bios_version_below))]
+            candidates.append([row_id for v in older for row_id in self.indexes["bios_version"][v]])
+
+        if not candidates:
+            matches = range(len(self.hosts))
+        else:
+            # Intersect starting from the most selective filter
+            candidates.sort(key=len)
+            result = set(candidates[0])
+            for other in candidates[1:]:
+                if not result:
+                    break
+                result.intersection_update(other)
+            matches = sorted(result)
+
+        if min_memory is not None:
+            minimum = parse_size(min_memory)
+            matches = [row_id for row_id in matches if self.memory_total[row_id] >= minimum]
+        return list(matches)
+
+    def row(self, row_id):
+        """Materialize one host as a display dictionary"""
+        bios_date = self.bios_dates[row_id]
+        return {
+            "Host": self.hosts[row_id],
+            "CPU": self.dictionaries["cpu"][self.cpu_models[row_id]],
+            "Memory": f"{self.memory_total[row_id] / (1024 ** 3):.2f} GB",
+            "BIOS Version": self.dictionaries["bios_version"][self.bios_versions[row_id]],
+            "BIOS Date": datetime.fromordinal(bios_date).strftime("%Y-%m-%d") if bios_date else "",
+            "Disks": ", ".join(self.disk_models[row_id]),
+            "GPUs": ", ".join(self.gpus[row_id]),
+            "DIMM Parts": ", ".join(self.dimm_parts[row_id]),
+        }
+
+def find_snapshots(directory):
+    """List snapshot files (*.json) below a directory"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files if name.endswith(".json"))
+    return sorted(paths)
+
+def load_fleet(directory, workers=None):
+    """Ingest every snapshot in a directory with a process pool and build the fleet indexes"""
+    paths = find_snapshots(directory)
+    fleet = FleetInventory()
+    executor = None
+    if len(paths) < PARALLEL_THRESHOLD or workers == 1:
+        results = map(load_snapshot_row, paths)
+    else:
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(load_snapshot_row, paths, chunksize=max(1, len(paths) // (workers * 8)))
+
+    try:
+        for row, error in results:
+            if row is not None:
+                fleet.add_row(row)
+            else:
+                fleet.errors.append(error)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return fleet
@@ -1,12 +1,46 @@
 import subprocess
+import threading
+import time
 import re
 import os
+from system_info import sources, modules
+
+# Every nvidia-smi field used anywhere, fetched for all GPUs in one call; name goes last
+# because it is the only value that may contain the ", " separator
+NVIDIA_FIELDS = [
+    "index", "pci.bus_id", "driver_version", "memory.total", "memory.used", "memory.free",
+    "temperature.gpu", "utilization.gpu", "utilization.memory", "power.draw", "clocks.sm", "name",
+]
+NVIDIA_VENDOR_ID = "0x10de"
+NVIDIA_QUERY_COMMAND = ["nvidia-smi", f"--query-gpu={','.join(NVIDIA_FIELDS)}", "--format=csv,noheader,nounits"]
+
+PCI_DEVICES_DIR = "/sys/bus/pci/devices"
+DRM_DIR = "/sys/class/drm"
+AMD_VENDOR_ID = "0x1002"
+# amdgpu attributes under /sys/class/drm/card<N>/device; hwmon values are in microwatts and millidegrees
+AMD_ATTRIBUTES = [
+    ("vram_total", "mem_info_vram_total"),
+    ("vram_used", "mem_info_vram_used"),
+    ("busy", "gpu_busy_percent"),
+    ("sclk", "pp_dpm_sclk"),
+    ("mclk", "pp_dpm_mclk"),
+    ("power", "hwmon/*/power1_average"),
+    ("temperature", "hwmon/*/temp1_input"),
+]
 
 def get_gpu_info():
     """Get comprehensive GPU information including hardware details and driver info"""
-    hardware_info = get_gpu_hardware_info()
-    driver_info = get_gpu_driver_info()
-    temperature_info = get_gpu_temperature()
+    # One nvidia-smi query per refresh serves the hardware, driver and temperature sections,
+    # skipped when sysfs shows no NVIDIA display device
+    displays = display_devices()
+    if displays is None or any(sources.read_attribute(f"{PCI_DEVICES_DIR}/{slot}/vendor") == NVIDIA_VENDOR_ID
+                           for slot in displays):
+        nvidia = query_nvidia_gpus()
+    else:
+        nvidia = {}
+    hardware_info = get_gpu_hardware_info(nvidia)
+    driver_info = get_gpu_driver_info(nvidia)
+    temperature_info = get_gpu_temperature(nvidia)
     
     return {
         "Hardware": hardware_info,
@@ -14,13 +48,39 @@ def get_gpu_info():
         "Temperature": temperature_info
     }
 
-def get_gpu_hardware_info():
+def pci_slot(address):
+    """Normalize a PCI address ('01:00.0' from lspci, '00000000:01:00.0' from nvidia-smi) to 0000:01:00.0"""
+    parts = address.strip().lower().split(":")
+    domain = int(parts[0], 16) if len(parts) == 3 else 0
+    return f"{domain:04x}:{':'.join(parts[-2:])}"
+
+def parse_nvidia_query(output):
+    """Parse csv,noheader,nounits rows of NVIDIA_FIELDS into dicts; [N/A] and [Not Supported] become None"""
+    gpus = []
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        values = [value.strip() for value in line.split(", ", len(NVIDIA_FIELDS) - 1)]
+        if len(values) != len(NVIDIA_FIELDS):
+            continue
+        gpus.append({field: None if value.startswith("[") else value for field, value in zip(NVIDIA_FIELDS, values)})
+    return gpus
+
+def query_nvidia_gpus():
+    """Every NVIDIA_FIELDS value of every GPU from a single nvidia-smi call, keyed by PCI slot in index order"""
+    try:
+        result = sources.run(NVIDIA_QUERY_COMMAND, capture_output=True, text=True, check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return {}
+    return {pci_slot(gpu["pci.bus_id"]): gpu for gpu in parse_nvidia_query(result.stdout) if gpu["pci.bus_id"]}
+
+def get_gpu_hardware_info(nvidia=None):
     """Get GPU hardware information using lspci and additional sources"""
     gpus = []
     
     try:
         # Get basic GPU info from lspci
-        result = subprocess.run(
+        result = sources.run(
             ["lspci", "-v"], 
             capture_output=True, text=True, check=True,
             env={**os.environ, "LC_ALL": "C"}
@@ -42,8 +102,8 @@ def get_gpu_hardware_info():
                 if current_gpu:  # Save previous GPU
                     gpus.append(current_gpu)
                 
-                # Start new GPU
-                current_gpu = {}
+                # Start new GPU; the line starts with its bus address, e.g. "01:00.0 VGA compatible controller"
+                current_gpu = {"Bus ID": pci_slot(line.split(" ", 1)[0])}
                 in_gpu_section = True
                 
                 # Extract basic info from the device line
@@ -75,7 +135,7 @@ def get_gpu_hardware_info():
             gpus.append(current_gpu)
         
         # Enhance with additional info
-        gpus = enhance_gpu_info(gpus)
+        gpus = enhance_gpu_info(gpus, nvidia)
         
         return gpus if gpus else [{"Warning": "No GPU devices found"}]
         
@@ -86,63 +146,182 @@ def get_gpu_hardware_info():
     except Exception as e:
         return [{"Error": f"Could not get GPU hardware info: {str(e)}"}]
 
-def enhance_gpu_info(gpus):
+def enhance_gpu_info(gpus, nvidia=None):
     """Enhance GPU information with additional details"""
+    if nvidia is None and any("NVIDIA" in gpu.get("Device", "").upper() for gpu in gpus):
+        nvidia = query_nvidia_gpus()
+    # GPUs whose bus ID cannot be matched take the remaining nvidia-smi rows in order
+    unmatched = [slot for slot in (nvidia or {}) if slot not in {gpu.get("Bus ID") for gpu in gpus}]
+    amd = None
     for gpu in gpus:
-        # Try to get memory info for NVIDIA cards
+        # Memory, utilization and power for NVIDIA cards from the shared query
         if "NVIDIA" in gpu.get("Vendor", "").upper() or "NVIDIA" in gpu.get("Device", "").upper():
-            memory_info = get_nvidia_memory_info()
+            slot = gpu.get("Bus ID")
+            if slot not in (nvidia or {}) and unmatched:
+                slot = unmatched.pop(0)
+            memory_info = get_nvidia_memory_info(slot, nvidia)
             if memory_info:
                 gpu.update(memory_info)
         
-        # Try to get memory info for AMD cards
-        elif "AMD" in gpu.get("Vendor", "").upper() or "ATI" in gpu.get("Vendor", "").upper():
-            memory_info = get_amd_memory_info()
+        # Memory, utilization, clocks and power for AMD cards from amdgpu sysfs
+        elif "AMD" in gpu.get("Vendor", "").upper() or "ATI" in gpu.get("Vendor", "").upper() or \
+                re.search(r"\b(AMD|ATI)\b", gpu.get("Device", "")):
+            if amd is None:
+                amd = query_amd_gpus()
+            memory_info = get_amd_memory_info(gpu.get("Bus ID"), amd)
             if memory_info:
                 gpu.update(memory_info)
     
     return gpus
 
-def get_nvidia_memory_info():
-    """Get NVIDIA GPU memory information using nvidia-smi"""
+def get_nvidia_memory_info(bus_id=None, nvidia=None):
+    """Get memory, utilization and power of the NVIDIA GPU at bus_id (the first GPU if None)"""
+    if nvidia is None:
+        nvidia = query_nvidia_gpus()
+    gpu = nvidia.get(bus_id) if bus_id else next(iter(nvidia.values()), None)
+    if not gpu:
+        return {}
+
+    info = {}
+    for field, label, unit in (("memory.total", "Memory Total", "MB"), ("memory.used", "Memory Used", "MB"),
+                               ("memory.free", "Memory Free", "MB"), ("utilization.gpu", "Utilization", "%"),
+                               ("power.draw", "Power Draw", "W")):
+        if gpu.get(field) is not None:
+            info[label] = f"{gpu[field]} {unit}" if unit != "%" else f"{gpu[field]}%"
+    return info
+
+def parse_dpm_table(text):
+    """Parse a pp_dpm_sclk/pp_dpm_mclk table ('0: 500Mhz', '1: 1800Mhz *') into ([MHz per level], active MHz)"""
+    levels = []
+    active = None
+    for line in text.splitlines():
+        match = re.match(r"\s*\d+:\s*(\d+)\s*Mhz(\s*\*)?", line, re.IGNORECASE)
+        if match:
+            levels.append(int(match.group(1)))
+            if match.group(2):
+                active = int(match.group(1))
+    return levels, active
+
+def list_amd_cards():
+    """[(card, PCI slot)] for every amdgpu card in /sys/class/drm"""
+    cards = []
     try:
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=memory.total,memory.used,memory.free", "--format=csv,noheader,nounits"],
-            capture_output=True, text=True, check=True
-        )
-        
-        lines = result.stdout.strip().splitlines()
-        if lines:
-            # Take first GPU info
-            memory_data = lines[0].split(", ")
-            if len(memory_data) >= 3:
-                return {
-                    "Memory Total": f"{memory_data[0]} MB",
-                    "Memory Used": f"{memory_data[1]} MB",
-                    "Memory Free": f"{memory_data[2]} MB"
-                }
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    
-    return {}
+        names = sources.listdir(DRM_DIR)
+    except OSError:
+        return cards
+    for card in sorted(names, key=lambda name: int(name[4:]) if name[4:].isdigit() else 0):
+        # Connectors (card0-DP-1) and render nodes share the directory
+        if not card.startswith("card") or not card[4:].isdigit():
+            continue
+        device = f"{DRM_DIR}/{card}/device"
+        if sources.read_attribute(f"{device}/vendor") != AMD_VENDOR_ID:
+            continue
+        slot = None
+        for line in (sources.read_attribute(f"{device}/uevent") or "").splitlines():
+            if line.startswith("PCI_SLOT_NAME="):
+                slot = pci_slot(line[14:])
+        if slot is None:
+            try:
+                slot = pci_slot(os.path.basename(sources.readlink(device)))
+            except (OSError, ValueError):
+                slot = card
+        cards.append((card, slot))
+    return cards
+
+class AmdGpuSampler:
+    """Read amdgpu metrics for every card through file descriptors kept open, one pread per attribute"""
 
-def get_amd_memory_info():
-    """Get AMD GPU memory information"""
+    def __init__(self, cards=None):
+        self.cards = list_amd_cards() if cards is None else cards
+        self._files = {}
+        for card, slot in self.cards:
+            device = f"{DRM_DIR}/{card}/device"
+            fds = {}
+            for name, attribute in AMD_ATTRIBUTES:
+                path = f"{device}/{attribute}"
+                if "*" in path:
+                    # The hwmon instance number is only known at runtime
+                    hwmon = [entry for entry in self._listdir(f"{device}/hwmon") if entry.startswith("hwmon")]
+                    if not hwmon:
+                        continue
+                    path = path.replace("*", sorted(hwmon)[0])
+                    if name == "power" and not sources.exists(path):
+                        # Newer kernels only expose the instantaneous reading on some boards
+                        path = path.replace("power1_average", "power1_input")
+                try:
+                    fds[name] = os.open(sources.host_path(path), os.O_RDONLY)
+                except OSError:
+                    continue
+            self._files[slot] = (card, fds)
+
+    @staticmethod
+    def _listdir(path):
+        try:
+            return sources.listdir(path)
+        except OSError:
+            return []
+
+    def read(self):
+        """Return (monotonic time, {slot: {"Card", "vram_total", ... in bytes, %, MHz, W and °C}})"""
+        cards = {}
+        for slot, (card, fds) in self._files.items():
+            values = {"Card": card}
+            for name, fd in fds.items():
+                try:
+                    raw = os.pread(fd, 4096, 0).decode("utf-8", errors="replace")
+                except OSError:
+                    # The GPU is in a low-power state or the attribute is not readable right now
+                    continue
+                if name in ("sclk", "mclk"):
+                    values[name] = parse_dpm_table(raw)
+                elif raw.strip().isdigit():
+                    value = int(raw)
+                    values[name] = value / 1e6 if name == "power" else value / 1000 if name == "temperature" else value
+            cards[slot] = values
+        return time.monotonic(), cards
+
+    def close(self):
+        for _, fds in self._files.values():
+            for fd in fds.values():
+                os.close(fd)
+        self._files = {}
+
+def query_amd_gpus():
+    """Current amdgpu metrics of every card, keyed by PCI slot"""
+    sampler = AmdGpuSampler()
     try:
-        # Try rocm-smi for AMD cards
-        result = subprocess.run(
-            ["rocm-smi", "--showmeminfo", "vram"],
-            capture_output=True, text=True, check=True
-        )
-        
-        # Parse rocm-smi output (basic implementation)
-        if "VRAM" in result.stdout:
-            return {"Memory Info": "Available via rocm-smi"}
-            
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    
-    return {}
+        return sampler.read()[1]
+    finally:
+        sampler.close()
+
+def _format_clock(table):
+    levels, active = table
+    if active is None:
+        return None
+    return f"{active} MHz (max {max(levels)} MHz)" if levels else f"{active} MHz"
+
+def get_amd_memory_info(bus_id=None, amd=None):
+    """Get memory, utilization, clocks and power of the AMD GPU at bus_id (the first card if None) from sysfs"""
+    if amd is None:
+        amd = query_amd_gpus()
+    gpu = amd.get(bus_id) if bus_id else next(iter(amd.values()), None)
+    if not gpu:
+        return {}
+
+    info = {}
+    if "vram_total" in gpu:
+        info["Memory Total"] = f"{gpu['vram_total'] // 1048576} MB"
+        if "vram_used" in gpu:
+            info["Memory Used"] = f"{gpu['vram_used'] // 1048576} MB"
+            info["Memory Free"] = f"{(gpu['vram_total'] - gpu['vram_used']) // 1048576} MB"
+    if "busy" in gpu:
+        info["Utilization"] = f"{gpu['busy']}%"
+    for key, label in (("sclk", "GPU Clock"), ("mclk", "Memory Clock")):
+        if key in gpu and _format_clock(gpu[key]):
+            info[label] = _format_clock(gpu[key])
+    if "power" in gpu:
+        info["Power Draw"] = f"{gpu['power']:.1f} W"
+    return info
 
 def get_gpu_fallback_info():
     """Fallback method to get GPU info without lspci"""
@@ -151,9 +330,9 @@ def get_gpu_fallback_info():
         
         # Try to get info from /proc/driver/nvidia/version
         nvidia_file = "/proc/driver/nvidia/version"
-        if os.path.exists(nvidia_file):
+        if sources.exists(nvidia_file):
             try:
-                with open(nvidia_file, "r") as f:
+                with sources.open_file(nvidia_file, "r") as f:
                     content = f.read()
                     gpus.append({
                         "Type": "NVIDIA GPU detected",
@@ -164,14 +343,14 @@ def get_gpu_fallback_info():
         
         # Try to get info from /sys/class/drm/
         drm_path = "/sys/class/drm"
-        if os.path.exists(drm_path):
+        if sources.exists(drm_path):
             try:
-                drm_devices = os.listdir(drm_path)
+                drm_devices = sources.listdir(drm_path)
                 card_devices = [d for d in drm_devices if d.startswith("card") and not "-" in d]
                 
                 for card in card_devices:
                     card_path = os.path.join(drm_path, card, "device")
-                    if os.path.exists(card_path):
+                    if sources.exists(card_path):
                         try:
                             vendor_path = os.path.join(card_path, "vendor")
                             device_path = os.path.join(card_path, "device")
@@ -179,12 +358,12 @@ def get_gpu_fallback_info():
                             vendor_id = ""
                             device_id = ""
                             
-                            if os.path.exists(vendor_path):
-                                with open(vendor_path, "r") as f:
+                            if sources.exists(vendor_path):
+                                with sources.open_file(vendor_path, "r") as f:
                                     vendor_id = f.read().strip()
                             
-                            if os.path.exists(device_path):
-                                with open(device_path, "r") as f:
+                            if sources.exists(device_path):
+                                with sources.open_file(device_path, "r") as f:
                                     device_id = f.read().strip()
                             
                             if vendor_id or device_id:
@@ -203,100 +382,73 @@ def get_gpu_fallback_info():
     except Exception as e:
         return [{"Error": f"Could not get GPU fallback info: {str(e)}"}]
 
-def get_gpu_driver_info():
-    """Get GPU driver information"""
-    drivers = {}
-    
-    # Check for NVIDIA driver
-    try:
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=driver_version", "--format=csv,noheader"],
-            capture_output=True, text=True, check=True
-        )
-        if result.stdout.strip():
-            drivers["NVIDIA Driver"] = result.stdout.strip()
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    
-    # Check for AMD driver (amdgpu)
-    try:
-        modinfo_result = subprocess.run(
-            ["modinfo", "amdgpu"],
-            capture_output=True, text=True, check=True
-        )
-        if modinfo_result.stdout:
-            for line in modinfo_result.stdout.splitlines():
-                if line.startswith("version:"):
-                    drivers["AMD Driver (amdgpu)"] = line.split(":", 1)[1].strip()
-                    break
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    
-    # Check for Intel driver (i915)
+def display_devices():
+    """PCI slots of every display-class device (VGA, 3D and other display controllers); None without sysfs"""
     try:
-        modinfo_result = subprocess.run(
-            ["modinfo", "i915"],
-            capture_output=True, text=True, check=True
-        )
-        if modinfo_result.stdout:
-            drivers["Intel Driver (i915)"] = "Available"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    
-    return drivers if drivers else {"Status": "No specific GPU drivers detected"}
+        slots = sources.listdir(PCI_DEVICES_DIR)
+    except OSError:
+        return None
+    return sorted(slot for slot in slots
+                  if (sources.read_attribute(f"{PCI_DEVICES_DIR}/{slot}/class") or "").startswith("0x03"))
+
+def get_gpu_driver_info(nvidia=None):
+    """Get the drivers bound to display devices, with module version and state from /sys/module"""
+    index = modules.ModuleIndex()
+    drivers = {}
+    for slot in display_devices() or []:
+        bound = modules.bound_driver(f"{PCI_DEVICES_DIR}/{slot}")
+        if bound is None:
+            continue
+        driver, module = bound
+        if driver not in drivers:
+            info = index.describe(module)
+            row = {"Driver": driver}
+            row.update((key, info[key]) for key in ("Module", "State", "Version", "Source Version", "Refcount")
+                       if key in info)
+            if "Version" not in row and nvidia:
+                # The proprietary module exposes its version in sysfs, but older releases did not
+                versions = sorted({gpu["driver_version"] for gpu in nvidia.values() if gpu.get("driver_version")})
+                if versions and driver.startswith("nvidia"):
+                    row["Version"] = ", ".join(versions)
+            row["Devices"] = []
+            drivers[driver] = row
+        drivers[driver]["Devices"].append(slot)
+
+    for row in drivers.values():
+        row["Devices"] = ", ".join(row["Devices"])
+    return list(drivers.values()) if drivers else {"Status": "No GPU drivers bound to display devices"}
 
-def get_gpu_temperature():
+def get_gpu_temperature(nvidia=None):
     """Get GPU temperature information"""
     temperatures = {}
     
-    # Try NVIDIA temperature
-    try:
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=temperature.gpu", "--format=csv,noheader,nounits"],
-            capture_output=True, text=True, check=True
-        )
-        
-        lines = result.stdout.strip().splitlines()
-        for i, temp in enumerate(lines):
-            if temp.strip():
-                temperatures[f"NVIDIA GPU {i+1}"] = f"{temp.strip()}°C"
-                
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    
-    # Try AMD temperature via sensors
-    try:
-        result = subprocess.run(["sensors"], capture_output=True, text=True, check=True)
-        for line in result.stdout.splitlines():
-            if "amdgpu" in line.lower() or "radeon" in line.lower():
-                if "°C" in line and ":" in line:
-                    sensor_name = line.split(":")[0].strip()
-                    temp_part = line.split(":")[1].strip()
-                    if temp_part:
-                        temperatures[f"AMD {sensor_name}"] = temp_part.split()[0]
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
+    # NVIDIA temperatures, in nvidia-smi index order
+    if nvidia is None:
+        nvidia = query_nvidia_gpus()
+    for i, gpu in enumerate(nvidia.values()):
+        if gpu.get("temperature.gpu") is not None:
+            temperatures[f"NVIDIA GPU {i+1}"] = f"{gpu['temperature.gpu']}°C"
     
     # Try generic GPU temperature from hwmon
     try:
         hwmon_path = "/sys/class/hwmon"
-        if os.path.exists(hwmon_path):
-            for hwmon_dir in os.listdir(hwmon_path):
+        if sources.exists(hwmon_path):
+            for hwmon_dir in sources.listdir(hwmon_path):
                 hwmon_full_path = os.path.join(hwmon_path, hwmon_dir)
                 name_file = os.path.join(hwmon_full_path, "name")
                 
-                if os.path.exists(name_file):
+                if sources.exists(name_file):
                     try:
-                        with open(name_file, "r") as f:
+                        with sources.open_file(name_file, "r") as f:
                             name = f.read().strip()
                         
                         if any(gpu_name in name.lower() for gpu_name in ["amdgpu", "radeon", "nouveau"]):
                             # Look for temperature files
-                            for file in os.listdir(hwmon_full_path):
+                            for file in sources.listdir(hwmon_full_path):
                                 if file.startswith("temp") and file.endswith("_input"):
                                     temp_file = os.path.join(hwmon_full_path, file)
                                     try:
-                                        with open(temp_file, "r") as f:
+                                        with sources.open_file(temp_file, "r") as f:
                                             temp_raw = int(f.read().strip())
                                             temp_celsius = temp_raw / 1000.0
                                             temperatures[f"{name} {file}"] = f"{temp_celsius:.1f}°C"
@@ -307,4 +459,75 @@ def get_gpu_temperature():
     except:
         pass
     
-    return temperatures if temperatures else {"Status": "GPU temperature sensors not available"}
\ No newline at end of file
+    return temperatures if temperatures else {"Status": "GPU temperature sensors not available"}
+
+class NvidiaMonitor:
+    """One long-running 'nvidia-smi -lms' loop whose rows are parsed as they arrive.
+
+    latest() returns the newest row per GPU without forking a process per sample; under
+    a replay directory, where no process can run, each call answers from a one-shot query.
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.process = None
+        self._rows = {}
+        self._updated = None
+        self._lock = threading.Lock()
+        self._reader = None
+
+    def start(self):
+        """Start the loop; raises FileNotFoundError without nvidia-smi"""
+        if sources.REPLAY_DIR is not None or self.process is not None:
+            return self
+        self.process = subprocess.Popen(
+            NVIDIA_QUERY_COMMAND + [f"-lms={max(int(self.interval * 1000), 1)}"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL,
+            text=True, bufsize=1, start_new_session=True,
+        )
+        self._reader = threading.Thread(target=self._read, name="nvidia-smi-monitor", daemon=True)
+        self._reader.start()
+        return self
+
+    def _read(self):
+        for line in self.process.stdout:
+            for gpu in parse_nvidia_query(line):
+                if gpu["pci.bus_id"]:
+                    with self._lock:
+                        self._rows[pci_slot(gpu["pci.bus_id"])] = gpu
+                        self._updated = time.monotonic()
+
+    def wait(self, timeout=5.0):
+        """Block until the first rows arrive or the loop exits; True if there are rows"""
+        end = time.monotonic() + timeout
+        while self._updated is None and time.monotonic() < end:
+            if self.process is None or self.process.poll() is not None:
+                break
+            time.sleep(0.01)
+        return self._updated is not None
+
+    def latest(self):
+        """{pci slot: newest row} for every GPU seen so far"""
+        if self.process is None:
+            return query_nvidia_gpus()
+        with self._lock:
+            return dict(self._rows)
+
+    def age(self):
+        """Seconds since the newest row arrived, None before the first one"""
+        return None if self._updated is None else time.monotonic() - self._updated
+
+    def close(self):
+        if self.process is not None:
+            if self.process.poll() is None:
+                sources.kill_process_group(self.process)
+            self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -0,0 +1,157 @@
+import os
+import errno
+import struct
+import select
+import socket
+from system_info import inventory
+
+# linux/netlink.h; group 1 carries the kernel's own events, before udev rules run, and group 2
+# udevd's re-broadcast once it has processed them and written /run/udev/data
+NETLINK_KOBJECT_UEVENT = 15
+KERNEL_UEVENT_GROUP = 1
+UDEV_UEVENT_GROUP = 2
+# Present while udevd runs; without it nothing is sent on the udev group
+UDEV_CONTROL = "/run/udev/control"
+# libudev's struct udev_monitor_netlink_header: "libudev\0" prefix, magic (big endian),
+# header size, properties offset and length, then filter hashes
+LIBUDEV_PREFIX = b"libudev\0"
+LIBUDEV_MAGIC = 0xfeedcafe
+LIBUDEV_HEADER = struct.Struct("=8sIIII")
+# Large enough that a dock or a disk shelf coming up at once does not overflow the socket
+RECEIVE_BUFFER = 1 << 20
+HOTPLUG_ACTIONS = {"add", "remove", "change"}
+# Sections whose contents depend on devices of each subsystem; a new PCI function can be any controller
+SUBSYSTEM_SECTIONS = {
+    "usb": ("USB",),
+    "block": ("Disk",),
+    "net": ("Network",),
+    "pci": ("GPU", "Network", "Disk", "USB"),
+    "drm": ("GPU",),
+}
+HOTPLUG_SECTIONS = {section for sections in SUBSYSTEM_SECTIONS.values() for section in sections}
+
+def parse_uevent(data):
+    """Parse a kernel 'ACTION@DEVPATH\\0KEY=VALUE\\0...' or a libudev message into a dict; None if malformed"""
+    if data.startswith(LIBUDEV_PREFIX):
+        if len(data) < LIBUDEV_HEADER.size:
+            return None
+        _, magic, _, offset, length = LIBUDEV_HEADER.unpack_from(data)
+        if socket.ntohl(magic) != LIBUDEV_MAGIC or offset + length > len(data):
+            return None
+        # Same KEY=VALUE list as the kernel's, without the ACTION@DEVPATH line
+        data = b"\0" + data[offset:offset + length]
+    header, *fields = data.split(b"\0")
+    event = {}
+    for field in fields:
+        key, separator, value = field.partition(b"=")
+        if separator:
+            event[key.decode("utf-8", errors="replace")] = value.decode("utf-8", errors="replace")
+    if "ACTION" not in event:
+        action, _, devpath = header.decode("utf-8", errors="replace").partition("@")
+        event.update(ACTION=action, DEVPATH=devpath)
+    return event
+
+def affected_sections(events):
+    """Section names touched by add, remove and change events"""
+    sections = set()
+    for event in events:
+        if event.get("ACTION") in HOTPLUG_ACTIONS:
+            sections.update(SUBSYSTEM_SECTIONS.get(event.get("SUBSYSTEM"), ()))
+    return sections
+
+class UeventListener:
+    """Non-blocking NETLINK_KOBJECT_UEVENT socket; select() on it so an idle system costs nothing"""
+
+    def __init__(self, group=None):
+        if group is None:
+            # udev's group, so sections are re-collected after udev has filled /run/udev/data;
+            # the kernel's own when udevd does not run (containers, minimal systems)
+            group = UDEV_UEVENT_GROUP if os.path.exists(UDEV_CONTROL) else KERNEL_UEVENT_GROUP
+        self.group = group
+        self.socket = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM | socket.SOCK_NONBLOCK | socket.SOCK_CLOEXEC,
+                                    NETLINK_KOBJECT_UEVENT)
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER)
+        except OSError:
+            pass
+        try:
+            # Port 0 lets the kernel pick a unique one
+            self.socket.bind((0, group))
+        except OSError:
+            self.socket.close()
+            raise
+        # Set when events were dropped; the caller can no longer tell what changed
+        self.overflowed = False
+
+    def fileno(self):
+        return self.socket.fileno()
+
+    def read_events(self):
+        """Every queued event, without blocking"""
+        events = []
+        while True:
+            try:
+                data = self.socket.recv(65536)
+            except BlockingIOError:
+                return events
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                self.overflowed = True
+                continue
+            event = parse_uevent(data)
+            if event is not None:
+                events.append(event)
+
+    def wait(self, timeout=None):
+        """Block up to timeout seconds (forever if None) for events, then drain them"""
+        readable, _, _ = select.select([self], [], [], timeout)
+        return self.read_events() if readable else []
+
+    def close(self):
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+class SectionCache:
+    """Collected sections kept until a uevent touches them; only those are collected again"""
+
+    def __init__(self, sections, listener=None):
+        self.collectors = dict(sections)
+        self.listener = listener
+        self.data = {}
+
+    def get(self, name):
+        if name not in self.data:
+            self.data[name] = inventory.collect_section(name, self.collectors[name])
+        return self.data[name]
+
+    def snapshot(self):
+        return {name: self.get(name) for name in self.collectors}
+
+    def invalidate(self, names):
+        for name in names:
+            self.data.pop(name, None)
+
+    def poll(self, timeout=0):
+        """Wait up to timeout for uevents and re-collect the sections they affect.
+
+        Returns (re-collected section names, events); after an overflow every hotplug section is redone.
+        """
+        if self.listener is None:
+            return [], []
+        events = self.listener.wait(timeout)
+        names = affected_sections(events)
+        if self.listener.overflowed:
+            self.listener.overflowed = False
+            names |= HOTPLUG_SECTIONS
+        names = [name for name in self.collectors if name in names]
+        self.invalidate(names)
+        for name in names:
+            self.get(name)
+        return names, events
@@ -0,0 +1,119 @@
+import re
+import time
+import socket
+import threading
+from datetime import datetime
+
+from system_info import cpu, memory, disk, motherboard, gpu, network, os_info, usb, pressure, processes, sources
+
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0}
+
+# Time allowed past a section's budget for killing and reaping its commands
+DEADLINE_GRACE = 0.1
+
+def parse_duration(text):
+    """Parse '500ms', '2s', '1.5m' or a bare number of seconds"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d*)?|\.\d+)\s*(ms|s|m)?\s*", str(text).lower())
+    if not match:
+        raise ValueError(f"Invalid duration: {text}")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2) or "s"]
+
+def get_sections(disk_partitions=True, network_details=True, usb_details=True, memory_details=False, disk_io=False,
+                 pressure_stats=False, pressure_window=None, top_processes=None, process_sort="cpu",
+                 network_rates=False, rate_interfaces=None, rate_resolution=None, sockets=False,
+                 interface_selector=None, interface_sort="index", interface_offset=0,
+                 interface_limit=network.INTERFACE_PAGE_SIZE):
+    """Return (section name, collector) pairs for every inventory section"""
+    sections = [
+        ("Operating System", os_info.get_os_info),
+        ("CPU", cpu.get_cpu_info),
+        ("Memory", lambda: memory.get_memory_info(include_details=memory_details)),
+        ("Disk", lambda: disk.get_disk_info(include_partitions=disk_partitions, include_io=disk_io)),
+        ("GPU", gpu.get_gpu_info),
+        ("Network", lambda: network.get_network_info(include_details=network_details, include_rates=network_rates,
+                                                     rate_interfaces=rate_interfaces, rate_resolution=rate_resolution,
+                                                     include_sockets=sockets, interface_selector=interface_selector,
+                                                     interface_sort=interface_sort, interface_offset=interface_offset,
+                                                     interface_limit=interface_limit)),
+        ("USB", lambda: usb.get_usb_info(include_details=usb_details)),
+        ("Motherboard", motherboard.get_motherboard_info),
+    ]
+    if pressure_stats:
+        # A one-shot run samples over the whole window
+        sections.insert(3, ("Pressure", lambda: pressure.get_pressure_info(
+            interval=pressure_window or 1.0, window=pressure_window)))
+    if top_processes:
+        sections.append(("Processes", lambda: {
+            "Top Processes": processes.get_top_processes(sort_by=process_sort, count=top_processes)}))
+    return sections
+
+def collect_section(name, collector):
+    """Run one collector, turning an exception into an error entry"""
+    try:
+        return collector()
+    except Exception as e:
+        return {"Error": f"Could not collect {name} information: {str(e)}"}
+
+def collect_section_within(name, collector, budget, wait=None):
+    """Run one collector in a worker thread whose commands must finish within budget seconds.
+
+    The result is awaited for wait seconds (budget plus DEADLINE_GRACE by default).
+    """
+    result = {}
+
+    def target():
+        sources.set_deadline(time.monotonic() + budget)
+        result["Data"] = collect_section(name, collector)
+        result["Timed Out"] = sources.timed_out_commands()
+        sources.set_deadline(None)
+
+    # A daemon thread, so a collector stuck outside of a command cannot keep the process alive
+    thread = threading.Thread(target=target, name=f"collect-{name}", daemon=True)
+    thread.start()
+    thread.join(budget + DEADLINE_GRACE if wait is None else wait)
+
+    if thread.is_alive() or "Data" not in result:
+        return mark_deadline(None, budget)
+    return mark_deadline(result["Data"], budget, result["Timed Out"])
+
+def mark_deadline(data, budget, timed_out=None):
+    """Flag a section that ran out of time; data is None when the collector never returned"""
+    if data is None:
+        return {"Deadline": {"Status": "Timed out, no results", "Budget": f"{budget * 1000:.0f} ms"}}
+    if timed_out and isinstance(data, dict):
+        data["Deadline"] = {
+            "Status": "Timed out, partial results",
+            "Budget": f"{budget * 1000:.0f} ms",
+            "Commands": timed_out,
+        }
+    return data
+
+def collect_sections(sections, deadline=None):
+    """Yield (name, data) per section; with a deadline in seconds, each section gets a fair share of the time left"""
+    if deadline is None:
+        for name, collector in sections:
+            yield name, collect_section(name, collector)
+        return
+
+    end = time.monotonic() + deadline
+    # The grace for killing and reaping commands is taken once from the whole budget,
+    # not added after every section that runs out of time
+    work_end = end - min(DEADLINE_GRACE, deadline / 2)
+    for index, (name, collector) in enumerate(sections):
+        now = time.monotonic()
+        if now >= work_end:
+            yield name, {"Deadline": {"Status": "Skipped, deadline passed", "Budget": "0 ms"}}
+            continue
+        # Time a fast section does not use rolls over to the ones after it
+        budget = (work_end - now) / (len(sections) - index)
+        yield name, collect_section_within(name, collector, budget, min(budget + DEADLINE_GRACE, end - now))
+
+def collect_inventory(deadline=None, **options):
+    """Collect every section into a single JSON-serializable snapshot"""
+    snapshot = {
+        "Hostname": socket.gethostname(),
+        "Collected At": datetime.now().isoformat(timespec="seconds"),
+    }
+    for name, data in collect_sections(get_sections(**options), deadline):
+        snapshot[name] = data
+    return snapshot
@@ -1,8 +1,27 @@
+import re
 import subprocess
 import psutil
+from system_info import sources
 
-def get_memory_info():
-    """Get both usage statistics and hardware information about RAM"""
+HUGEPAGES_DIR = "/sys/kernel/mm/hugepages"
+THP_DIR = "/sys/kernel/mm/transparent_hugepage"
+
+# hugepages-<size>kB attributes and their labels
+HUGEPAGE_ATTRIBUTES = [
+    ("Total", "nr_hugepages"),
+    ("Free", "free_hugepages"),
+    ("Reserved", "resv_hugepages"),
+    ("Surplus", "surplus_hugepages"),
+    ("Overcommit", "nr_overcommit_hugepages"),
+]
+KHUGEPAGED_ATTRIBUTES = [
+    "pages_to_scan", "scan_sleep_millisecs", "alloc_sleep_millisecs", "max_ptes_none",
+    "full_scans", "pages_collapsed", "defrag",
+]
+
+def get_memory_info(include_details=False):
+    """Get both usage statistics and hardware information about RAM, optionally the full
+    /proc/meminfo breakdown and huge page statistics"""
     # Get usage statistics
     mem = psutil.virtual_memory()
     usage_info = {
@@ -15,15 +34,20 @@ def get_memory_info():
     # Get hardware information
     hardware_info = get_memory_hardware_info()
     
-    return {
+    memory_info = {
         "Usage": usage_info,
-        "Hardware": hardware_info
+        "Hardware": hardware_info,
     }
+    if include_details:
+        memory_info["Breakdown"] = get_meminfo_breakdown()
+        memory_info["Huge Pages"] = get_hugepages_info()
+        memory_info["Transparent Huge Pages"] = get_thp_info()
+    return memory_info
 
 def get_memory_hardware_info():
     """Get detailed hardware information about RAM modules"""
     try:
-        output = subprocess.run(
+        output = sources.run(
             ["sudo", "dmidecode", "--type", "memory"], 
             capture_output=True, 
             text=True
@@ -83,7 +107,7 @@ def parse_dmidecode_output(output):
 def get_basic_memory_info():
     """Fallback method using /proc/meminfo"""
     try:
-        with open("/proc/meminfo", "r") as f:
+        with sources.open_file("/proc/meminfo", "r") as f:
             meminfo = f.read()
         
         info = {}
@@ -115,7 +139,7 @@ def get_memory_info_no_sudo():
         
         # Try to get memory block size
         try:
-            with open("/sys/devices/system/memory/block_size_bytes", "r") as f:
+            with sources.open_file("/sys/devices/system/memory/block_size_bytes", "r") as f:
                 block_size = int(f.read().strip(), 16)
                 memory_info["Block Size"] = f"{block_size / (1024 ** 2)} MB"
         except:
@@ -124,4 +148,82 @@ def get_memory_info_no_sudo():
         return memory_info
     
     except Exception as e:
-        return {"Error": f"Could not read memory information: {str(e)}"}
\ No newline at end of file
+        return {"Error": f"Could not read memory information: {str(e)}"}
+
+def read_meminfo():
+    """Parse all of /proc/meminfo in one pass; sizes in bytes, HugePages_* counts as page counts"""
+    meminfo = {}
+    for line in sources.read_file("/proc/meminfo").splitlines():
+        key, _, value = line.partition(":")
+        fields = value.split()
+        if not fields:
+            continue
+        number = int(fields[0])
+        meminfo[key.strip()] = number * 1024 if len(fields) > 1 and fields[1] == "kB" else number
+    return meminfo
+
+def get_meminfo_breakdown():
+    """Every /proc/meminfo field as an integer"""
+    try:
+        return read_meminfo()
+    except (OSError, ValueError) as e:
+        return {"Error": f"Could not read /proc/meminfo: {str(e)}"}
+
+def _format_page_size(size_kb):
+    for unit in ("kB", "MB"):
+        if size_kb < 1024:
+            return f"{size_kb} {unit}"
+        size_kb //= 1024
+    return f"{size_kb} GB"
+
+def get_hugepages_info():
+    """Hugepage pool state for each supported page size"""
+    pools = []
+    try:
+        sizes = sorted(sources.listdir(HUGEPAGES_DIR), key=lambda name: int(re.sub(r"\D", "", name) or 0))
+    except OSError:
+        return []
+    for name in sizes:
+        size_kb = int(re.sub(r"\D", "", name) or 0)
+        pool = {"Page Size": _format_page_size(size_kb)}
+        for label, attribute in HUGEPAGE_ATTRIBUTES:
+            value = sources.read_attribute(f"{HUGEPAGES_DIR}/{name}/{attribute}")
+            pool[label] = int(value) if value and value.isdigit() else None
+        pools.append(pool)
+    return pools
+
+def _active_choice(value):
+    """'always [madvise] never' -> 'madvise'"""
+    if value is None:
+        return None
+    match = re.search(r"\[([^\]]+)\]", value)
+    return match.group(1) if match else value
+
+def get_thp_info():
+    """Transparent hugepage mode, defrag policy, khugepaged settings and THP event counters"""
+    if not sources.isdir(THP_DIR):
+        return {"Status": "Transparent huge pages not supported by this kernel"}
+    info = {
+        "Enabled": _active_choice(sources.read_attribute(f"{THP_DIR}/enabled")),
+        "Defrag": _active_choice(sources.read_attribute(f"{THP_DIR}/defrag")),
+        "Shmem Enabled": _active_choice(sources.read_attribute(f"{THP_DIR}/shmem_enabled")),
+    }
+
+    khugepaged = {}
+    for attribute in KHUGEPAGED_ATTRIBUTES:
+        value = sources.read_attribute(f"{THP_DIR}/khugepaged/{attribute}")
+        if value is not None:
+            khugepaged[attribute] = int(value) if value.isdigit() else value
+    info["khugepaged"] = khugepaged
+
+    try:
+        with sources.open_file("/proc/vmstat", "r") as f:
+            events = {}
+            for line in f:
+                if line.startswith("thp_"):
+                    key, _, value = line.partition(" ")
+                    events[key] = int(value)
+        info["Events"] = events
+    except (OSError, ValueError):
+        pass
+    return info
@@ -0,0 +1,111 @@
+import os
+from system_info import sources
+
+MODULE_DIR = "/sys/module"
+# Module taint letters (as in /proc/modules and /sys/module/<name>/taint) reported by name
+TAINT_FLAGS = {"P": "Proprietary", "O": "Out-of-Tree", "E": "Unsigned", "C": "Staging", "F": "Forced"}
+
+def parse_proc_modules(text):
+    """Parse /proc/modules: 'name size refcount deps state address [(taint)]' per line"""
+    modules = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) < 5:
+            continue
+        modules[fields[0]] = {
+            "Size": int(fields[1]),
+            "Refcount": int(fields[2]),
+            "Used By": [name for name in fields[3].split(",") if name and name != "-"],
+            "State": fields[4],
+            "Taint": fields[6].strip("()") if len(fields) > 6 else "",
+        }
+    return modules
+
+class ModuleIndex:
+    """Every module from one read of /proc/modules and one listing of /sys/module.
+
+    Built-in modules only appear in /sys/module; the version, srcversion and parameter
+    files of a module are read the first time it is described.
+    """
+
+    def __init__(self):
+        try:
+            self.loaded = parse_proc_modules(sources.read_file("/proc/modules"))
+        except OSError:
+            # A kernel built without module support
+            self.loaded = {}
+        try:
+            sysfs = set(sources.listdir(MODULE_DIR))
+        except OSError:
+            sysfs = set()
+        self.builtin = sorted(sysfs - set(self.loaded))
+        self._details = {}
+
+    def names(self):
+        return sorted(set(self.loaded) | set(self.builtin))
+
+    def describe(self, name, include_parameters=False):
+        """Module, State, Version, Source Version, Refcount, Size, Used By, Taint and optionally Parameters"""
+        # Driver names may use dashes; module names never do
+        name = name.replace("-", "_")
+        key = (name, include_parameters)
+        if key in self._details:
+            return self._details[key]
+
+        base = f"{MODULE_DIR}/{name}"
+        loaded = self.loaded.get(name)
+        info = {"Module": name, "State": loaded["State"] if loaded else "Built-in"}
+        for attribute, label in (("version", "Version"), ("srcversion", "Source Version")):
+            value = sources.read_attribute(f"{base}/{attribute}")
+            if value:
+                info[label] = value
+        if loaded:
+            info["Refcount"] = loaded["Refcount"]
+            info["Size"] = loaded["Size"]
+            if loaded["Used By"]:
+                info["Used By"] = ", ".join(loaded["Used By"])
+            taint = loaded["Taint"]
+        else:
+            taint = sources.read_attribute(f"{base}/taint") or ""
+        if taint:
+            info["Taint"] = ", ".join(TAINT_FLAGS.get(flag, flag) for flag in taint)
+
+        if include_parameters:
+            parameters = {}
+            try:
+                for parameter in sorted(sources.listdir(f"{base}/parameters")):
+                    # Write-only parameters cannot be read back
+                    value = sources.read_attribute(f"{base}/parameters/{parameter}")
+                    if value is not None:
+                        parameters[parameter] = value
+            except OSError:
+                pass
+            if parameters:
+                info["Parameters"] = parameters
+        self._details[key] = info
+        return info
+
+    def tainted(self, flag):
+        """Names of loaded modules carrying a taint flag, e.g. 'O' for out-of-tree"""
+        return sorted(name for name, module in self.loaded.items() if flag in module["Taint"])
+
+def bound_driver(device_path):
+    """(driver, module) bound to a sysfs device directory, None when no driver is bound"""
+    try:
+        driver = os.path.basename(sources.readlink(f"{device_path}/driver"))
+    except OSError:
+        return None
+    try:
+        module = os.path.basename(sources.readlink(f"{device_path}/driver/module"))
+    except OSError:
+        # Built-in drivers without a module link
+        module = driver
+    return driver, module
+
+def get_module_info(names=None, include_parameters=False):
+    """Rows for the given modules (all of them if None) from a single ModuleIndex"""
+    try:
+        index = ModuleIndex()
+        return [index.describe(name, include_parameters) for name in (names or index.names())]
+    except Exception as e:
+        return [{"Error": f"Could not read kernel modules: {str(e)}"}]
@@ -1,6 +1,7 @@
 import subprocess
 import re
 import os
+from system_info import sources
 
 def get_motherboard_info():
     """Get comprehensive motherboard information including hardware details and BIOS info"""
@@ -17,7 +18,7 @@ def get_motherboard_info():
 def get_motherboard_hardware_info():
     """Get motherboard hardware information using dmidecode"""
     try:
-        result = subprocess.run(
+        result = sources.run(
             ["sudo", "dmidecode", "-t", "baseboard"],
             capture_output=True, text=True, check=True,
             env={**os.environ, "LC_ALL": "C"}
@@ -71,8 +72,8 @@ def get_motherboard_fallback_info():
         
         for key, path in dmi_paths.items():
             try:
-                if os.path.exists(path):
-                    with open(path, "r") as f:
+                if sources.exists(path):
+                    with sources.open_file(path, "r") as f:
                         value = f.read().strip()
                         if value and value != "Not Specified":
                             info[key] = value
@@ -90,7 +91,7 @@ def get_motherboard_fallback_info():
 def get_bios_info():
     """Get BIOS information using dmidecode"""
     try:
-        result = subprocess.run(
+        result = sources.run(
             ["sudo", "dmidecode", "-t", "bios"],
             capture_output=True, text=True, check=True,
             env={**os.environ, "LC_ALL": "C"}
@@ -141,8 +142,8 @@ def get_bios_fallback_info():
         
         for key, path in dmi_paths.items():
             try:
-                if os.path.exists(path):
-                    with open(path, "r") as f:
+                if sources.exists(path):
+                    with sources.open_file(path, "r") as f:
                         value = f.read().strip()
                         if value and value != "Not Specified":
                             info[key] = value
@@ -160,7 +161,7 @@ def get_bios_fallback_info():
 def get_system_info():
     """Get general system information"""
     try:
-        result = subprocess.run(
+        result = sources.run(
             ["sudo", "dmidecode", "-t", "system"],
             capture_output=True, text=True, check=True,
             env={**os.environ, "LC_ALL": "C"}
@@ -216,8 +217,8 @@ def get_system_fallback_info():
         
         for key, path in dmi_paths.items():
             try:
-                if os.path.exists(path):
-                    with open(path, "r") as f:
+                if sources.exists(path):
+                    with sources.open_file(path, "r") as f:
                         value = f.read().strip()
                         if value and value != "Not Specified":
                             info[key] = value
@@ -2,23 +2,100 @@ import subprocess
 import re
 import os
 import json
+import time
+import socket
+import struct
+import fnmatch
+from system_info import sources, filecache
 
-def get_network_info(include_details=False):
+# Counters sampled per interface, in the order of every counter tuple below
+NET_COUNTERS = [
+    "rx_bytes", "tx_bytes", "rx_packets", "tx_packets", "rx_dropped", "tx_dropped",
+    "rx_errors", "tx_errors", "rx_fifo_errors", "tx_fifo_errors",
+]
+# Positions of the same counters in the 16 columns of a /proc/net/dev line
+NET_DEV_COLUMNS = [0, 8, 1, 9, 3, 11, 2, 10, 4, 12]
+RESOLV_CONF = ("/etc/resolv.conf",)
+# Above this many statistics files, one read of /proc/net/dev is cheaper than a pread per counter
+MAX_STATISTICS_FILES = 256
+
+# sock_diag (linux/sock_diag.h, linux/inet_diag.h)
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+NLM_F_REQUEST_DUMP = 0x301
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLMSG_HEADER = struct.Struct("=IHHII")
+# inet_diag_req_v2: family, protocol, ext, pad, state mask and a zeroed inet_diag_sockid
+INET_DIAG_REQUEST = struct.Struct("=BBBxI48x")
+# inet_diag_msg fields used: state, source port, destination address
+INET_DIAG_MESSAGE = struct.Struct("=xB2x2s2x16x16s")
+DIAG_BUFFER_SIZE = 1 << 20
+# Socket states as ss(8) names them; UDP sockets are ESTAB when connected, UNCONN otherwise
+SOCKET_STATES = {
+    1: "ESTAB", 2: "SYN-SENT", 3: "SYN-RECV", 4: "FIN-WAIT-1", 5: "FIN-WAIT-2", 6: "TIME-WAIT",
+    7: "UNCONN", 8: "CLOSE-WAIT", 9: "LAST-ACK", 10: "LISTEN", 11: "CLOSING", 12: "NEW-SYN-RECV",
+}
+TCP_LISTEN = 10
+UNCONNECTED = 7
+SOCKET_TABLES = [
+    ("TCP", socket.AF_INET, socket.IPPROTO_TCP, "/proc/net/tcp"),
+    ("TCP", socket.AF_INET6, socket.IPPROTO_TCP, "/proc/net/tcp6"),
+    ("UDP", socket.AF_INET, socket.IPPROTO_UDP, "/proc/net/udp"),
+    ("UDP", socket.AF_INET6, socket.IPPROTO_UDP, "/proc/net/udp6"),
+]
+# Entries kept in the per-port and per-peer rankings
+TOP_SOCKET_ENTRIES = 10
+
+# Interfaces left out of the summary: container plumbing and links that are down
+SUMMARY_SELECTOR = "!name=veth*|br-*|docker*,!state=down"
+# Interfaces listed per page unless a limit is given
+INTERFACE_PAGE_SIZE = 100
+SELECTOR_KEYS = {"name", "type", "state", "has-address", "netns"}
+INTERFACE_SORT_KEYS = ("index", "name", "state", "type", "mtu")
+# rtnetlink address dump (linux/rtnetlink.h, linux/if_addr.h)
+RTM_NEWADDR = 20
+RTM_GETADDR = 22
+IFADDR_MESSAGE = struct.Struct("=BBBBI")
+RTA_HEADER = struct.Struct("=HH")
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+RT_SCOPE_LINK = 253
+# ARPHRD_* values as ip(8) names them in link_type
+LINK_TYPES = {
+    1: "ether", 24: "ieee1394", 32: "infiniband", 256: "slip", 512: "ppp", 768: "ipip", 769: "tunnel6",
+    772: "loopback", 776: "sit", 778: "gre", 823: "ip6gre", 65534: "none",
+}
+# IFF_* flags in the order ip(8) prints them
+INTERFACE_FLAGS = [
+    (0x8, "LOOPBACK"), (0x2, "BROADCAST"), (0x10, "POINTOPOINT"), (0x1000, "MULTICAST"), (0x80, "NOARP"),
+    (0x100, "PROMISC"), (0x200, "ALLMULTI"), (0x1, "UP"),
+]
+
+def get_network_info(include_details=False, include_rates=False, rate_interfaces=None, rate_resolution=None,
+                     include_sockets=False, interface_selector=None, interface_sort="index", interface_offset=0,
+                     interface_limit=INTERFACE_PAGE_SIZE):
     """Get comprehensive network information including hardware details and interface status"""
     hardware_info = get_network_hardware_info()
-    interface_info = get_network_interface_info(include_details)
+    interface_info = get_network_interface_info(include_details, selector=interface_selector, sort=interface_sort,
+                                                offset=interface_offset, limit=interface_limit)
     connection_info = get_network_connection_info()
     
-    return {
+    result = {
         "Hardware": hardware_info,
         "Interfaces": interface_info,
         "Connections": connection_info
     }
+    if include_rates:
+        result["Rates"] = get_network_rates(rate_interfaces, resolution=rate_resolution)
+    if include_sockets:
+        result.update(get_socket_summary())
+    return result
 
 def get_network_hardware_info():
     """Get network hardware information using lshw and fallback methods"""
     try:
-        result = subprocess.run(
+        result = sources.run(
             ["lshw", "-C", "network", "-json"],
             capture_output=True, text=True, check=True,
             env={**os.environ, "LC_ALL": "C"}
@@ -105,8 +182,8 @@ def get_network_hardware_fallback():
         
         # Try to get info from /sys/class/net/
         net_path = "/sys/class/net"
-        if os.path.exists(net_path):
-            interfaces = os.listdir(net_path)
+        if sources.exists(net_path):
+            interfaces = sources.listdir(net_path)
             
             for interface in interfaces:
                 if interface == "lo":  # Skip loopback
@@ -117,7 +194,7 @@ def get_network_hardware_fallback():
                 
                 # Get MAC address
                 try:
-                    with open(os.path.join(interface_path, "address"), "r") as f:
+                    with sources.open_file(os.path.join(interface_path, "address"), "r") as f:
                         adapter["MAC Address"] = f.read().strip()
                 except:
                     adapter["MAC Address"] = "N/A"
@@ -125,8 +202,8 @@ def get_network_hardware_fallback():
                 # Get driver info
                 try:
                     driver_link = os.path.join(interface_path, "device/driver")
-                    if os.path.islink(driver_link):
-                        driver_name = os.path.basename(os.readlink(driver_link))
+                    if sources.islink(driver_link):
+                        driver_name = os.path.basename(sources.readlink(driver_link))
                         adapter["Driver"] = driver_name
                 except:
                     adapter["Driver"] = "N/A"
@@ -138,10 +215,30 @@ def get_network_hardware_fallback():
     except Exception as e:
         return [{"Error": f"Could not get network hardware fallback info: {str(e)}"}]
 
-def get_network_interface_info(include_details=False):
+def get_network_interface_info(include_details=False, selector=None, sort="index", offset=0, limit=INTERFACE_PAGE_SIZE):
+    """Get network interface status and configuration for one page of the selected interfaces"""
+    if selector is None and not include_details:
+        selector = SUMMARY_SELECTOR
+    try:
+        page = list_interfaces(selector, sort=sort, offset=offset, limit=limit, include_details=include_details)
+    except ValueError as e:
+        return [{"Error": f"Invalid interface selection: {str(e)}"}]
+    except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+        return [{"Error": f"Could not list network namespace interfaces: {str(e)}"}]
+    except OSError:
+        return get_interface_info_ip(include_details)
+
+    interfaces = page["Interfaces"]
+    shown = page["Offset"] + len(interfaces)
+    if shown < page["Total"]:
+        interfaces.append({"More": f"{page['Total'] - shown} of {page['Total']} selected interfaces "
+                                   f"not shown; list them with an offset of {shown}"})
+    return interfaces if interfaces or page["Total"] else [{"Warning": "No network interfaces found"}]
+
+def get_interface_info_ip(include_details=False):
     """Get network interface status and configuration using ip command"""
     try:
-        result = subprocess.run(
+        result = sources.run(
             ["ip", "-json", "addr", "show"],
             capture_output=True, text=True, check=True,
             env={**os.environ, "LC_ALL": "C"}
@@ -208,7 +305,7 @@ def get_interface_info_fallback(include_details=False):
     try:
         # Try ifconfig first
         try:
-            result = subprocess.run(
+            result = sources.run(
                 ["ifconfig"],
                 capture_output=True, text=True, check=True
             )
@@ -218,7 +315,7 @@ def get_interface_info_fallback(include_details=False):
         
         # Fallback to /proc/net/dev
         try:
-            with open("/proc/net/dev", "r") as f:
+            with sources.open_file("/proc/net/dev", "r") as f:
                 lines = f.readlines()
             
             interfaces = []
@@ -287,6 +384,10 @@ def parse_ifconfig_output(output, include_details=False):
     
     return interfaces if interfaces else [{"Warning": "No network interfaces found"}]
 
+def _read_dns_servers():
+    with sources.open_file("/etc/resolv.conf", "r") as f:
+        return [line.split()[1] for line in f if line.startswith("nameserver")]
+
 def get_network_connection_info():
     """Get network connection and routing information"""
     try:
@@ -294,7 +395,7 @@ def get_network_connection_info():
         
         # Get default route
         try:
-            result = subprocess.run(
+            result = sources.run(
                 ["ip", "route", "show", "default"],
                 capture_output=True, text=True, check=True
             )
@@ -303,19 +404,541 @@ def get_network_connection_info():
         except:
             pass
         
-        # Get DNS servers
+        # Get DNS servers, parsed once and kept until resolv.conf (or its link target) changes
         try:
-            with open("/etc/resolv.conf", "r") as f:
-                dns_servers = []
-                for line in f:
-                    if line.startswith("nameserver"):
-                        dns_servers.append(line.split()[1])
-                if dns_servers:
-                    connections["DNS Servers"] = dns_servers[:3]  # Limit to 3
+            dns_servers = filecache.cached(RESOLV_CONF, _read_dns_servers)
+            if dns_servers:
+                connections["DNS Servers"] = dns_servers[:3]  # Limit to 3
         except:
             pass
         
         return connections if connections else {"Status": "No connection information available"}
         
     except Exception as e:
-        return {"Error": f"Could not get connection info: {str(e)}"}
\ No newline at end of file
+        return {"Error": f"Could not get connection info: {str(e)}"}
+
+def parse_net_dev(text, interfaces=None):
+    """Return {interface: counter tuple} from /proc/net/dev, optionally only the given interfaces"""
+    counters = {}
+    for line in text.splitlines()[2:]:
+        name, _, rest = line.partition(":")
+        name = name.strip()
+        if interfaces is not None and name not in interfaces:
+            continue
+        fields = rest.split()
+        if len(fields) >= 16:
+            counters[name] = tuple(int(fields[column]) for column in NET_DEV_COLUMNS)
+    return counters
+
+class NetworkSampler:
+    """Read interface counters repeatedly at low cost.
+
+    With a few interfaces, every statistics file under /sys/class/net/<name>/statistics
+    stays open and a sample is one pread per counter; otherwise each sample is a
+    single read of /proc/net/dev.
+    """
+
+    def __init__(self, interfaces=None):
+        self.interfaces = sorted(interfaces) if interfaces else None
+        self._files = {}
+        self._net_dev = None
+        if self.interfaces and len(self.interfaces) * len(NET_COUNTERS) <= MAX_STATISTICS_FILES:
+            try:
+                for name in self.interfaces:
+                    self._files[name] = [
+                        os.open(sources.host_path(f"/sys/class/net/{name}/statistics/{counter}"), os.O_RDONLY)
+                        for counter in NET_COUNTERS
+                    ]
+            except OSError:
+                self.close()
+        if not self._files:
+            self._net_dev = os.open(sources.host_path("/proc/net/dev"), os.O_RDONLY)
+            self._wanted = set(self.interfaces) if self.interfaces else None
+
+    def read(self):
+        """Return (monotonic time, {interface: counter tuple})"""
+        if self._files:
+            pread = os.pread
+            counters = {name: tuple(int(pread(fd, 32, 0)) for fd in fds) for name, fds in self._files.items()}
+            return time.monotonic(), counters
+        data = b""
+        chunk = os.pread(self._net_dev, 65536, 0)
+        while chunk:
+            data += chunk
+            chunk = os.pread(self._net_dev, 65536, len(data))
+        return time.monotonic(), parse_net_dev(data.decode(), self._wanted)
+
+    def close(self):
+        for fds in self._files.values():
+            for fd in fds:
+                os.close(fd)
+        self._files = {}
+        if self._net_dev is not None:
+            os.close(self._net_dev)
+            self._net_dev = None
+
+def compute_network_rates(previous, current, peaks=None):
+    """Per-interface rates between two NetworkSampler.read() snapshots; drops, errors and FIFO overruns as counts"""
+    (start, before), (end, after) = previous, current
+    elapsed = end - start
+    if elapsed <= 0:
+        return []
+    rates = []
+    for name, counters in sorted(after.items()):
+        old = before.get(name, counters)
+        # Counters only go back on a driver reset; report zero instead of a negative rate
+        delta = [max(new - prior, 0) for prior, new in zip(old, counters)]
+        row = {
+            "Interface": name,
+            "RX Bytes/s": round(delta[0] / elapsed, 1),
+            "TX Bytes/s": round(delta[1] / elapsed, 1),
+            "RX Packets/s": round(delta[2] / elapsed, 1),
+            "TX Packets/s": round(delta[3] / elapsed, 1),
+            "RX Drops": delta[4],
+            "TX Drops": delta[5],
+            "RX Errors": delta[6],
+            "TX Errors": delta[7],
+            "RX FIFO": delta[8],
+            "TX FIFO": delta[9],
+        }
+        if peaks is not None:
+            row["Peak RX Bytes/s"], row["Peak TX Bytes/s"] = (round(peak, 1) for peak in peaks.get(name, (0.0, 0.0)))
+        rates.append(row)
+    return rates
+
+def sample_network_rates(interfaces=None, interval=1.0, resolution=None):
+    """Rates over interval seconds; with a resolution, the peak byte rates of any sub-interval are kept too"""
+    sampler = NetworkSampler(interfaces)
+    try:
+        first = previous = sampler.read()
+        if resolution is None or resolution >= interval:
+            time.sleep(interval)
+            return compute_network_rates(first, sampler.read())
+
+        peaks = {}
+        next_tick = first[0] + resolution
+        end = first[0] + interval
+        while next_tick <= end + resolution / 2:
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            current = sampler.read()
+            elapsed = current[0] - previous[0]
+            if elapsed > 0:
+                for name, counters in current[1].items():
+                    old = previous[1].get(name, counters)
+                    rx, tx = (counters[0] - old[0]) / elapsed, (counters[1] - old[1]) / elapsed
+                    peak_rx, peak_tx = peaks.get(name, (0.0, 0.0))
+                    peaks[name] = (max(peak_rx, rx), max(peak_tx, tx))
+            previous = current
+            # Absolute ticks, so a slow read does not stretch the interval
+            next_tick += resolution
+        return compute_network_rates(first, previous, peaks)
+    finally:
+        sampler.close()
+
+def get_network_rates(interfaces=None, interval=1.0, resolution=None):
+    """Per-interface throughput, packet rates, drops, errors and FIFO overruns over interval seconds"""
+    try:
+        if interfaces:
+            missing = [name for name in interfaces if not sources.exists(f"/sys/class/net/{name}")]
+            if missing:
+                return [{"Error": f"Could not find network interfaces: {', '.join(missing)}"}]
+        rates = sample_network_rates(interfaces, interval, resolution)
+        return rates or [{"Warning": "No network interfaces found"}]
+    except Exception as e:
+        return [{"Error": f"Could not sample network rates: {str(e)}"}]
+
+class SocketCounts:
+    """Running totals for one protocol: sockets per state and per local port.
+
+    Keys stay in their raw kernel form (bytes from netlink, hex text from /proc) while
+    streaming; they are decoded once per distinct key in summarize_sockets().
+    """
+
+    def __init__(self):
+        self.states = [0] * 13
+        self.ports = {}
+
+def _format_port(key):
+    return int.from_bytes(key, "big") if isinstance(key, bytes) else int(key, 16)
+
+def _format_peer(family, key):
+    if isinstance(key, str):
+        # /proc/net hex: each 32-bit word of the address is in host (little-endian) order
+        raw = b"".join(bytes.fromhex(key[i:i + 8])[::-1] for i in range(0, len(key), 8))
+    else:
+        raw = key
+    if family == socket.AF_INET:
+        return socket.inet_ntop(socket.AF_INET, raw[:4])
+    return socket.inet_ntop(socket.AF_INET6, raw)
+
+def _dump_sock_diag(sock, family, protocol, buffer, counts, peers):
+    """Stream one sock_diag dump into counts; peers collects remote addresses of this family"""
+    sock.send(NLMSG_HEADER.pack(NLMSG_HEADER.size + INET_DIAG_REQUEST.size, SOCK_DIAG_BY_FAMILY,
+                                NLM_F_REQUEST_DUMP, 1, 0)
+              + INET_DIAG_REQUEST.pack(family, protocol, 0, 0xFFFFFFFF))
+    states, ports = counts.states, counts.ports
+    header, message = NLMSG_HEADER.unpack_from, INET_DIAG_MESSAGE.unpack_from
+    while True:
+        size = sock.recv_into(buffer)
+        offset = 0
+        while offset < size:
+            length, message_type, _, _, _ = header(buffer, offset)
+            if message_type == NLMSG_DONE:
+                return
+            if message_type == NLMSG_ERROR:
+                error = -struct.unpack_from("=i", buffer, offset + NLMSG_HEADER.size)[0]
+                raise OSError(error, os.strerror(error))
+            state, port, peer = message(buffer, offset + NLMSG_HEADER.size)
+            states[state] += 1
+            ports[port] = ports.get(port, 0) + 1
+            if state != TCP_LISTEN and state != UNCONNECTED:
+                peers[peer] = peers.get(peer, 0) + 1
+            offset += (length + 3) & ~3
+
+def _scan_proc_net(path, family, counts, peers):
+    """Stream /proc/net/{tcp,udp}{,6} line by line into counts"""
+    states, ports = counts.states, counts.ports
+    # "  sl: AAAAAAAA:PPPP AAAAAAAA:PPPP ST ..." with 8 or 32 hex digits per address
+    width = 8 if family == socket.AF_INET else 32
+    with sources.open_file(path, "r") as f:
+        next(f, None)
+        for line in f:
+            start = line.index(":") + 2
+            state = int(line[start + 2 * width + 12:start + 2 * width + 14], 16)
+            states[state] += 1
+            port = line[start + width + 1:start + width + 5]
+            ports[port] = ports.get(port, 0) + 1
+            if state != TCP_LISTEN and state != UNCONNECTED:
+                peer = line[start + width + 6:start + 2 * width + 6]
+                peers[peer] = peers.get(peer, 0) + 1
+
+def collect_socket_counts(use_netlink=True):
+    """Count TCP and UDP sockets through sock_diag, or /proc/net when netlink is unavailable.
+
+    Returns (method, {protocol: SocketCounts}, {protocol: {(family, peer key): count}}).
+    """
+    counts = {"TCP": SocketCounts(), "UDP": SocketCounts()}
+    peers = {"TCP": {}, "UDP": {}}
+    # A sysroot describes another machine, so only its /proc/net files apply
+    if use_netlink and sources.SYSROOT is None:
+        try:
+            buffer = bytearray(DIAG_BUFFER_SIZE)
+            with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_SOCK_DIAG) as sock:
+                for protocol_name, family, protocol, _ in SOCKET_TABLES:
+                    family_peers = {}
+                    try:
+                        _dump_sock_diag(sock, family, protocol, buffer, counts[protocol_name], family_peers)
+                    except FileNotFoundError:
+                        # Family or protocol not built into this kernel
+                        continue
+                    for peer, count in family_peers.items():
+                        peers[protocol_name][(family, peer)] = count
+            return "netlink sock_diag", counts, peers
+        except OSError:
+            counts = {"TCP": SocketCounts(), "UDP": SocketCounts()}
+            peers = {"TCP": {}, "UDP": {}}
+
+    for protocol_name, family, _, path in SOCKET_TABLES:
+        family_peers = {}
+        try:
+            _scan_proc_net(path, family, counts[protocol_name], family_peers)
+        except FileNotFoundError:
+            continue
+        for peer, count in family_peers.items():
+            peers[protocol_name][(family, peer)] = count
+    return "/proc/net", counts, peers
+
+def summarize_sockets(method, counts, peers, top=TOP_SOCKET_ENTRIES):
+    """Turn collect_socket_counts() totals into state counts and top port and peer tables"""
+    summary = {"Method": method}
+    for protocol, protocol_counts in counts.items():
+        summary[f"{protocol} Sockets"] = sum(protocol_counts.states)
+    states = {}
+    for protocol, protocol_counts in counts.items():
+        for state, count in enumerate(protocol_counts.states):
+            if count:
+                states[f"{protocol} {SOCKET_STATES.get(state, state)}"] = count
+
+    ports = {}
+    for protocol, protocol_counts in counts.items():
+        for key, count in protocol_counts.ports.items():
+            port = (protocol, _format_port(key))
+            ports[port] = ports.get(port, 0) + count
+    top_ports = [{"Protocol": protocol, "Port": port, "Sockets": count}
+                 for (protocol, port), count in sorted(ports.items(), key=lambda item: -item[1])[:top]]
+
+    remote = {}
+    for protocol, protocol_peers in peers.items():
+        for (family, key), count in protocol_peers.items():
+            address = _format_peer(family, key)
+            # IPv4-mapped IPv6 peers are the same hosts as their IPv4 form
+            if address.startswith("::ffff:") and "." in address:
+                address = address[7:]
+            remote[address] = remote.get(address, 0) + count
+    top_peers = [{"Peer": address, "Sockets": count}
+                 for address, count in sorted(remote.items(), key=lambda item: -item[1])[:top]]
+
+    return {
+        "Socket Summary": summary,
+        "Socket States": states,
+        "Top Local Ports": top_ports,
+        "Top Peers": top_peers,
+    }
+
+def get_socket_summary(top=TOP_SOCKET_ENTRIES):
+    """Count TCP and UDP sockets by state, local port and remote peer"""
+    try:
+        return summarize_sockets(*collect_socket_counts(), top=top)
+    except Exception as e:
+        return {"Socket Summary": {"Error": f"Could not count sockets: {str(e)}"}}
+
+def parse_interface_selector(text):
+    """Parse 'name=eth*|ens*,!type=veth,state=up,has-address' into (negated, key, values) terms.
+
+    Terms are comma-separated and must all match; '|' separates alternatives and '!' negates a term.
+    """
+    terms = []
+    for term in (text or "").split(","):
+        term = term.strip()
+        if not term:
+            continue
+        negated = term.startswith("!")
+        key, has_value, value = term.lstrip("!").partition("=")
+        key = key.strip().lower()
+        if key not in SELECTOR_KEYS:
+            if has_value:
+                raise ValueError(f"unknown key '{key}' (use one of {', '.join(sorted(SELECTOR_KEYS))})")
+            # A bare word is a name pattern
+            key, value = "name", term.lstrip("!")
+        elif key != "has-address" and not value:
+            raise ValueError(f"'{key}' needs a value")
+        values = [v.strip() if key == "name" else v.strip().lower() for v in value.split("|") if v.strip()]
+        terms.append((negated, key, values))
+    if sum(1 for negated, key, _ in terms if key == "netns" and not negated) > 1:
+        raise ValueError("only one netns can be listed at a time")
+    if any(key == "netns" and negated for negated, key, _ in terms):
+        raise ValueError("netns cannot be negated")
+    return terms
+
+def _read_address_dump():
+    """All interface addresses from one RTM_GETADDR dump: {ifindex: [(address/prefix, link-local)]}"""
+    addresses = {}
+    buffer = bytearray(1 << 16)
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE) as sock:
+        sock.send(NLMSG_HEADER.pack(NLMSG_HEADER.size + IFADDR_MESSAGE.size, RTM_GETADDR, NLM_F_REQUEST_DUMP, 1, 0)
+                  + IFADDR_MESSAGE.pack(socket.AF_UNSPEC, 0, 0, 0, 0))
+        while True:
+            size = sock.recv_into(buffer)
+            offset = 0
+            while offset < size:
+                length, message_type, _, _, _ = NLMSG_HEADER.unpack_from(buffer, offset)
+                if message_type == NLMSG_DONE:
+                    return addresses
+                if message_type == NLMSG_ERROR:
+                    error = -struct.unpack_from("=i", buffer, offset + NLMSG_HEADER.size)[0]
+                    raise OSError(error, os.strerror(error))
+                if message_type == RTM_NEWADDR:
+                    family, prefix, _, scope, index = IFADDR_MESSAGE.unpack_from(buffer, offset + NLMSG_HEADER.size)
+                    found = {}
+                    position = offset + NLMSG_HEADER.size + IFADDR_MESSAGE.size
+                    while position < offset + length:
+                        attribute_length, attribute_type = RTA_HEADER.unpack_from(buffer, position)
+                        if attribute_length < RTA_HEADER.size:
+                            break
+                        if attribute_type in (IFA_ADDRESS, IFA_LOCAL):
+                            found[attribute_type] = bytes(buffer[position + 4:position + attribute_length])
+                        position += (attribute_length + 3) & ~3
+                    # The local address, as ip(8) shows it; IFA_ADDRESS is the peer on point-to-point links
+                    raw = found.get(IFA_LOCAL, found.get(IFA_ADDRESS))
+                    if raw:
+                        addresses.setdefault(index, []).append(
+                            (f"{socket.inet_ntop(family, raw)}/{prefix}", scope == RT_SCOPE_LINK))
+                offset += (length + 3) & ~3
+
+class SysfsInterfaces:
+    """Interfaces of this namespace from /sys/class/net; attributes are read only when a filter or page needs them"""
+
+    def __init__(self):
+        self._cache = {}
+        self._addresses = None
+
+    def names(self):
+        return sources.listdir("/sys/class/net")
+
+    def attribute(self, name, attribute):
+        key = (name, attribute)
+        if key not in self._cache:
+            self._cache[key] = sources.read_attribute(f"/sys/class/net/{name}/{attribute}")
+        return self._cache[key]
+
+    def index(self, name):
+        value = self.attribute(name, "ifindex")
+        return int(value) if value and value.isdigit() else 0
+
+    def state(self, name):
+        return (self.attribute(name, "operstate") or "unknown").upper()
+
+    def kind(self, name):
+        """loopback, physical, bridge, bond, veth, a DEVTYPE such as vlan or wlan, or virtual"""
+        base = f"/sys/class/net/{name}"
+        if self.attribute(name, "type") == "772":
+            return "loopback"
+        if sources.exists(f"{base}/bridge"):
+            return "bridge"
+        if sources.exists(f"{base}/bonding"):
+            return "bond"
+        for line in (self.attribute(name, "uevent") or "").splitlines():
+            if line.startswith("DEVTYPE="):
+                return line[8:]
+        if sources.exists(f"{base}/device"):
+            return "physical"
+        # A veth's iflink points at its peer; with no device behind it, that is the usual veth shape
+        if name.startswith("veth") or self.attribute(name, "iflink") != self.attribute(name, "ifindex"):
+            return "veth"
+        return "virtual"
+
+    def link_type(self, name):
+        value = self.attribute(name, "type")
+        return LINK_TYPES.get(int(value), value) if value and value.isdigit() else "N/A"
+
+    def mtu(self, name):
+        value = self.attribute(name, "mtu")
+        return int(value) if value and value.isdigit() else "N/A"
+
+    def flags(self, name):
+        value = self.attribute(name, "flags")
+        if not value:
+            return []
+        flags = int(value, 16)
+        names = [label for bit, label in INTERFACE_FLAGS if flags & bit]
+        if flags & 0x1 and self.attribute(name, "carrier") == "1":
+            names.append("LOWER_UP")
+        return names
+
+    def mac(self, name):
+        return self.attribute(name, "address")
+
+    def addresses(self, name):
+        if self._addresses is None:
+            self._addresses = _read_address_dump() if sources.SYSROOT is None and sources.REPLAY_DIR is None \
+                else _ip_address_map()
+        return self._addresses.get(self.index(name), self._addresses.get(name, []))
+
+def _ip_address_map():
+    """{interface name: [(address/prefix, link-local)]} from ip -json addr, for replayed or foreign machines"""
+    try:
+        result = sources.run(["ip", "-json", "addr", "show"], capture_output=True, text=True, check=True)
+        return {iface.get("ifname"): [(f"{a.get('local')}/{a.get('prefixlen')}", a.get("scope") == "link")
+                                      for a in iface.get("addr_info", []) if a.get("family") in ("inet", "inet6")]
+                for iface in json.loads(result.stdout)}
+    except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+class NamespaceInterfaces:
+    """Interfaces of a named network namespace, from one ip -n <name> -json addr call"""
+
+    def __init__(self, namespace):
+        result = sources.run(["ip", "-n", namespace, "-json", "addr", "show"],
+                             capture_output=True, text=True, check=True)
+        self._interfaces = {iface["ifname"]: iface for iface in json.loads(result.stdout)}
+
+    def names(self):
+        return list(self._interfaces)
+
+    def index(self, name):
+        return self._interfaces[name].get("ifindex", 0)
+
+    def state(self, name):
+        return self._interfaces[name].get("operstate", "UNKNOWN")
+
+    def kind(self, name):
+        iface = self._interfaces[name]
+        if iface.get("link_type") == "loopback":
+            return "loopback"
+        return iface.get("linkinfo", {}).get("info_kind") or ("veth" if "link_netnsid" in iface else "virtual")
+
+    def link_type(self, name):
+        return self._interfaces[name].get("link_type", "N/A")
+
+    def mtu(self, name):
+        return self._interfaces[name].get("mtu", "N/A")
+
+    def flags(self, name):
+        return self._interfaces[name].get("flags", [])
+
+    def mac(self, name):
+        return self._interfaces[name].get("address")
+
+    def addresses(self, name):
+        return [(f"{a.get('local')}/{a.get('prefixlen')}", a.get("scope") == "link")
+                for a in self._interfaces[name].get("addr_info", []) if a.get("family") in ("inet", "inet6")]
+
+def _term_matches(source, name, key, values):
+    if key == "name":
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in values)
+    if key == "type":
+        return source.kind(name) in values
+    if key == "state":
+        return source.state(name).lower() in values
+    if key == "has-address":
+        # Link-local addresses every interface gets do not count
+        return any(not link_local for _, link_local in source.addresses(name))
+    return True
+
+def list_interfaces(selector=None, sort="index", offset=0, limit=INTERFACE_PAGE_SIZE, include_details=False):
+    """Select interfaces, sort them and build rows for one page.
+
+    Terms are checked cheapest first (names, then sysfs attributes, then addresses) and
+    stop at the first miss, so excluded interfaces cost little; rows are built only for the page.
+    """
+    if sort not in INTERFACE_SORT_KEYS:
+        raise ValueError(f"unknown sort key '{sort}' (use one of {', '.join(INTERFACE_SORT_KEYS)})")
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("offset and limit cannot be negative")
+    terms = parse_interface_selector(selector)
+    namespace = next((values[0] for _, key, values in terms if key == "netns"), None)
+    source = NamespaceInterfaces(namespace) if namespace else SysfsInterfaces()
+    cost = {"name": 0, "state": 1, "type": 2, "has-address": 3}
+    terms = sorted((term for term in terms if term[1] != "netns"), key=lambda term: cost[term[1]])
+
+    selected = [name for name in source.names()
+                if all(_term_matches(source, name, key, values) != negated for negated, key, values in terms)]
+    if sort == "index":
+        selected.sort(key=source.index)
+    elif sort == "name":
+        selected.sort(key=lambda name: (len(name), name))
+    elif sort == "state":
+        selected.sort(key=lambda name: (source.state(name), source.index(name)))
+    elif sort == "type":
+        selected.sort(key=lambda name: (source.kind(name), source.index(name)))
+    else:
+        def mtu_order(name):
+            # Numeric order, interfaces without a readable MTU ("N/A") last
+            mtu = source.mtu(name)
+            return (0, mtu, source.index(name)) if isinstance(mtu, int) else (1, 0, source.index(name))
+        selected.sort(key=mtu_order)
+
+    page = selected[offset:offset + limit] if limit is not None else selected[offset:]
+    rows = []
+    for name in page:
+        row = {"Interface": name, "State": source.state(name), "Type": source.link_type(name)}
+        addresses = [address for address, _ in source.addresses(name)]
+        if addresses:
+            if include_details:
+                row["IP Addresses"] = addresses
+            else:
+                ipv4 = [address for address in addresses if ":" not in address.split("/")[0]]
+                if ipv4:
+                    row["Primary IP"] = ipv4[0]
+        if include_details:
+            row["MTU"] = source.mtu(name)
+            flags = source.flags(name)
+            if flags:
+                row["Flags"] = ", ".join(flags)
+            row["Kind"] = source.kind(name)
+            if namespace:
+                row["Namespace"] = namespace
+        rows.append(row)
+    return {"Total": len(selected), "Offset": offset, "Limit": limit, "Interfaces": rows}
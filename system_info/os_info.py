@@ -1,10 +1,20 @@
 import platform
 import socket
+import struct
 import os
 import time
-import subprocess
 import re
 from datetime import datetime, timedelta
+from system_info import sources, modules, filecache
+
+UTMP_PATHS = ("/run/utmp", "/var/run/utmp")
+# glibc struct utmp on Linux (384 bytes): type, pid, line, id, user, host, exit status,
+# session, login time (32-bit seconds and microseconds), IPv6 address, padding
+UTMP_RECORD = struct.Struct("<h2xi32s4s32s256s2hi2i16s20x")
+USER_PROCESS = 7
+ZONEINFO_MARKER = "zoneinfo/"
+RELEASE_FILES = ("/etc/os-release", "/etc/lsb-release")
+TIMEZONE_FILES = ("/etc/timezone", "/etc/localtime", "/etc/sysconfig/clock")
 
 def get_os_info():
     """Get comprehensive operating system information including details and runtime info"""
@@ -20,19 +30,40 @@ def get_os_info():
         "Runtime": runtime_info
     }
 
+def read_uname():
+    """uname fields from /proc/sys/kernel, so a sysroot reports its own kernel; os.uname() for the rest"""
+    local = os.uname()
+    uname = {"system": local.sysname, "release": local.release, "version": local.version,
+             "machine": local.machine, "hostname": local.nodename}
+    for key, attribute in (("system", "ostype"), ("release", "osrelease"), ("version", "version"),
+                           ("hostname", "hostname")):
+        value = sources.read_attribute(f"/proc/sys/kernel/{attribute}")
+        if value:
+            uname[key] = value
+    return uname
+
 def get_system_info():
-    """Get basic system information using platform module"""
+    """Get basic system information from the kernel without running uname"""
     try:
-        uname = platform.uname()
-        
+        uname = read_uname()
+        # platform.platform() scans the Python binary for the libc version; confstr asks libc directly
+        try:
+            libc = os.confstr("CS_GNU_LIBC_VERSION") or ""
+        except (ValueError, OSError):
+            libc = ""
+        platform_name = f"{uname['system']}-{uname['release']}-{uname['machine']}"
+        if libc:
+            platform_name += f"-with-{libc.replace(' ', '')}"
+
         system_data = {
-            "OS": uname.system,
-            "Release": uname.release,
-            "Version": uname.version,
-            "Architecture": uname.machine,
-            "Processor": uname.processor if uname.processor else platform.processor(),
-            "Hostname": socket.gethostname(),
-            "Platform": platform.platform()
+            "OS": uname["system"],
+            "Release": uname["release"],
+            "Version": uname["version"],
+            "Architecture": uname["machine"],
+            # What uname -p prints on Linux
+            "Processor": uname["machine"],
+            "Hostname": uname["hostname"] if sources.SYSROOT else socket.gethostname(),
+            "Platform": platform_name
         }
         
         try:
@@ -51,12 +82,12 @@ def get_kernel_info():
         kernel_data = {}
         
         # Get kernel version from uname
-        uname = platform.uname()
-        kernel_data["Version"] = uname.release
-        kernel_data["Build"] = uname.version
+        uname = read_uname()
+        kernel_data["Version"] = uname["release"]
+        kernel_data["Build"] = uname["version"]
         
         try:
-            with open("/proc/version", "r") as f:
+            with sources.open_file("/proc/version", "r") as f:
                 proc_version = f.read().strip()
                 kernel_data["Full Version"] = proc_version
                 
@@ -67,7 +98,7 @@ def get_kernel_info():
             pass
         
         try:
-            with open("/proc/cmdline", "r") as f:
+            with sources.open_file("/proc/cmdline", "r") as f:
                 cmdline = f.read().strip()
                 # Truncate if too long
                 if len(cmdline) > 100:
@@ -77,9 +108,13 @@ def get_kernel_info():
         except:
             pass
         try:
-            with open("/proc/modules", "r") as f:
-                modules_count = len(f.readlines())
-                kernel_data["Loaded Modules"] = str(modules_count)
+            index = modules.ModuleIndex()
+            kernel_data["Loaded Modules"] = str(len(index.loaded))
+            kernel_data["Built-in Modules"] = str(len(index.builtin))
+            for flag in ("O", "P", "E"):
+                tainted = index.tainted(flag)
+                if tainted:
+                    kernel_data[f"{modules.TAINT_FLAGS[flag]} Modules"] = tainted
         except:
             pass
         
@@ -88,54 +123,60 @@ def get_kernel_info():
     except Exception as e:
         return {"Error": f"Could not get kernel info: {str(e)}"}
 
-def get_distribution_info():
-    """Get Linux distribution information"""
+def _read_release_files():
+    """Distribution fields from /etc/os-release, or /etc/lsb-release when that is missing"""
+    dist_data = {}
+    
+    # Try to get info from /etc/os-release (modern approach)
     try:
-        dist_data = {}
-        
-        # Try to get info from /etc/os-release (modern approach)
+        with sources.open_file("/etc/os-release", "r") as f:
+            for line in f:
+                if "=" in line:
+                    key, value = line.strip().split("=", 1)
+                    value = value.strip('"')
+                    
+                    if key == "NAME":
+                        dist_data["Name"] = value
+                    elif key == "VERSION":
+                        dist_data["Version"] = value
+                    elif key == "VERSION_ID":
+                        dist_data["Version ID"] = value
+                    elif key == "ID":
+                        dist_data["ID"] = value
+                    elif key == "ID_LIKE":
+                        dist_data["Based On"] = value
+                    elif key == "PRETTY_NAME":
+                        dist_data["Pretty Name"] = value
+                    elif key == "VERSION_CODENAME":
+                        dist_data["Codename"] = value
+    except:
+        pass
+    
+    if not dist_data:
         try:
-            with open("/etc/os-release", "r") as f:
+            with sources.open_file("/etc/lsb-release", "r") as f:
                 for line in f:
                     if "=" in line:
                         key, value = line.strip().split("=", 1)
                         value = value.strip('"')
                         
-                        if key == "NAME":
-                            dist_data["Name"] = value
-                        elif key == "VERSION":
-                            dist_data["Version"] = value
-                        elif key == "VERSION_ID":
-                            dist_data["Version ID"] = value
-                        elif key == "ID":
+                        if key == "DISTRIB_DESCRIPTION":
+                            dist_data["Description"] = value
+                        elif key == "DISTRIB_ID":
                             dist_data["ID"] = value
-                        elif key == "ID_LIKE":
-                            dist_data["Based On"] = value
-                        elif key == "PRETTY_NAME":
-                            dist_data["Pretty Name"] = value
-                        elif key == "VERSION_CODENAME":
+                        elif key == "DISTRIB_RELEASE":
+                            dist_data["Release"] = value
+                        elif key == "DISTRIB_CODENAME":
                             dist_data["Codename"] = value
         except:
             pass
-        
-        if not dist_data:
-            try:
-                with open("/etc/lsb-release", "r") as f:
-                    for line in f:
-                        if "=" in line:
-                            key, value = line.strip().split("=", 1)
-                            value = value.strip('"')
-                            
-                            if key == "DISTRIB_DESCRIPTION":
-                                dist_data["Description"] = value
-                            elif key == "DISTRIB_ID":
-                                dist_data["ID"] = value
-                            elif key == "DISTRIB_RELEASE":
-                                dist_data["Release"] = value
-                            elif key == "DISTRIB_CODENAME":
-                                dist_data["Codename"] = value
-            except:
-                pass
+    return dist_data
+
+def get_distribution_info():
+    """Get Linux distribution information"""
+    try:
+        # Parsed once and kept until one of the release files changes
+        dist_data = dict(filecache.cached(RELEASE_FILES, _read_release_files))
         
         if not dist_data:
             try:
@@ -150,7 +191,7 @@ def get_distribution_info():
         
         if not dist_data:
             try:
-                result = subprocess.run(
+                result = sources.run(
                     ["lsb_release", "-a"],
                     capture_output=True, text=True, check=True,
                     env={**os.environ, "LC_ALL": "C"}
@@ -185,7 +226,7 @@ def get_runtime_info():
         
         # Get uptime
         try:
-            with open("/proc/uptime", "r") as f:
+            with sources.open_file("/proc/uptime", "r") as f:
                 uptime_seconds = float(f.read().split()[0])
                 uptime_delta = timedelta(seconds=int(uptime_seconds))
                 runtime_data["Uptime"] = str(uptime_delta)
@@ -202,7 +243,7 @@ def get_runtime_info():
         
         # Get load average
         try:
-            with open("/proc/loadavg", "r") as f:
+            with sources.open_file("/proc/loadavg", "r") as f:
                 loadavg = f.read().strip().split()
                 runtime_data["Load Average"] = f"{loadavg[0]} {loadavg[1]} {loadavg[2]}"
         except:
@@ -214,7 +255,7 @@ def get_runtime_info():
         
         # Get number of processes
         try:
-            with open("/proc/loadavg", "r") as f:
+            with sources.open_file("/proc/loadavg", "r") as f:
                 loadavg_line = f.read().strip()
                 processes_part = loadavg_line.split()[3]
                 if "/" in processes_part:
@@ -224,20 +265,9 @@ def get_runtime_info():
             pass
         
         # Get system timezone
-        try:
-            with open("/etc/timezone", "r") as f:
-                timezone = f.read().strip()
-                runtime_data["Timezone"] = timezone
-        except:
-            try:
-                result = subprocess.run(
-                    ["timedatectl", "show", "--property=Timezone", "--value"],
-                    capture_output=True, text=True, check=True
-                )
-                if result.stdout.strip():
-                    runtime_data["Timezone"] = result.stdout.strip()
-            except:
-                pass
+        timezone = get_timezone()
+        if timezone:
+            runtime_data["Timezone"] = timezone
         
         # Get current date/time
         current_time = datetime.now()
@@ -248,6 +278,50 @@ def get_runtime_info():
     except Exception as e:
         return {"Error": f"Could not get runtime info: {str(e)}"}
 
+def get_timezone():
+    """System timezone from /etc/timezone, the /etc/localtime link or /etc/sysconfig/clock, like timedatectl"""
+    return filecache.cached(TIMEZONE_FILES, _read_timezone_files) or os.environ.get("TZ", "").lstrip(":") or None
+
+def _read_timezone_files():
+    timezone = sources.read_attribute("/etc/timezone")
+    if timezone:
+        return timezone
+    try:
+        # e.g. ../usr/share/zoneinfo/Europe/Lisbon
+        target = sources.readlink("/etc/localtime")
+        if ZONEINFO_MARKER in target:
+            return target.split(ZONEINFO_MARKER, 1)[1]
+    except OSError:
+        pass
+    # Older RHEL-family hosts, where /etc/localtime is a copy
+    for line in (sources.read_attribute("/etc/sysconfig/clock") or "").splitlines():
+        if line.startswith("ZONE="):
+            return line[5:].strip('"')
+    return None
+
+def _utmp_string(field):
+    return field.split(b"\0", 1)[0].decode("utf-8", errors="replace")
+
+def read_utmp_sessions():
+    """Login sessions from the binary utmp file: [(user, terminal, host, login time)]"""
+    for path in UTMP_PATHS:
+        try:
+            with sources.open_file(path, "rb") as f:
+                data = f.read()
+            break
+        except OSError:
+            continue
+    else:
+        return []
+
+    sessions = []
+    for record in UTMP_RECORD.iter_unpack(data[:len(data) - len(data) % UTMP_RECORD.size]):
+        record_type, _, line, _, user, host, _, _, _, seconds, _, _ = record
+        if record_type != USER_PROCESS:
+            continue
+        sessions.append((_utmp_string(user), _utmp_string(line), _utmp_string(host), seconds))
+    return sessions
+
 def get_environment_info():
     """Get environment information (users, sessions, etc.)"""
     try:
@@ -261,21 +335,11 @@ def get_environment_info():
         
         # Get logged in users
         try:
-            result = subprocess.run(
-                ["who"],
-                capture_output=True, text=True, check=True
-            )
-            
-            users = []
-            for line in result.stdout.splitlines():
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        users.append(f"{parts[0]} ({parts[1]})")
-            
+            sessions = read_utmp_sessions()
+            users = [f"{user} ({line})" for user, line, _, _ in sessions]
             if users:
-                env_data["Logged Users"] = users[:5]  
-                
+                env_data["Logged Users"] = users[:5]
+                env_data["Sessions"] = len(sessions)
         except:
             pass
         
@@ -0,0 +1,124 @@
+import time
+import collections
+from system_info import sources
+
+PRESSURE_DIR = "/proc/pressure"
+PRESSURE_RESOURCES = {"cpu": "CPU", "memory": "Memory", "io": "I/O"}
+
+# /proc/vmstat counters reported as per-second rates; a tuple is summed into one rate
+VMSTAT_RATES = [
+    ("Page Faults/s", ("pgfault",)),
+    ("Major Faults/s", ("pgmajfault",)),
+    ("Swap In (pages/s)", ("pswpin",)),
+    ("Swap Out (pages/s)", ("pswpout",)),
+    ("Direct Reclaim Stalls/s", ("allocstall_dma", "allocstall_dma32", "allocstall_normal",
+                                 "allocstall_movable", "allocstall_device")),
+    ("Direct Reclaim Scanned (pages/s)", ("pgscan_direct",)),
+    ("Compaction Stalls/s", ("compact_stall",)),
+]
+VMSTAT_KEYS = {key for _, keys in VMSTAT_RATES for key in keys}
+
+# Shortest baseline worth reporting; a younger one is replaced by a fresh interval
+MIN_SAMPLE_INTERVAL = 0.1
+
+def parse_pressure(text):
+    """Parse one /proc/pressure file into {"some": {...}, "full": {...}}; total is stall time in microseconds"""
+    pressure = {}
+    for line in text.splitlines():
+        kind, *fields = line.split()
+        values = {}
+        for field in fields:
+            key, _, value = field.partition("=")
+            values[key] = int(value) if key == "total" else float(value)
+        pressure[kind] = values
+    return pressure
+
+def read_pressure():
+    """Read /proc/pressure/{cpu,memory,io}; resources the kernel does not report are left out"""
+    pressure = {}
+    for resource in PRESSURE_RESOURCES:
+        try:
+            pressure[resource] = parse_pressure(sources.read_file(f"{PRESSURE_DIR}/{resource}"))
+        except OSError:
+            # Missing without CONFIG_PSI, EOPNOTSUPP when booted with psi=0
+            continue
+    return pressure
+
+def read_vmstat(keys=None):
+    """Read /proc/vmstat counters as integers, optionally only the given keys"""
+    counters = {}
+    for line in sources.read_file("/proc/vmstat").splitlines():
+        key, _, value = line.partition(" ")
+        if keys is None or key in keys:
+            counters[key] = int(value)
+    return counters
+
+def compute_pressure_rates(previous, current):
+    """Stall percentages and vmstat rates between two (monotonic time, pressure, vmstat) snapshots"""
+    (start, pressure_before, vmstat_before), (end, pressure_after, vmstat_after) = previous, current
+    elapsed = end - start
+    if elapsed <= 0:
+        return {}
+
+    stall = []
+    for resource, after in pressure_after.items():
+        before = pressure_before.get(resource, after)
+        row = {"Resource": PRESSURE_RESOURCES.get(resource, resource)}
+        for kind in ("some", "full"):
+            if kind not in after:
+                continue
+            delta = after[kind]["total"] - before.get(kind, after[kind])["total"]
+            row[f"{kind.capitalize()} (%)"] = round(min(max(delta, 0) / (elapsed * 1e6) * 100, 100.0), 2)
+        for kind in ("some", "full"):
+            if kind in after:
+                averages = after[kind]
+                row[f"{kind.capitalize()} avg10/60/300"] = \
+                    f"{averages['avg10']:.2f} {averages['avg60']:.2f} {averages['avg300']:.2f}"
+        stall.append(row)
+
+    activity = {"Window": f"{elapsed:.1f} s"}
+    for label, keys in VMSTAT_RATES:
+        present = [key for key in keys if key in vmstat_after]
+        if not present:
+            continue
+        delta = sum(vmstat_after[key] - vmstat_before.get(key, vmstat_after[key]) for key in present)
+        activity[label] = round(max(delta, 0) / elapsed, 2)
+    return {"Stall": stall, "VM Activity": activity}
+
+class PressureSampler:
+    """Keeps recent PSI and vmstat snapshots so rates can cover the previous call or a rolling window"""
+
+    def __init__(self):
+        self.history = collections.deque()
+
+    def snapshot(self):
+        return time.monotonic(), read_pressure(), read_vmstat(VMSTAT_KEYS)
+
+    def sample(self, interval=1.0, window=None):
+        """Rates since the previous call, or since the oldest snapshot no older than window seconds"""
+        if window is not None:
+            now = time.monotonic()
+            while self.history and now - self.history[0][0] > window:
+                self.history.popleft()
+        if not self.history or time.monotonic() - self.history[0][0] < MIN_SAMPLE_INTERVAL:
+            self.history.clear()
+            self.history.append(self.snapshot())
+            time.sleep(interval)
+        current = self.snapshot()
+        baseline = self.history[0]
+        if window is None:
+            self.history.clear()
+        self.history.append(current)
+        return compute_pressure_rates(baseline, current)
+
+_pressure_sampler = PressureSampler()
+
+def get_pressure_info(interval=1.0, window=None):
+    """CPU, memory and I/O stall percentages (PSI) and paging, reclaim and compaction rates"""
+    try:
+        rates = _pressure_sampler.sample(interval, window)
+        if not rates.get("Stall"):
+            rates["Stall"] = [{"Warning": "Pressure stall information not available (kernel without PSI or psi=0)"}]
+        return rates
+    except Exception as e:
+        return {"Error": f"Could not get pressure statistics: {str(e)}"}
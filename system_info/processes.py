@@ -0,0 +1,189 @@
+import os
+import pwd
+import time
+import heapq
+from system_info import sources
+
+DEFAULT_TOP = 15
+# Bytes of the command line kept per process
+COMMAND_LENGTH = 256
+SORT_KEYS = ("cpu", "rss", "io")
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# Indexes into the /proc/<pid>/stat fields that follow "(comm)", i.e. field number - 3
+STAT_STATE = 0
+STAT_UTIME = 11
+STAT_STIME = 12
+STAT_THREADS = 17
+STAT_START_TIME = 19
+STAT_RSS = 21
+
+# Shortest baseline worth reporting; a younger one is replaced by a fresh interval
+MIN_SAMPLE_INTERVAL = 0.1
+
+_user_names = {}
+
+def _read(path, size=1024):
+    """Read a small /proc file with a single read into bytes; None if the process is gone or access is denied"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, size)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+def parse_io(data):
+    """Return (read_bytes, write_bytes) from /proc/<pid>/io, the bytes that reached storage"""
+    # rchar, wchar, syscr, syscw, read_bytes, write_bytes, cancelled_write_bytes: "name: value" pairs
+    tokens = data.split()
+    if tokens[8:9] == [b"read_bytes:"] and tokens[10:11] == [b"write_bytes:"]:
+        return int(tokens[9]), int(tokens[11])
+    counters = dict(zip(tokens[::2], tokens[1::2]))
+    return int(counters.get(b"read_bytes:", 0)), int(counters.get(b"write_bytes:", 0))
+
+def _user_name(uid):
+    if uid not in _user_names:
+        try:
+            _user_names[uid] = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            _user_names[uid] = str(uid)
+    return _user_names[uid]
+
+def scan_processes(proc_dir, include_io=True):
+    """One pass over /proc: {pid: (start time, cpu ticks, rss pages, io bytes, comm, state, threads)}"""
+    processes = {}
+    # Threads are not listed in /proc itself, so the scan costs one stat (and io) read per process
+    with os.scandir(proc_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.isdigit():
+                continue
+            base = f"{proc_dir}/{name}/"
+            data = _read(base + "stat")
+            if not data:
+                continue
+            end = data.rfind(b")")
+            fields = data[end + 2:].split()
+            io_bytes = None
+            if include_io:
+                io = _read(base + "io")
+                if io:
+                    io_bytes = parse_io(io)
+            processes[int(name)] = (
+                int(fields[STAT_START_TIME]),
+                int(fields[STAT_UTIME]) + int(fields[STAT_STIME]),
+                int(fields[STAT_RSS]),
+                io_bytes,
+                data[data.find(b"(") + 1:end],
+                fields[STAT_STATE],
+                int(fields[STAT_THREADS]),
+            )
+    return processes
+
+def select_top(previous, current, elapsed, sort_by="cpu", count=DEFAULT_TOP):
+    """Keep the count busiest processes with a size-bounded heap; returns [(score, pid, cpu, io rates)]"""
+    if count < 1:
+        raise ValueError(f"count must be at least 1, got {count}")
+    heap = []
+    for pid, process in current.items():
+        start_time, ticks, rss, io_bytes = process[:4]
+        before = previous.get(pid)
+        if before is not None and before[0] != start_time:
+            # The PID was reused by a new process since the previous scan
+            before = None
+        cpu = (ticks - before[1]) / CLOCK_TICKS / elapsed * 100 if before else 0.0
+        if io_bytes is not None and before and before[3] is not None:
+            io_rates = ((io_bytes[0] - before[3][0]) / elapsed, (io_bytes[1] - before[3][1]) / elapsed)
+        else:
+            io_rates = None
+
+        if sort_by == "cpu":
+            score = cpu
+        elif sort_by == "rss":
+            score = rss
+        else:
+            score = io_rates[0] + io_rates[1] if io_rates else 0.0
+
+        item = (score, pid, cpu, io_rates)
+        if len(heap) < count:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return sorted(heap, reverse=True)
+
+def _format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} TB"
+
+def describe_process(proc_dir, pid, process, cpu, io_rates):
+    """Build the full row for one selected process; statm, cmdline and the owner are only read here"""
+    _, _, rss, _, comm, state, threads = process
+    row = {
+        "PID": pid,
+        "User": "",
+        "Name": comm.decode(errors="replace"),
+        "State": state.decode(),
+        "Threads": threads,
+        "CPU (%)": round(cpu, 1),
+        "RSS": _format_bytes(rss * PAGE_SIZE),
+        "Shared": "",
+        "Read kB/s": round(io_rates[0] / 1024, 1) if io_rates else "",
+        "Write kB/s": round(io_rates[1] / 1024, 1) if io_rates else "",
+        "Command": "",
+    }
+    try:
+        row["User"] = _user_name(os.stat(f"{proc_dir}/{pid}").st_uid)
+    except OSError:
+        pass
+    statm = _read(f"{proc_dir}/{pid}/statm")
+    if statm:
+        row["Shared"] = _format_bytes(int(statm.split()[2]) * PAGE_SIZE)
+    cmdline = _read(f"{proc_dir}/{pid}/cmdline", COMMAND_LENGTH)
+    if cmdline:
+        row["Command"] = cmdline.rstrip(b"\0").replace(b"\0", b" ").decode(errors="replace")
+    return row
+
+class ProcessSampler:
+    """Keeps the previous scan so repeated calls report CPU% and I/O rates since the previous one"""
+
+    def __init__(self):
+        self.previous = None
+        self.included_io = False
+
+    def snapshot(self, proc_dir, include_io):
+        return time.monotonic(), scan_processes(proc_dir, include_io)
+
+    def sample(self, interval=1.0, sort_by="cpu", count=DEFAULT_TOP, include_io=True):
+        proc_dir = sources.host_path("/proc")
+        previous = self.previous
+        if (previous is None or time.monotonic() - previous[0] < MIN_SAMPLE_INTERVAL
+                or (include_io and not self.included_io)):
+            previous = self.snapshot(proc_dir, include_io)
+            time.sleep(interval)
+        current = self.snapshot(proc_dir, include_io)
+        self.previous = current
+        self.included_io = include_io
+
+        (start, before), (end, after) = previous, current
+        top = select_top(before, after, end - start, sort_by, count)
+        return [describe_process(proc_dir, pid, after[pid], cpu, io_rates) for _, pid, cpu, io_rates in top]
+
+_process_sampler = ProcessSampler()
+
+def get_top_processes(sort_by="cpu", count=DEFAULT_TOP, interval=1.0, include_io=True):
+    """Top processes by CPU%, resident memory or storage I/O rate from a scan of /proc"""
+    if sort_by not in SORT_KEYS:
+        return [{"Error": f"Could not sort processes by '{sort_by}': use one of {', '.join(SORT_KEYS)}"}]
+    try:
+        return _process_sampler.sample(interval, sort_by, count, include_io or sort_by == "io")
+    except Exception as e:
+        return [{"Error": f"Could not scan processes: {str(e)}"}]
@@ -0,0 +1,287 @@
+import os
+import json
+import time
+import threading
+import functools
+import tracemalloc
+
+from system_info import (cpu, memory, disk, gpu, network, os_info, usb, motherboard, pressure, processes, modules,
+                         tunables, sources)
+
+# Modules whose public get_* functions are timed as collectors
+COLLECTOR_MODULES = [os_info, modules, cpu, memory, disk, pressure, processes, gpu, network, usb, motherboard, tunables]
+
+EVENTS = []
+_events_lock = threading.Lock()
+_local = threading.local()
+_originals = {}
+_started = None
+# tracemalloc only knows the process total: a span's allocations are kept only while no other
+# thread had spans open, otherwise they would include its neighbours'. The run's peak is always kept.
+_peak_memory = None
+_open_spans = {}
+# Bumped whenever spans of two threads overlap; a span that sees it change is not measured
+_overlaps = 0
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+class _Span:
+    """Time one collector call, command or file read, with the peak memory allocated inside it"""
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.args = {}
+
+    def __enter__(self):
+        global _overlaps
+        thread = threading.get_ident()
+        with _events_lock:
+            if any(count for ident, count in _open_spans.items() if ident != thread):
+                _overlaps += 1
+            _open_spans[thread] = _open_spans.get(thread, 0) + 1
+            self.overlaps = _overlaps
+        stack = _stack()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # Keep the parent's peak so far before resetting the counter for this span
+            stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        tracemalloc.reset_peak()
+        self.base_memory = current
+        self.child_peak = current
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+        stack = _stack()
+        # A file left open by a collector must not become the parent of later spans
+        while stack and stack.pop() is not self:
+            pass
+        if stack:
+            stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        with _events_lock:
+            thread = threading.get_ident()
+            _open_spans[thread] -= 1
+            if self.overlaps == _overlaps:
+                self.args["memory"] = peak - self.base_memory
+
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+            if hasattr(exc_value, "returncode"):
+                self.args["exit code"] = exc_value.returncode
+        with _events_lock:
+            EVENTS.append({
+                "Kind": self.kind,
+                "Name": self.name,
+                "Start": self.start,
+                "End": end,
+                "Thread": threading.get_ident(),
+                "Args": self.args,
+            })
+        return False
+
+class _ProfiledFile:
+    """File wrapper counting bytes read; the event is recorded when the file is closed"""
+
+    def __init__(self, path, file):
+        self._file = file
+        self._span = _Span("file", path)
+        self._span.__enter__()
+        self._span.args["bytes"] = 0
+        self._closed = False
+
+    def _count(self, data):
+        self._span.args["bytes"] += len(data)
+        return data
+
+    def read(self, *args):
+        return self._count(self._file.read(*args))
+
+    def readline(self, *args):
+        return self._count(self._file.readline(*args))
+
+    def readlines(self, *args):
+        lines = self._file.readlines(*args)
+        for line in lines:
+            self._count(line)
+        return lines
+
+    def __iter__(self):
+        for line in self._file:
+            yield self._count(line)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._file.close()
+            self._span.__exit__(None, None, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+def _profiled_run(args, **kwargs):
+    with _Span("command", " ".join(str(arg) for arg in args)) as span:
+        span.args["argv"] = [str(arg) for arg in args]
+        try:
+            result = _originals["run"](args, **kwargs)
+        finally:
+            # Measured by the kernel per child, so valid with any number of threads
+            child_rss = sources.last_child_rss()
+            if child_rss is not None:
+                span.args["child max rss"] = child_rss
+        span.args["exit code"] = result.returncode
+        span.args["bytes"] = len(result.stdout or "") + len(result.stderr or "")
+        return result
+
+def _profiled_open(path, mode="r", **kwargs):
+    file = _originals["open_file"](path, mode, **kwargs)
+    if "r" not in mode:
+        return file
+    return _ProfiledFile(str(path), file)
+
+def _profiled_read_attribute(path):
+    with _Span("file", str(path)) as span:
+        value = _originals["read_attribute"](path)
+        span.args["bytes"] = len(value or "")
+        return value
+
+def _wrap_collector(label, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with _Span("collector", label):
+            return function(*args, **kwargs)
+    return wrapper
+
+def enable():
+    """Instrument collectors, commands and file reads until disable() is called"""
+    global _started, _peak_memory
+    if _originals:
+        return
+    EVENTS.clear()
+    _open_spans.clear()
+    _started = time.perf_counter()
+    _peak_memory = None
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    _originals["run"] = sources.run
+    _originals["open_file"] = sources.open_file
+    _originals["read_attribute"] = sources.read_attribute
+    sources.run = _profiled_run
+    sources.open_file = _profiled_open
+    sources.read_attribute = _profiled_read_attribute
+
+    # Replacing the module attribute also catches calls between functions of the same module
+    for module in COLLECTOR_MODULES:
+        short_name = module.__name__.rsplit(".", 1)[-1]
+        for name, function in list(vars(module).items()):
+            if name.startswith("get_") and callable(function) and getattr(function, "__module__", None) == module.__name__:
+                _originals[(module, name)] = function
+                setattr(module, name, _wrap_collector(f"{short_name}.{name}", function))
+
+def disable():
+    """Remove the instrumentation installed by enable()"""
+    global _peak_memory
+    for key, original in _originals.items():
+        if isinstance(key, tuple):
+            setattr(key[0], key[1], original)
+        else:
+            setattr(sources, key, original)
+    _originals.clear()
+    if tracemalloc.is_tracing():
+        _peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+def _format_bytes(count):
+    for unit in ("B", "KiB", "MiB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
+
+def summarize():
+    """Aggregate events by kind and name, slowest first"""
+    groups = {}
+    for event in EVENTS:
+        group = groups.setdefault((event["Kind"], event["Name"]), {
+            "Calls": 0, "Total": 0.0, "Max": 0.0, "Bytes": 0, "Memory": None, "Child RSS": None, "Exit Codes": set(), "Errors": set(),
+        })
+        duration = event["End"] - event["Start"]
+        group["Calls"] += 1
+        group["Total"] += duration
+        group["Max"] = max(group["Max"], duration)
+        group["Bytes"] += event["Args"].get("bytes", 0)
+        for key, arg in (("Memory", "memory"), ("Child RSS", "child max rss")):
+            if arg in event["Args"]:
+                group[key] = max(group[key] or 0, event["Args"][arg])
+        if "exit code" in event["Args"]:
+            group["Exit Codes"].add(str(event["Args"]["exit code"]))
+        if "error" in event["Args"]:
+            group["Errors"].add(event["Args"]["error"])
+
+    rows = []
+    for (kind, name), group in sorted(groups.items(), key=lambda item: item[1]["Total"], reverse=True):
+        memory = group["Child RSS"] if kind == "command" else group["Memory"]
+        rows.append({
+            "Kind": kind,
+            "Name": name,
+            "Calls": group["Calls"],
+            "Total (ms)": f"{group['Total'] * 1000:.1f}",
+            "Max (ms)": f"{group['Max'] * 1000:.1f}",
+            "Bytes Read": _format_bytes(group["Bytes"]) if group["Bytes"] else "",
+            # Commands are charged with the child's resident peak, the rest with Python allocations
+            "Peak Memory": _format_bytes(memory) if memory is not None else "",
+            "Status": ", ".join(sorted(group["Exit Codes"]) + sorted(group["Errors"])),
+        })
+    return rows
+
+def get_totals():
+    """Wall time and counts for the whole profiled run"""
+    end = max((event["End"] for event in EVENTS), default=_started or 0)
+    totals = {
+        "Wall Time": f"{(end - (_started or end)) * 1000:.1f} ms",
+        "Collector Calls": sum(1 for event in EVENTS if event["Kind"] == "collector"),
+        "Commands": sum(1 for event in EVENTS if event["Kind"] == "command"),
+        "Files Read": sum(1 for event in EVENTS if event["Kind"] == "file"),
+    }
+    peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else _peak_memory
+    if peak is not None:
+        totals["Peak Memory (process)"] = _format_bytes(peak)
+    return totals
+
+def write_trace(path):
+    """Write the events in Chrome trace-event format (chrome://tracing, Perfetto)"""
+    pid = os.getpid()
+    threads = {}
+    trace_events = []
+    for event in sorted(EVENTS, key=lambda event: event["Start"]):
+        tid = threads.setdefault(event["Thread"], len(threads) + 1)
+        trace_events.append({
+            "name": event["Name"],
+            "cat": event["Kind"],
+            "ph": "X",
+            "ts": round((event["Start"] - _started) * 1e6, 3),
+            "dur": round((event["End"] - event["Start"]) * 1e6, 3),
+            "pid": pid,
+            "tid": tid,
+            "args": event["Args"],
+        })
+    for ident, tid in threads.items():
+        trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                             "args": {"name": "main" if ident == threading.main_thread().ident else f"worker {tid}"}})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
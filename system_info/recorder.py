@@ -0,0 +1,465 @@
+import os
+import mmap
+import struct
+import time
+
+from system_info import sources, pressure, gpu
+
+# Ring file layout:
+#   header      fixed-size struct (see HEADER) padded to a multiple of 64 bytes
+#   columns     COLUMN_ENTRY per column (name + unit)
+#   records     capacity x (timestamp + one float64 per column)
+MAGIC = b"HXTS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIddQ")
+COLUMN_ENTRY = struct.Struct("<40s8s")
+WRITE_COUNT_OFFSET = HEADER.size - 8
+
+AVAILABLE_METRICS = ["cpu", "memory", "network", "disk", "temperature", "pressure", "gpu"]
+
+# nvidia-smi fields recorded per GPU: (field, column suffix, unit, scale to the unit)
+GPU_COLUMNS = [
+    ("utilization.gpu", "util", "%", 1.0),
+    ("memory.used", "mem", "B", 1024.0 * 1024.0),
+    ("temperature.gpu", "temp", "C", 1.0),
+    ("power.draw", "power", "W", 1.0),
+]
+# amdgpu sysfs values recorded per card: (key, column suffix, unit)
+AMD_GPU_COLUMNS = [("busy", "util", "%"), ("vram_used", "mem", "B"), ("temperature", "temp", "C"), ("power", "power", "W")]
+
+def _align(size, boundary=64):
+    return (size + boundary - 1) // boundary * boundary
+
+class RingRecorder:
+    """Preallocated, memory-mapped ring file made of fixed-width float64 records"""
+
+    def __init__(self, path, columns, capacity, interval):
+        self.columns = list(columns)
+        self.capacity = int(capacity)
+        if self.capacity <= 0:
+            raise ValueError(f"Capacity must be a positive number of records, got {capacity}")
+        if interval <= 0:
+            raise ValueError(f"Interval must be a positive number of seconds, got {interval}")
+        self.record = struct.Struct(f"<{len(self.columns) + 1}d")
+        self.header_size = _align(HEADER.size + COLUMN_ENTRY.size * len(self.columns))
+        self.write_count = 0
+
+        size = self.header_size + self.record.size * self.capacity
+        self._file = open(path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+        HEADER.pack_into(
+            self._map, 0, MAGIC, VERSION, 0, self.header_size, self.record.size,
+            self.capacity, len(self.columns), float(interval), time.time(), 0
+        )
+        offset = HEADER.size
+        for name, unit in self.columns:
+            COLUMN_ENTRY.pack_into(self._map, offset, name.encode("utf-8")[:40], unit.encode("utf-8")[:8])
+            offset += COLUMN_ENTRY.size
+
+    def append(self, timestamp, values):
+        """Write one record into the next ring slot and publish it in the header"""
+        slot = self.write_count % self.capacity
+        self.record.pack_into(self._map, self.header_size + slot * self.record.size, timestamp, *values)
+        self.write_count += 1
+        struct.pack_into("<Q", self._map, WRITE_COUNT_OFFSET, self.write_count)
+
+    def close(self):
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+
+class RecordingReader:
+    """Read a ring file written by RingRecorder without copying the records"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, _, self.header_size, self.record_size, self.capacity,
+         column_count, self.interval, self.start_time, _) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a Heracross recording")
+
+        self.columns = []
+        self.units = []
+        offset = HEADER.size
+        for _ in range(column_count):
+            name, unit = COLUMN_ENTRY.unpack_from(self._map, offset)
+            self.columns.append(name.rstrip(b"\0").decode("utf-8"))
+            self.units.append(unit.rstrip(b"\0").decode("utf-8"))
+            offset += COLUMN_ENTRY.size
+        self.record = struct.Struct(f"<{column_count + 1}d")
+
+    @property
+    def write_count(self):
+        return struct.unpack_from("<Q", self._map, WRITE_COUNT_OFFSET)[0]
+
+    def __len__(self):
+        return min(self.write_count, self.capacity)
+
+    def as_array(self):
+        """Return the whole ring as a (capacity, 1 + columns) NumPy view, in slot order.
+
+        Column 0 holds the timestamps. No data is copied; the view stays valid
+        while the reader is open.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("NumPy is required for array access to recordings (pip install numpy)")
+        return np.frombuffer(
+            self._map, dtype="<f8", count=self.capacity * (len(self.columns) + 1), offset=self.header_size
+        ).reshape(self.capacity, len(self.columns) + 1)
+
+    def chronological(self):
+        """Return (older, newer) zero-copy views which together hold the records in time order"""
+        data = self.as_array()
+        count = self.write_count
+        if count <= self.capacity:
+            return data[:count], data[:0]
+        head = count % self.capacity
+        return data[head:], data[:head]
+
+    def column(self, name):
+        """Return one column of the ring (slot order) as a zero-copy view"""
+        return self.as_array()[:, self.columns.index(name) + 1]
+
+    def iter_records(self):
+        """Yield (timestamp, values) tuples in time order without NumPy"""
+        count = self.write_count
+        first = count - len(self)
+        for sequence in range(first, count):
+            offset = self.header_size + (sequence % self.capacity) * self.record_size
+            row = self.record.unpack_from(self._map, offset)
+            yield row[0], row[1:]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+class _ProcFile:
+    """Keep a /proc or /sys file open and re-read it with a single pread per sample"""
+
+    def __init__(self, path, size=65536):
+        self.fd = os.open(sources.host_path(path), os.O_RDONLY)
+        self.size = size
+
+    def read(self):
+        data = os.pread(self.fd, self.size, 0)
+        while len(data) == self.size:
+            self.size *= 2
+            data = os.pread(self.fd, self.size, 0)
+        return data
+
+    def close(self):
+        os.close(self.fd)
+
+def _read_temperature(sensor_file):
+    """Degrees Celsius from an hwmon input; NaN while the sensor cannot be read"""
+    try:
+        return int(sensor_file.read()) / 1000.0
+    except (OSError, ValueError):
+        # EIO/ENODATA from suspended or unplugged sensors
+        return float("nan")
+
+def _parse_proc_stat(data):
+    """Return {cpu_name: (busy, total)} for each per-core line of /proc/stat"""
+    cores = {}
+    for line in data.split(b"\n"):
+        if line.startswith(b"cpu") and line[3:4].isdigit():
+            fields = line.split()
+            values = [int(v) for v in fields[1:]]
+            total = sum(values[:8])
+            idle = values[3] + values[4]
+            cores[fields[0].decode()] = (total - idle, total)
+    return cores
+
+def _parse_meminfo(data, keys):
+    values = {}
+    for line in data.split(b"\n"):
+        key, _, rest = line.partition(b":")
+        if key in keys:
+            values[key] = int(rest.split()[0]) * 1024
+    return values
+
+def _parse_net_dev(data):
+    """Return {interface: (rx_bytes, tx_bytes)} from /proc/net/dev"""
+    counters = {}
+    for line in data.split(b"\n")[2:]:
+        name, _, rest = line.partition(b":")
+        fields = rest.split()
+        if len(fields) >= 9:
+            counters[name.strip().decode()] = (int(fields[0]), int(fields[8]))
+    return counters
+
+def _parse_diskstats(data, disks):
+    """Return {disk: (sectors_read, sectors_written)} from /proc/diskstats"""
+    counters = {}
+    for line in data.split(b"\n"):
+        fields = line.split()
+        if len(fields) >= 10 and fields[2] in disks:
+            counters[fields[2].decode()] = (int(fields[5]), int(fields[9]))
+    return counters
+
+def _parse_vmstat(data, keys):
+    values = {}
+    for line in data.split(b"\n"):
+        key, _, value = line.partition(b" ")
+        if key in keys:
+            values[key] = int(value)
+    return values
+
+def _list_disks():
+    """Whole block devices backed by hardware (no loop, ram, zram or device-mapper)"""
+    disks = []
+    try:
+        for name in sorted(sources.listdir("/sys/block")):
+            if name.startswith(("loop", "ram", "zram", "dm-", "md", "sr")):
+                continue
+            disks.append(name)
+    except OSError:
+        pass
+    return disks
+
+def _list_temperature_inputs():
+    """Return [(column name, path)] for every hwmon temperature input"""
+    sensors = []
+    hwmon_path = "/sys/class/hwmon"
+    try:
+        for hwmon_dir in sorted(sources.listdir(hwmon_path)):
+            hwmon_full_path = os.path.join(hwmon_path, hwmon_dir)
+            try:
+                with sources.open_file(os.path.join(hwmon_full_path, "name"), "r") as f:
+                    chip = f.read().strip()
+            except OSError:
+                chip = hwmon_dir
+            for file in sorted(sources.listdir(hwmon_full_path)):
+                if file.startswith("temp") and file.endswith("_input"):
+                    label = file[:-len("_input")]
+                    try:
+                        with sources.open_file(os.path.join(hwmon_full_path, label + "_label"), "r") as f:
+                            label = f.read().strip()
+                    except OSError:
+                        pass
+                    sensors.append((f"temp.{chip}.{label}", os.path.join(hwmon_full_path, file)))
+    except OSError:
+        pass
+    return sensors
+
+class MetricSampler:
+    """Sample the selected metrics into a flat list of floats with a fixed column layout"""
+
+    def __init__(self, metrics, interval=1.0):
+        unknown = set(metrics) - set(AVAILABLE_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}")
+
+        self.columns = []
+        self._files = []
+        self._collectors = []
+        self._previous = {}
+        self._last_time = None
+        self._gpu_monitor = None
+        self._amd_sampler = None
+
+        if "cpu" in metrics:
+            stat = self._open("/proc/stat")
+            self._cores = sorted(_parse_proc_stat(stat.read()), key=lambda c: int(c[3:]))
+            self.columns += [(f"{core}.busy", "%") for core in self._cores]
+            self._collectors.append(lambda elapsed: self._sample_cpu(stat))
+
+        if "memory" in metrics:
+            meminfo = self._open("/proc/meminfo")
+            self.columns += [("memory.used", "B"), ("memory.available", "B"), ("swap.used", "B")]
+            self._collectors.append(lambda elapsed: self._sample_memory(meminfo))
+
+        if "network" in metrics:
+            net_dev = self._open("/proc/net/dev")
+            self._interfaces = sorted(_parse_net_dev(net_dev.read()))
+            for interface in self._interfaces:
+                self.columns += [(f"net.{interface}.rx", "B/s"), (f"net.{interface}.tx", "B/s")]
+            self._collectors.append(lambda elapsed: self._sample_network(net_dev, elapsed))
+
+        if "disk" in metrics:
+            diskstats = self._open("/proc/diskstats")
+            self._disks = _list_disks()
+            self._disk_names = {d.encode() for d in self._disks}
+            for disk in self._disks:
+                self.columns += [(f"disk.{disk}.read", "B/s"), (f"disk.{disk}.write", "B/s")]
+            self._collectors.append(lambda elapsed: self._sample_disk(diskstats, elapsed))
+
+        if "temperature" in metrics:
+            sensors = _list_temperature_inputs()
+            sensor_files = [self._open(path, 64) for _, path in sensors]
+            self.columns += [(name, "C") for name, _ in sensors]
+            self._collectors.append(lambda elapsed: [_read_temperature(f) for f in sensor_files])
+
+        if "pressure" in metrics:
+            pressure_files = []
+            for resource in pressure.PRESSURE_RESOURCES:
+                try:
+                    proc_file = self._open(f"{pressure.PRESSURE_DIR}/{resource}", 256)
+                    kinds = list(pressure.parse_pressure(proc_file.read().decode()))
+                except OSError:
+                    # No PSI in this kernel, or disabled with psi=0
+                    continue
+                pressure_files.append((resource, proc_file, kinds))
+                self.columns += [(f"psi.{resource}.{kind}", "%") for kind in kinds]
+            vmstat = self._open("/proc/vmstat")
+            self._vmstat_keys = sorted(key.encode() for key in pressure.VMSTAT_KEYS)
+            self.columns += [(f"vm.{key.decode()}", "/s") for key in self._vmstat_keys]
+            self._collectors.append(lambda elapsed: self._sample_pressure(pressure_files, vmstat, elapsed))
+
+        if "gpu" in metrics:
+            # A single nvidia-smi loop feeds every sample instead of one process per tick
+            self._gpu_monitor = gpu.NvidiaMonitor(interval)
+            try:
+                self._gpu_monitor.start().wait()
+            except OSError:
+                # No NVIDIA driver on this host
+                pass
+            gpus = self._gpu_monitor.latest()
+            self._gpu_slots = list(gpus)
+            for slot, row in gpus.items():
+                self.columns += [(f"gpu.{row['index']}.{suffix}", unit) for _, suffix, unit, _ in GPU_COLUMNS]
+            if gpus:
+                self._collectors.append(lambda elapsed: self._sample_gpu())
+            else:
+                self._gpu_monitor.close()
+
+            # AMD cards are read straight from sysfs, one pread per attribute
+            self._amd_sampler = gpu.AmdGpuSampler()
+            for card, _ in self._amd_sampler.cards:
+                self.columns += [(f"gpu.{card}.{suffix}", unit) for _, suffix, unit in AMD_GPU_COLUMNS]
+            if self._amd_sampler.cards:
+                self._collectors.append(lambda elapsed: self._sample_amd_gpu())
+
+        # Prime the counters so the first recorded rates cover a real interval
+        self.sample(time.monotonic())
+
+    def _open(self, path, size=65536):
+        proc_file = _ProcFile(path, size)
+        self._files.append(proc_file)
+        return proc_file
+
+    def _rate(self, key, value, elapsed):
+        previous = self._previous.get(key)
+        self._previous[key] = value
+        if previous is None or elapsed <= 0:
+            return 0.0
+        return (value - previous) / elapsed
+
+    def _sample_cpu(self, stat):
+        cores = _parse_proc_stat(stat.read())
+        values = []
+        for core in self._cores:
+            busy, total = cores.get(core, (0, 0))
+            previous_busy, previous_total = self._previous.get(core, (busy, total))
+            self._previous[core] = (busy, total)
+            delta = total - previous_total
+            values.append((busy - previous_busy) * 100.0 / delta if delta > 0 else 0.0)
+        return values
+
+    def _sample_memory(self, meminfo):
+        info = _parse_meminfo(meminfo.read(), {b"MemTotal", b"MemAvailable", b"SwapTotal", b"SwapFree"})
+        return [
+            float(info.get(b"MemTotal", 0) - info.get(b"MemAvailable", 0)),
+            float(info.get(b"MemAvailable", 0)),
+            float(info.get(b"SwapTotal", 0) - info.get(b"SwapFree", 0)),
+        ]
+
+    def _sample_network(self, net_dev, elapsed):
+        counters = _parse_net_dev(net_dev.read())
+        values = []
+        for interface in self._interfaces:
+            rx, tx = counters.get(interface, (0, 0))
+            values.append(self._rate(("rx", interface), rx, elapsed))
+            values.append(self._rate(("tx", interface), tx, elapsed))
+        return values
+
+    def _sample_disk(self, diskstats, elapsed):
+        counters = _parse_diskstats(diskstats.read(), self._disk_names)
+        values = []
+        for disk in self._disks:
+            read, written = counters.get(disk, (0, 0))
+            values.append(self._rate(("read", disk), read * 512, elapsed))
+            values.append(self._rate(("write", disk), written * 512, elapsed))
+        return values
+
+    def _sample_pressure(self, pressure_files, vmstat, elapsed):
+        values = []
+        for resource, proc_file, kinds in pressure_files:
+            stalls = pressure.parse_pressure(proc_file.read().decode())
+            for kind in kinds:
+                # total is stall time in microseconds: 10,000 us per second is 1%
+                values.append(self._rate(("psi", resource, kind), stalls[kind]["total"], elapsed) / 1e4)
+        counters = _parse_vmstat(vmstat.read(), self._vmstat_keys)
+        for key in self._vmstat_keys:
+            values.append(self._rate(("vm", key), counters.get(key, 0), elapsed))
+        return values
+
+    def _sample_gpu(self):
+        gpus = self._gpu_monitor.latest()
+        values = []
+        for slot in self._gpu_slots:
+            row = gpus.get(slot, {})
+            for field, _, _, scale in GPU_COLUMNS:
+                value = row.get(field)
+                values.append(float(value) * scale if value is not None else float("nan"))
+        return values
+
+    def _sample_amd_gpu(self):
+        cards = self._amd_sampler.read()[1]
+        values = []
+        for _, slot in self._amd_sampler.cards:
+            card = cards.get(slot, {})
+            values.extend(float(card[key]) if key in card else float("nan") for key, _, _ in AMD_GPU_COLUMNS)
+        return values
+
+    def sample(self, now):
+        """Return one value per column; rates cover the time since the previous sample"""
+        elapsed = now - self._last_time if self._last_time is not None else 0.0
+        self._last_time = now
+        values = []
+        for collector in self._collectors:
+            values.extend(collector(elapsed))
+        return values
+
+    def close(self):
+        for proc_file in self._files:
+            proc_file.close()
+        if self._gpu_monitor is not None:
+            self._gpu_monitor.close()
+        if self._amd_sampler is not None:
+            self._amd_sampler.close()
+
+def record(path, metrics=None, interval=1.0, capacity=86400, duration=None, stop=None):
+    """Sample metrics every interval seconds into a ring file until duration elapses or stop() is true.
+
+    Returns the number of records written.
+    """
+    if interval <= 0:
+        raise ValueError(f"Interval must be a positive number of seconds, got {interval}")
+    sampler = MetricSampler(metrics or AVAILABLE_METRICS, interval)
+    recorder = RingRecorder(path, sampler.columns, capacity, interval)
+    try:
+        start = time.monotonic()
+        # Ticks that fit in the duration; the tolerance keeps 1 / 0.1 from rounding down to 9
+        last_tick = None if duration is None else int(duration / interval + 1e-9)
+        tick = 1
+        while last_tick is None or tick <= last_tick:
+            # Each tick is computed from the start, so rounding errors do not add up
+            delay = start + tick * interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if stop and stop():
+                break
+            recorder.append(time.time(), sampler.sample(time.monotonic()))
+            tick += 1
+        return recorder.write_count
+    finally:
+        recorder.close()
+        sampler.close()
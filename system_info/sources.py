@@ -0,0 +1,214 @@
+import os
+import re
+import time
+import signal
+import threading
+import subprocess
+
+# Every host file read and external command in the collectors goes through this module so a
+# captured or synthesized machine can stand in for the real one:
+#   SYSROOT     directory prepended to absolute paths (/proc, /sys, /etc, /run ...)
+#   REPLAY_DIR  directory of recorded command outputs, one '<command key>.out' file each
+SYSROOT = None
+REPLAY_DIR = None
+
+# Upper bound for any external command; a section deadline (set_deadline) can only shorten it
+COMMAND_TIMEOUT = 30.0
+
+_local = threading.local()
+
+def configure(sysroot=None, replay=None):
+    """Redirect file reads to a sysroot and/or commands to a replay directory"""
+    global SYSROOT, REPLAY_DIR
+    SYSROOT = os.path.abspath(sysroot) if sysroot else None
+    REPLAY_DIR = os.path.abspath(replay) if replay else None
+    try:
+        import psutil
+        # psutil reads /proc on its own; point it at the same tree
+        psutil.PROCFS_PATH = host_path("/proc")
+    except ImportError:
+        pass
+
+def host_path(path):
+    """Map an absolute host path into the configured sysroot"""
+    if SYSROOT and os.path.isabs(path) and not path.startswith(SYSROOT + os.sep):
+        return os.path.join(SYSROOT, path.lstrip("/"))
+    return path
+
+def open_file(path, mode="r", **kwargs):
+    return open(host_path(path), mode, **kwargs)
+
+def read_file(path):
+    """Read a whole text file from the host"""
+    with open_file(path, "r") as f:
+        return f.read()
+
+def read_attribute(path):
+    """Read a small sysfs/procfs attribute without a file object; None if it cannot be read"""
+    try:
+        fd = os.open(host_path(path), os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, 65536).decode("utf-8", errors="replace").strip()
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+def listdir(path):
+    return os.listdir(host_path(path))
+
+def scandir(path):
+    return os.scandir(host_path(path))
+
+def exists(path):
+    return os.path.exists(host_path(path))
+
+def isdir(path):
+    return os.path.isdir(host_path(path))
+
+def islink(path):
+    return os.path.islink(host_path(path))
+
+def readlink(path):
+    return os.readlink(host_path(path))
+
+def command_key(args):
+    """File name stem used for a command's recorded output (sudo is ignored)"""
+    args = list(args)
+    while args and args[0] in ("sudo", "-n"):
+        args = args[1:]
+    return re.sub(r"[^A-Za-z0-9.,=_-]", "_", "_".join(args))
+
+def replay_command(args, **kwargs):
+    """Answer a command from REPLAY_DIR; a missing recording behaves like a missing tool"""
+    stem = os.path.join(REPLAY_DIR, command_key(args))
+    if not os.path.exists(stem + ".out"):
+        raise FileNotFoundError(2, "No such file or directory", args[0])
+    with open(stem + ".out", "rb") as f:
+        stdout = f.read()
+    returncode = 0
+    if os.path.exists(stem + ".rc"):
+        with open(stem + ".rc", "r") as f:
+            returncode = int(f.read().strip() or 0)
+
+    stderr = b""
+    if kwargs.get("text") or kwargs.get("encoding") or kwargs.get("universal_newlines"):
+        stdout = stdout.decode(kwargs.get("encoding") or "utf-8", errors="replace")
+        stderr = ""
+    if kwargs.get("check") and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, args, stdout, stderr)
+    return subprocess.CompletedProcess(args, returncode, stdout=stdout, stderr=stderr)
+
+def set_deadline(deadline):
+    """Bound commands started from this thread by an absolute time.monotonic() deadline (None to clear)"""
+    _local.deadline = deadline
+    _local.timed_out = []
+
+def timed_out_commands():
+    """Commands from this thread that were killed or skipped since the last set_deadline()"""
+    return list(getattr(_local, "timed_out", []))
+
+def _record_timeout(description):
+    if hasattr(_local, "timed_out"):
+        _local.timed_out.append(description)
+
+def kill_process_group(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        process.kill()
+
+def _empty_output(kwargs):
+    text = kwargs.get("text") or kwargs.get("encoding") or kwargs.get("universal_newlines")
+    return "" if text else b""
+
+def set_runner(runner):
+    """Execute commands from this thread with runner(args, timeout, input, popen_kwargs) (None to restore)"""
+    _local.runner = runner
+
+class _RusagePopen(subprocess.Popen):
+    """Popen that reaps the child with wait4, keeping its peak RSS (which includes its own reaped children)"""
+
+    max_rss = None
+
+    def _try_wait(self, wait_flags):
+        try:
+            pid, status, usage = os.wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            return self.pid, 0
+        if pid:
+            # ru_maxrss is in KiB on Linux
+            self.max_rss = usage.ru_maxrss * 1024
+        return pid, status
+
+def last_child_rss():
+    """Peak RSS in bytes of the last command this thread ran and reaped itself, None if unknown"""
+    return getattr(_local, "child_rss", None)
+
+def _run_process(args, limit, input, kwargs):
+    """Run a command to completion; returns (stdout, stderr, returncode, killed)"""
+    killed = False
+    with _RusagePopen(args, **kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(input, timeout=limit)
+        except subprocess.TimeoutExpired:
+            killed = True
+            if kwargs.get("start_new_session"):
+                kill_process_group(process)
+            else:
+                process.kill()
+            try:
+                stdout, stderr = process.communicate(timeout=1)
+            except subprocess.TimeoutExpired:
+                # A grandchild escaped the group and still holds the pipes
+                process.kill()
+                stdout = stderr = _empty_output(kwargs)
+        returncode = process.wait()
+    _local.child_rss = process.max_rss
+    return stdout, stderr, returncode, killed
+
+def run_command(args, timeout=None, input=None, check=False, capture_output=False, **kwargs):
+    """subprocess.run with a timeout; under a deadline or explicit timeout it kills the whole process group"""
+    limit = COMMAND_TIMEOUT if timeout is None else min(timeout, COMMAND_TIMEOUT)
+    deadline = getattr(_local, "deadline", None)
+    if deadline is not None:
+        limit = min(limit, deadline - time.monotonic())
+
+    _local.child_rss = None
+    if capture_output:
+        kwargs["stdout"] = kwargs["stderr"] = subprocess.PIPE
+    if input is not None:
+        kwargs.setdefault("stdin", subprocess.PIPE)
+    if deadline is not None or timeout is not None:
+        # A new session lets the timeout kill helpers the command spawned too (sudo, lshw probes);
+        # it also detaches the terminal, so sudo must not wait for a password
+        kwargs["start_new_session"] = True
+        kwargs.setdefault("stdin", subprocess.DEVNULL)
+        if args[0] == "sudo" and "-n" not in args:
+            args = ["sudo", "-n"] + list(args[1:])
+    elif args[0] == "sudo":
+        # Unbounded, in the foreground: the user may be typing a password at the prompt
+        limit = None
+
+    if limit is not None and limit <= 0:
+        stdout = stderr = _empty_output(kwargs)
+        returncode = -signal.SIGKILL
+        _record_timeout(f"{' '.join(args)} (skipped, deadline passed)")
+    else:
+        runner = getattr(_local, "runner", None) or _run_process
+        stdout, stderr, returncode, killed = runner(args, limit, input, kwargs)
+        if killed:
+            _record_timeout(f"{' '.join(args)} (killed after {limit:.2f}s)")
+
+    # A killed command fails like any other, so collectors fall back the same way
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, args, stdout, stderr)
+    return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+def run(args, **kwargs):
+    """subprocess.run replacement honoring the replay directory and command timeouts"""
+    if REPLAY_DIR is not None:
+        return replay_command(args, **kwargs)
+    return run_command(args, **kwargs)
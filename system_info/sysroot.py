@@ -0,0 +1,285 @@
+import os
+import random
+import subprocess
+
+from system_info import sources, gpu
+
+# Commands captured for --replay
+CAPTURED_COMMANDS = [
+    ["lscpu"],
+    ["lspci", "-v"],
+    ["lsusb"],
+    ["lsusb", "-v"],
+    ["sudo", "dmidecode", "--type", "memory"],
+    ["sudo", "dmidecode", "-t", "baseboard"],
+    ["sudo", "dmidecode", "-t", "bios"],
+    ["sudo", "dmidecode", "-t", "system"],
+    ["lshw", "-C", "network", "-json"],
+    ["ip", "-json", "addr", "show"],
+    ["ip", "route", "show", "default"],
+    ["lsblk", "-d", "-o", "NAME,MODEL,SIZE,ROTA,SERIAL,TYPE", "-P"],
+    ["udevadm", "info", "--export-db"],
+    gpu.NVIDIA_QUERY_COMMAND,
+]
+
+# Files and trees the collectors read
+CAPTURED_FILES = [
+    "/proc/cpuinfo", "/proc/meminfo", "/proc/stat", "/proc/diskstats", "/proc/net/dev",
+    "/proc/modules", "/proc/version", "/proc/cmdline", "/proc/uptime", "/proc/loadavg",
+    "/proc/filesystems", "/proc/self/mounts", "/proc/vmstat",
+    "/proc/pressure/cpu", "/proc/pressure/memory", "/proc/pressure/io",
+    "/etc/os-release", "/etc/lsb-release", "/etc/timezone", "/etc/resolv.conf", "/etc/sysconfig/clock",
+    "/proc/sys/kernel/ostype", "/proc/sys/kernel/osrelease", "/proc/sys/kernel/version",
+    "/proc/sys/kernel/hostname", "/run/utmp",
+]
+# Links whose target is the information (the timezone is the zoneinfo path /etc/localtime points to)
+CAPTURED_LINKS = ["/etc/localtime"]
+CAPTURED_TREES = [
+    "/sys/class/hwmon", "/sys/class/thermal", "/sys/class/net", "/sys/class/drm", "/sys/class/dmi/id",
+    "/sys/devices/system/cpu", "/sys/bus/usb/devices", "/sys/bus/pci/devices", "/sys/block",
+    "/run/udev/data", "/sys/kernel/mm/hugepages", "/sys/kernel/mm/transparent_hugepage", "/sys/module",
+]
+
+# Block majors of sd devices, 16 disks each; later disks use extended dev_t numbers
+SD_MAJORS = [8] + list(range(65, 72)) + list(range(128, 136))
+
+# Links kept as links (only their target name matters) instead of being followed
+LINKS_NOT_FOLLOWED = {"subsystem", "driver", "module", "firmware_node", "of_node", "iommu", "iommu_group", "port"}
+# Attributes that are binary, huge or have side effects on read
+SKIPPED_ATTRIBUTES = {"config", "rom", "remove", "rescan", "reset", "uevent_seqnum", "descriptors", "vpd"}
+
+def capture_commands(directory):
+    """Record the output of every external command the collectors run"""
+    os.makedirs(directory, exist_ok=True)
+    saved = 0
+    for args in CAPTURED_COMMANDS:
+        if args[0] == "sudo":
+            # Never block on a password prompt while capturing
+            args = ["sudo", "-n"] + args[1:]
+        try:
+            result = subprocess.run(args, capture_output=True, env={**os.environ, "LC_ALL": "C"},
+                                    stdin=subprocess.DEVNULL, timeout=60)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            continue
+        stem = os.path.join(directory, sources.command_key(args))
+        with open(stem + ".out", "wb") as f:
+            f.write(result.stdout)
+        if result.returncode != 0:
+            with open(stem + ".rc", "w") as f:
+                f.write(f"{result.returncode}\n")
+        saved += 1
+    return saved
+
+def _copy_file(source, destination):
+    try:
+        with open(source, "rb") as f:
+            data = f.read(1 << 20)
+    except OSError:
+        return False
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    with open(destination, "wb") as f:
+        f.write(data)
+    return True
+
+def _copy_tree(source, destination, depth):
+    """Copy a sysfs directory, following links to device directories up to a depth"""
+    try:
+        entries = list(os.scandir(source))
+    except OSError:
+        return 0
+    os.makedirs(destination, exist_ok=True)
+    copied = 0
+    for entry in entries:
+        target = os.path.join(destination, entry.name)
+        if entry.name in SKIPPED_ATTRIBUTES:
+            continue
+        if entry.is_symlink() and (entry.name in LINKS_NOT_FOLLOWED or depth <= 0 or not entry.is_dir()):
+            if not os.path.lexists(target):
+                os.symlink(os.readlink(entry.path), target)
+        elif entry.is_dir():
+            if depth > 0:
+                copied += _copy_tree(entry.path, target, depth - 1)
+        elif _copy_file(entry.path, target):
+            copied += 1
+    return copied
+
+def capture_sysroot(directory, depth=3):
+    """Copy the /proc, /sys and /etc files read by the collectors into a sysroot directory"""
+    copied = 0
+    for path in CAPTURED_FILES:
+        if _copy_file(path, os.path.join(directory, path.lstrip("/"))):
+            copied += 1
+    for path in CAPTURED_TREES:
+        copied += _copy_tree(path, os.path.join(directory, path.lstrip("/")), depth)
+    for path in CAPTURED_LINKS:
+        target = os.path.join(directory, path.lstrip("/"))
+        if os.path.islink(path) and not os.path.lexists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.symlink(os.readlink(path), target)
+            copied += 1
+    return copied
+
+# --- Synthesis ---------------------------------------------------------------
+
+def _write(root, path, content):
+    full_path = os.path.join(root, path.lstrip("/"))
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(content)
+
+def _symlink(root, path, target):
+    full_path = os.path.join(root, path.lstrip("/"))
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    if not os.path.lexists(full_path):
+        os.symlink(target, full_path)
+
+def _disk_name(index):
+    """sda, sdb, ..., sdz, sdaa, ... like the kernel names SCSI disks"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(97 + remainder) + letters
+    return "sd" + letters
+
+def synthesize_sysroot(directory, cpus=1024, disks=500, interfaces=2000, usb_devices=64, processes=5000, seed=0):
+    """Generate a sysroot that looks like a very large machine"""
+    rng = random.Random(seed)
+    sockets = max(1, cpus // 256)
+
+    # CPUs
+    cpuinfo = []
+    stat = ["cpu  " + " ".join(str(rng.randint(10 ** 6, 10 ** 7)) for _ in range(10))]
+    for cpu in range(cpus):
+        cpuinfo.append(
+            f"processor\t: {cpu}\nvendor_id\t: AuthenticAMD\ncpu family\t: 25\nmodel\t\t: 160\n"
+            f"model name\t: AMD EPYC 9754 128-Core Processor\nstepping\t: 2\nmicrocode\t: 0xaa00212\n"
+            f"cpu MHz\t\t: {rng.randint(1500, 3100)}.000\ncache size\t: 1024 KB\n"
+            f"physical id\t: {cpu * sockets // cpus}\nsiblings\t: {cpus // sockets}\n"
+            f"core id\t\t: {cpu % (cpus // sockets // 2)}\ncpu cores\t: {cpus // sockets // 2}\n"
+            "flags\t\t: fpu vme de pse tsc msr pae mce cx8 apic sep mtrr pge mca cmov avx2 avx512f\n")
+        stat.append(f"cpu{cpu} " + " ".join(str(rng.randint(10 ** 4, 10 ** 6)) for _ in range(10)))
+        _write(directory, f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_cur_freq",
+               f"{rng.randint(1500000, 3100000)}\n")
+    _write(directory, "/proc/cpuinfo", "\n".join(cpuinfo) + "\n")
+    _write(directory, "/proc/stat", "\n".join(stat) + f"\nctxt {rng.randint(10 ** 9, 10 ** 10)}\n")
+
+    # Memory
+    mem_total = 6 * 1024 ** 3
+    _write(directory, "/proc/meminfo",
+           f"MemTotal:       {mem_total} kB\nMemFree:        {mem_total // 3} kB\n"
+           f"MemAvailable:   {mem_total // 2} kB\nBuffers:        {mem_total // 100} kB\n"
+           f"Cached:         {mem_total // 10} kB\nSwapTotal:      0 kB\nSwapFree:       0 kB\n")
+
+    # Disks
+    diskstats = []
+    for index in range(disks):
+        name = _disk_name(index)
+        if index // 16 < len(SD_MAJORS):
+            major, minor = SD_MAJORS[index // 16], index % 16 * 16
+        else:
+            major, minor = 259, index
+        base = f"/sys/block/{name}"
+        _write(directory, f"{base}/dev", f"{major}:{minor}\n")
+        _write(directory, f"{base}/size", f"{39063650304}\n")
+        _write(directory, f"{base}/removable", "0\n")
+        _write(directory, f"{base}/ro", "0\n")
+        _write(directory, f"{base}/queue/rotational", "1\n")
+        for attribute, value in (("scheduler", "none [mq-deadline] kyber bfq"), ("nr_requests", "256"),
+                                 ("max_sectors_kb", "1280"), ("read_ahead_kb", "128"),
+                                 ("logical_block_size", "512"), ("physical_block_size", "4096"),
+                                 ("write_cache", "write back")):
+            _write(directory, f"{base}/queue/{attribute}", value + "\n")
+        _write(directory, f"{base}/device/model", "ST20000NM007D-3DJ103\n")
+        _write(directory, f"{base}/device/vendor", "SEAGATE \n")
+        _write(directory, f"{base}/device/serial", f"ZVT{index:05d}\n")
+        _write(directory, f"/run/udev/data/b{major}:{minor}",
+               f"S:disk/by-id/wwn-0x5000c500{index:08x}\nI:{rng.randint(10 ** 6, 10 ** 7)}\n"
+               f"E:ID_VENDOR=SEAGATE\nE:ID_MODEL=ST20000NM007D-3DJ103\nE:ID_SERIAL_SHORT=ZVT{index:05d}\n"
+               f"E:ID_WWN=0x5000c500{index:08x}\nE:ID_WWN_WITH_EXTENSION=0x5000c500{index:08x}\n"
+               f"E:ID_BUS=ata\nE:ID_TYPE=disk\nG:systemd\n")
+        diskstats.append(f"{major:4d} {minor:7d} {name} " + " ".join(str(rng.randint(0, 10 ** 8)) for _ in range(17)))
+    _write(directory, "/proc/diskstats", "\n".join(diskstats) + "\n")
+
+    # Network interfaces
+    net_dev = ["Inter-|   Receive                                                |  Transmit",
+               " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed"]
+    for index in range(interfaces):
+        name = f"ens{index}np0" if index < 64 else f"veth{index:05x}"
+        base = f"/sys/class/net/{name}"
+        _write(directory, f"{base}/address", f"b8:3f:d2:{index >> 16 & 255:02x}:{index >> 8 & 255:02x}:{index & 255:02x}\n")
+        _write(directory, f"{base}/operstate", "up\n")
+        _write(directory, f"{base}/mtu", "9000\n" if index < 64 else "1500\n")
+        _write(directory, f"{base}/type", "1\n")
+        _write(directory, f"{base}/ifindex", f"{index + 2}\n")
+        counters = [rng.randint(0, 10 ** 12) for _ in range(16)]
+        for position, counter in enumerate(["rx_bytes", "rx_packets", "rx_errors", "rx_dropped", "rx_fifo_errors"]):
+            _write(directory, f"{base}/statistics/{counter}", f"{counters[position]}\n")
+        for position, counter in enumerate(["tx_bytes", "tx_packets", "tx_errors", "tx_dropped", "tx_fifo_errors"]):
+            _write(directory, f"{base}/statistics/{counter}", f"{counters[8 + position]}\n")
+        if index < 64:
+            _symlink(directory, f"{base}/device/driver", "../../../bus/pci/drivers/mlx5_core")
+        net_dev.append(f"{name:>6}: " + " ".join(str(c) for c in counters))
+    _write(directory, "/proc/net/dev", "\n".join(net_dev) + "\n")
+
+    # PCI devices and GPUs
+    for index in range(8):
+        address = f"0000:{0x41 + index:02x}:00.0"
+        base = f"/sys/bus/pci/devices/{address}"
+        for attribute, value in (("vendor", "0x10de"), ("device", "0x2330"), ("class", "0x030200"),
+                                 ("subsystem_vendor", "0x10de"), ("subsystem_device", "0x16c1"), ("revision", "0xa1")):
+            _write(directory, f"{base}/{attribute}", value + "\n")
+        _write(directory, f"/sys/class/drm/card{index}/device/vendor", "0x10de\n")
+        _write(directory, f"/sys/class/drm/card{index}/device/device", "0x2330\n")
+    for index in range(64):
+        base = f"/sys/bus/pci/devices/0000:{0x80 + index // 2:02x}:00.{index % 2}"
+        for attribute, value in (("vendor", "0x15b3"), ("device", "0x1021"), ("class", "0x020000")):
+            _write(directory, f"{base}/{attribute}", value + "\n")
+
+    # USB devices
+    for index in range(usb_devices):
+        base = f"/sys/bus/usb/devices/{1 + index // 16}-{index % 16 + 1}"
+        for attribute, value in (("idVendor", "0781"), ("idProduct", "5583"), ("manufacturer", "SanDisk"),
+                                 ("product", "Ultra Fit"), ("serial", f"4C53000{index:013d}"),
+                                 ("version", " 3.20"), ("bDeviceClass", "00"), ("bMaxPacketSize0", "9")):
+            _write(directory, f"{base}/{attribute}", value + "\n")
+
+    # Processes: stat, statm, io and cmdline, the files the process scanner reads
+    for pid in range(1, processes + 1):
+        comm = ("postgres", "java", "nginx", "python3", "kworker/u64:2")[pid % 5]
+        ticks = rng.randint(0, 10 ** 7)
+        rss = rng.randint(100, 10 ** 6)
+        fields = ["S", str(pid // 2), str(pid), str(pid), "0", "-1", "4194560", str(rng.randint(0, 10 ** 6)), "0",
+                  "0", "0", str(ticks // 3), str(ticks - ticks // 3), "0", "0", "20", "0", str(rng.randint(1, 64)),
+                  "0", str(rng.randint(0, 10 ** 8)), str(rss * 4096 * 4), str(rss)]
+        _write(directory, f"/proc/{pid}/stat", f"{pid} ({comm}) " + " ".join(fields) + " 0" * 30 + "\n")
+        _write(directory, f"/proc/{pid}/statm", f"{rss * 4} {rss} {rss // 4} 100 0 {rss} 0\n")
+        _write(directory, f"/proc/{pid}/io",
+               f"rchar: 0\nwchar: 0\nsyscr: 0\nsyscw: 0\nread_bytes: {rng.randint(0, 10 ** 12)}\n"
+               f"write_bytes: {rng.randint(0, 10 ** 12)}\ncancelled_write_bytes: 0\n")
+        _write(directory, f"/proc/{pid}/cmdline", f"/usr/bin/{comm.split('/')[0]}\0--worker\0{pid}\0")
+
+    # Sensors
+    for index in range(sockets):
+        _write(directory, f"/sys/class/hwmon/hwmon{index}/name", "k10temp\n")
+        _write(directory, f"/sys/class/hwmon/hwmon{index}/temp1_input", f"{rng.randint(40000, 80000)}\n")
+        _write(directory, f"/sys/class/hwmon/hwmon{index}/temp1_label", "Tctl\n")
+    _write(directory, "/sys/class/thermal/thermal_zone0/temp", "45000\n")
+
+    # DMI, kernel and distribution
+    for attribute, value in (("board_vendor", "Supermicro"), ("board_name", "H13DSH"), ("board_version", "1.01"),
+                             ("bios_vendor", "American Megatrends International, LLC."), ("bios_version", "1.4a"),
+                             ("bios_date", "06/12/2023"), ("sys_vendor", "Supermicro"), ("product_name", "AS -2125HS-TNR")):
+        _write(directory, f"/sys/class/dmi/id/{attribute}", value + "\n")
+    _write(directory, "/proc/modules", "".join(
+        f"mod{index} {rng.randint(8192, 2 ** 20)} {rng.randint(0, 4)} - Live 0x0000000000000000\n" for index in range(300)))
+    _write(directory, "/proc/version", "Linux version 6.8.0-synthetic (gcc version 13.2.0) #1 SMP\n")
+    _write(directory, "/proc/cmdline", "BOOT_IMAGE=/vmlinuz root=/dev/sda1 ro quiet\n")
+    _write(directory, "/proc/uptime", "864000.00 3000000.00\n")
+    _write(directory, "/proc/loadavg", f"312.50 298.10 280.02 9/{cpus * 40} 123456\n")
+    _write(directory, "/proc/filesystems", "nodev\tproc\nnodev\tsysfs\nnodev\ttmpfs\n\text4\n\txfs\n")
+    _write(directory, "/proc/self/mounts", "/dev/sda1 / ext4 rw,relatime 0 0\nproc /proc proc rw 0 0\n")
+    _write(directory, "/etc/os-release", 'NAME="Ubuntu"\nVERSION="24.04 LTS (Noble Numbat)"\nID=ubuntu\n'
+                                         'VERSION_ID="24.04"\nPRETTY_NAME="Ubuntu 24.04 LTS"\n')
+    _write(directory, "/etc/timezone", "Etc/UTC\n")
+    _write(directory, "/etc/resolv.conf", "nameserver 10.0.0.2\nnameserver 10.0.0.3\n")
@@ -0,0 +1,146 @@
+import os
+import json
+import socket
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from system_info import sources
+
+SYSCTL_DIR = "/proc/sys"
+# Subtrees that shape scheduling, networking and memory behaviour; a prefix that is not a
+# directory matches the files starting with its last component (kernel.sched -> kernel.sched_*)
+DEFAULT_PREFIXES = ["net.core", "net.ipv4", "vm", "kernel.sched"]
+# Files per read task and threads reading them; procfs reads release the GIL
+READ_BATCH = 256
+READ_WORKERS = 8
+# Bytes read per tunable; every scalar and vector fits, longer tables are cut
+MAX_VALUE_SIZE = 4096
+
+def _sysctl_name(relative):
+    """net/ipv4/conf/eth0.100/rp_filter -> net.ipv4.conf.eth0/100.rp_filter, as sysctl spells it"""
+    return ".".join(part.replace(".", "/") for part in relative.split("/"))
+
+def _sysctl_path(name):
+    return "/".join(part.replace("/", ".") for part in name.split("."))
+
+def parse_value(text):
+    """Type a tunable: an int, a list of ints for vectors like tcp_rmem, or the string"""
+    parts = text.split()
+    try:
+        if len(parts) == 1:
+            return int(parts[0])
+        if parts:
+            return [int(part) for part in parts]
+    except ValueError:
+        pass
+    return text.strip()
+
+def list_tunables(prefixes=None):
+    """Walk the /proc/sys subtrees of the prefixes; returns sorted (name, host path) pairs"""
+    root = sources.host_path(SYSCTL_DIR)
+    found = {}
+    for prefix in prefixes or DEFAULT_PREFIXES:
+        path = os.path.join(root, _sysctl_path(prefix))
+        if os.path.isdir(path):
+            start, name_filter = path, ""
+        else:
+            start, name_filter = os.path.split(path)
+        stack = [start]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if directory == start and not entry.name.startswith(name_filter):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    found[_sysctl_name(os.path.relpath(entry.path, root))] = entry.path
+    return sorted(found.items())
+
+def _read_batch(batch):
+    values = []
+    for name, path in batch:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            # Write-only entries such as vm.drop_caches refuse the open, even for root
+            continue
+        try:
+            data = os.read(fd, MAX_VALUE_SIZE)
+        except OSError:
+            # Some entries refuse reads (EPERM for unprivileged users, EIO on stale devices)
+            continue
+        finally:
+            os.close(fd)
+        values.append((name, parse_value(data.decode("utf-8", errors="replace"))))
+    return values
+
+def read_tunables(prefixes=None, workers=READ_WORKERS):
+    """{sysctl name: typed value} for every readable tunable under the prefixes, read in parallel batches"""
+    entries = list_tunables(prefixes)
+    batches = [entries[i:i + READ_BATCH] for i in range(0, len(entries), READ_BATCH)]
+    if workers <= 1 or len(batches) <= 1:
+        results = map(_read_batch, batches)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_read_batch, batches))
+    tunables = {}
+    for values in results:
+        tunables.update(values)
+    return tunables
+
+def save_snapshot(path, tunables, prefixes=None):
+    """Write tunables to a JSON snapshot tagged with the hostname, time and prefixes walked"""
+    snapshot = {
+        "Hostname": socket.gethostname(),
+        "Collected At": datetime.now().isoformat(timespec="seconds"),
+        "Prefixes": prefixes or DEFAULT_PREFIXES,
+        "Tunables": tunables,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=2, ensure_ascii=False)
+
+def load_snapshot(path):
+    """Read a snapshot written by save_snapshot"""
+    with open(path, "r", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if not isinstance(snapshot, dict) or not isinstance(snapshot.get("Tunables"), dict):
+        raise ValueError(f"{path} has no Tunables section")
+    if not isinstance(snapshot.get("Hostname"), str):
+        raise ValueError(f"{path} has no Hostname")
+    prefixes = snapshot.get("Prefixes")
+    if prefixes is not None and not (isinstance(prefixes, list) and all(isinstance(p, str) for p in prefixes)):
+        raise ValueError(f"{path} has an invalid Prefixes list")
+    return snapshot
+
+def compare_tunables(before, after):
+    """Rows for tunables that differ, or exist on one side only"""
+    rows = []
+    for name in sorted(set(before) | set(after)):
+        old, new = before.get(name), after.get(name)
+        if old == new:
+            continue
+        rows.append({
+            "Tunable": name,
+            "Change": "Added" if name not in before else "Removed" if name not in after else "Changed",
+            "Before": _format_value(old) if name in before else "",
+            "After": _format_value(new) if name in after else "",
+        })
+    return rows
+
+def _format_value(value):
+    return " ".join(str(item) for item in value) if isinstance(value, list) else str(value)
+
+def get_tunables_info(prefixes=None):
+    """Kernel tunables under the prefixes as typed values, plus a summary"""
+    try:
+        tunables = read_tunables(prefixes)
+        return {
+            "Summary": {"Prefixes": ", ".join(prefixes or DEFAULT_PREFIXES), "Tunables": len(tunables)},
+            "Tunables": tunables,
+        }
+    except Exception as e:
+        return {"Error": f"Could not read kernel tunables: {str(e)}"}
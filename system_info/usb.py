@@ -2,6 +2,7 @@ import subprocess
 import re
 import os
 import json
+from system_info import sources
 
 def get_usb_info(include_details=False):
     """Get comprehensive USB information including devices and controller details"""
@@ -22,14 +23,14 @@ def get_usb_devices_info(include_details=False):
     """Get USB devices information using lsusb and additional sources"""
     try:
         if include_details:
-            result = subprocess.run(
+            result = sources.run(
                 ["lsusb", "-v"],
                 capture_output=True, text=True, check=True,
                 env={**os.environ, "LC_ALL": "C"}
             )
             return parse_lsusb_verbose_output(result.stdout)
         else:
-            result = subprocess.run(
+            result = sources.run(
                 ["lsusb"],
                 capture_output=True, text=True, check=True,
                 env={**os.environ, "LC_ALL": "C"}
@@ -241,8 +242,8 @@ def get_usb_devices_fallback(include_details=False):
         
         # Try to get info from /sys/bus/usb/devices/
         usb_devices_path = "/sys/bus/usb/devices"
-        if os.path.exists(usb_devices_path):
-            device_dirs = [d for d in os.listdir(usb_devices_path) 
+        if sources.exists(usb_devices_path):
+            device_dirs = [d for d in sources.listdir(usb_devices_path) 
                         if re.match(r'\d+-\d+', d)]  # Format like 1-1, 2-1.1, etc.
             
             for device_dir in sorted(device_dirs):
@@ -264,8 +265,8 @@ def get_usb_devices_fallback(include_details=False):
                 for attr_file, attr_name in attributes.items():
                     attr_path = os.path.join(device_path, attr_file)
                     try:
-                        if os.path.exists(attr_path):
-                            with open(attr_path, "r") as f:
+                        if sources.exists(attr_path):
+                            with sources.open_file(attr_path, "r") as f:
                                 value = f.read().strip()
                                 if value and value != "00":
                                     device_info[attr_name] = value
@@ -284,7 +285,7 @@ def get_usb_devices_fallback(include_details=False):
 def get_usb_controllers_info():
     """Get USB controller information using lspci"""
     try:
-        result = subprocess.run(
+        result = sources.run(
             ["lspci", "-v"],
             capture_output=True, text=True, check=True,
             env={**os.environ, "LC_ALL": "C"}
@@ -339,14 +340,14 @@ def get_usb_controllers_fallback():
         
         # Try to get info from /sys/bus/pci/devices/
         pci_devices_path = "/sys/bus/pci/devices"
-        if os.path.exists(pci_devices_path):
-            for device_dir in os.listdir(pci_devices_path):
+        if sources.exists(pci_devices_path):
+            for device_dir in sources.listdir(pci_devices_path):
                 device_path = os.path.join(pci_devices_path, device_dir)
                 class_file = os.path.join(device_path, "class")
                 
                 try:
-                    if os.path.exists(class_file):
-                        with open(class_file, "r") as f:
+                    if sources.exists(class_file):
+                        with sources.open_file(class_file, "r") as f:
                             device_class = f.read().strip()
                             
                         # USB controller classes (0x0c03xx)
@@ -357,8 +358,8 @@ def get_usb_controllers_fallback():
                             for id_file in ["vendor", "device"]:
                                 id_path = os.path.join(device_path, id_file)
                                 try:
-                                    if os.path.exists(id_path):
-                                        with open(id_path, "r") as f:
+                                    if sources.exists(id_path):
+                                        with sources.open_file(id_path, "r") as f:
                                             value = f.read().strip()
                                             controller[f"{id_file.title()} ID"] = value
                                 except:
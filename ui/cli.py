@@ -11,6 +11,8 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 import time
 
 console = Console()
+# Diagnostics printed next to machine-readable output go to stderr
+stderr_console = Console(stderr=True)
 
 def print_header():
     """Print application header with logo"""
@@ -187,6 +189,30 @@ def print_list_section(title, data_list, indent=0):
     
     console.print()
 
+def print_table(title, rows, columns=None, output=None):
+    """Print a list of flat dictionaries as a single multi-column table"""
+    output = output or console
+    if not rows:
+        return
+    
+    columns = columns or list(rows[0].keys())
+    table = Table(
+        title=f"[bold cyan]{title}[/bold cyan]",
+        border_style="blue",
+        header_style="bold magenta",
+        show_header=True,
+        expand=True
+    )
+    
+    for column in columns:
+        table.add_column(column, overflow="fold")
+    
+    for row in rows:
+        table.add_row(*(str(row.get(column, "")) for column in columns))
+    
+    output.print(table)
+    output.print()
+
 def print_simple_section(title, data, indent=0):
     """Print simple data types"""
     console.print(f"[bold cyan]{title}:[/bold cyan] [green]{data}[/green]")
@@ -1,8 +1,24 @@
 import tkinter as tk
 from tkinter import ttk
-from system_info import cpu, memory, disk, motherboard, gpu, network, usb, os_info
+from system_info import cpu, memory, disk, motherboard, gpu, network, usb, os_info, pressure, processes, hotplug
 from PIL import Image, ImageTk
 
+# First Disk I/O sample at startup; later refreshes report rates since the previous one
+DISK_IO_INTERVAL = 0.5
+# The Pressure tab refreshes itself; its rates cover a rolling window of this many seconds
+PRESSURE_REFRESH_MS = 2000
+PRESSURE_WINDOW = 60.0
+PRESSURE_TAB = "🔥 Pressure"
+# Tabs rebuilt when a kernel uevent touches their section: (title, collector, shown as a list);
+# between events the listener is only checked, no collector runs
+HOTPLUG_TABS = {
+    "Disk": ("💾 Disk", disk.get_disk_info, False),
+    "GPU": ("🎮 GPU", gpu.get_gpu_info, False),
+    "Network": ("🌐 Network", network.get_network_info, False),
+    "USB": ("🔌 USB", usb.get_usb_devices_info, True),
+}
+HOTPLUG_POLL_MS = 500
+
 class HardwareApp:
     def __init__(self, root):
         self.root = root
@@ -78,6 +94,9 @@ class HardwareApp:
         self.create_tab("🧠 CPU", cpu.get_cpu_info())
         self.create_tab("🧮 Memory", memory.get_memory_info())
         self.create_tab("💾 Disk", disk.get_disk_info())
+        self.create_tab_list("📈 Disk I/O", disk.get_disk_io_info(interval=DISK_IO_INTERVAL))
+        self.create_tab(PRESSURE_TAB, pressure.get_pressure_info(interval=DISK_IO_INTERVAL, window=PRESSURE_WINDOW))
+        self.create_tab_list("📋 Processes", processes.get_top_processes(interval=DISK_IO_INTERVAL))
         self.create_tab("🔧 Motherboard", motherboard.get_motherboard_info())
         self.create_tab("⚙️ BIOS", motherboard.get_bios_info())
         self.create_tab("🎮 GPU", gpu.get_gpu_info())
@@ -85,6 +104,53 @@ class HardwareApp:
         self.create_tab_list("🔌 USB", usb.get_usb_devices_info())
         self.create_tab("💻 System", os_info.get_os_info())
 
+        self.root.after(PRESSURE_REFRESH_MS, self.refresh_pressure)
+
+        try:
+            self.uevents = hotplug.UeventListener()
+            self.root.after(HOTPLUG_POLL_MS, self.refresh_hotplug)
+        except OSError:
+            # No netlink access (e.g. inside some containers); the Update button still works
+            self.uevents = None
+
+    def replace_tab(self, title, data, as_list=False):
+        """Rebuild one tab in place, keeping it selected if it was"""
+        titles = [self.tabs.tab(tab, "text") for tab in self.tabs.tabs()]
+        if title not in titles:
+            return
+        index = titles.index(title)
+        old_tab = self.tabs.tabs()[index]
+        selected = self.tabs.select() == old_tab
+        if as_list:
+            self.create_tab_list(title, data, index=index)
+        else:
+            self.create_tab(title, data, index=index)
+        self.tabs.forget(old_tab)
+        if selected:
+            self.tabs.select(index)
+
+    def refresh_pressure(self):
+        """Rebuild only the Pressure tab"""
+        try:
+            self.replace_tab(PRESSURE_TAB, pressure.get_pressure_info(window=PRESSURE_WINDOW))
+        finally:
+            self.root.after(PRESSURE_REFRESH_MS, self.refresh_pressure)
+
+    def refresh_hotplug(self):
+        """Rebuild the tabs whose devices were added, removed or changed since the last check"""
+        try:
+            events = self.uevents.read_events()
+            sections = hotplug.affected_sections(events)
+            if self.uevents.overflowed:
+                self.uevents.overflowed = False
+                sections = set(HOTPLUG_TABS)
+            for section in sections:
+                if section in HOTPLUG_TABS:
+                    title, collector, as_list = HOTPLUG_TABS[section]
+                    self.replace_tab(title, collector(), as_list)
+        finally:
+            self.root.after(HOTPLUG_POLL_MS, self.refresh_hotplug)
+
     def show_loading(self):
         if self.loading_overlay is None:
             self.loading_overlay = tk.Toplevel(self.root)
@@ -163,6 +229,9 @@ class HardwareApp:
             self.create_tab("🧠 CPU", cpu.get_cpu_info())
             self.create_tab("🧮 Memory", memory.get_memory_info())
             self.create_tab("💾 Disk", disk.get_disk_info())
+            self.create_tab_list("📈 Disk I/O", disk.get_disk_io_info(interval=DISK_IO_INTERVAL))
+            self.create_tab(PRESSURE_TAB, pressure.get_pressure_info(interval=DISK_IO_INTERVAL, window=PRESSURE_WINDOW))
+            self.create_tab_list("📋 Processes", processes.get_top_processes(interval=DISK_IO_INTERVAL))
             self.create_tab("🔧 Motherboard", motherboard.get_motherboard_info())
             self.create_tab("⚙️ BIOS", motherboard.get_bios_info())
             self.create_tab("🎮 GPU", gpu.get_gpu_info())
@@ -173,9 +242,12 @@ class HardwareApp:
         finally:
             self.root.after(500, self.hide_loading)
 
-    def create_tab(self, title, data):
+    def create_tab(self, title, data, index=None):
         frame = ttk.Frame(self.tabs)
-        self.tabs.add(frame, text=title)
+        if index is None:
+            self.tabs.add(frame, text=title)
+        else:
+            self.tabs.insert(index, frame, text=title)
         canvas = tk.Canvas(frame, bg="#283593", highlightthickness=0) 
         scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
         scroll_frame = ttk.Frame(canvas)
@@ -229,9 +301,12 @@ class HardwareApp:
         for key, value in data.items():
             row = render_value(key, value, row)
 
-    def create_tab_list(self, title, items):
+    def create_tab_list(self, title, items, index=None):
         frame = ttk.Frame(self.tabs)
-        self.tabs.add(frame, text=title)
+        if index is None:
+            self.tabs.add(frame, text=title)
+        else:
+            self.tabs.insert(index, frame, text=title)
         canvas = tk.Canvas(frame, bg="#283593", highlightthickness=0)  # Mesma cor do frame
         scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
         scroll_frame = ttk.Frame(canvas)